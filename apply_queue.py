@@ -0,0 +1,141 @@
+"""
+🗂️ Auto-Apply Queue
+New jobs are written to the apply_queue table and applied to by
+background workers, so a cycle never waits on a browser.
+
+- Each ATS has its own queue, drained by APPLY_ATS_CONCURRENCY[ats]
+  workers (one for an ATS not listed). At most APPLY_WORKERS applications
+  run at once across all of them, each in the shared browser. A worker
+  takes one of those slots only once it holds a job, so a backlog on one
+  ATS never keeps another's jobs waiting.
+- A "failed" application is retried after APPLY_BACKOFF seconds, doubled
+  per failure, up to APPLY_MAX_ATTEMPTS. "applied", "skipped" and
+  "unconfirmed" (submitted, but no confirmation seen) are final — an
+  unconfirmed form was still sent, so it is never submitted again. Only
+  "applied" counts towards the cycle's auto-applied total.
+- A job leaves the table only with a final result, so after a restart or
+  crash every unfinished job — retry times included — is resumed. The
+  applied-jobs ledger keeps a resumed job from being applied to twice.
+- Final results go to `results` as (job, result), for the bot to alert on.
+- Each job's cover letter starts generating as soon as it is queued
+  (rate-limited inside cover_letter), so by the time a worker and a
+  browser context are free the letter is usually cached.
+"""
+
+import asyncio
+import logging
+import time
+
+from auto_apply import apply_to_job, ats_name, prepare_cover_letter
+from config import APPLY_WORKERS, APPLY_ATS_CONCURRENCY, APPLY_MAX_ATTEMPTS, APPLY_BACKOFF
+from cover_letter import save_cover_letter_cache
+from storage import ApplyJobStore
+
+log = logging.getLogger("ApplyQueue")
+
+
+class ApplyQueue:
+    def __init__(self, store: ApplyJobStore | None = None):
+        self.store = store or ApplyJobStore()
+        self.queues: dict[str, asyncio.Queue] = {}          # ATS → its jobs
+        self.results: asyncio.Queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(APPLY_WORKERS)      # applications in flight, any ATS
+        self.tasks: set[asyncio.Task] = set()
+        self.applied = 0                   # since the last take_applied()
+
+    # ── lifecycle ──────────────────────────────
+
+    def start(self):
+        """Start the workers and resume whatever the last run left unfinished."""
+        for ats in APPLY_ATS_CONCURRENCY:
+            self._queue(ats)
+        pending = self.store.pending()
+        if pending:
+            log.info(f"🗂️ Resuming {len(pending)} unfinished applications")
+        now = time.time()
+        for job, attempts, next_try in pending:
+            self._spawn(prepare_cover_letter(job))
+            self._spawn(self._retry_later((job, attempts), max(0.0, next_try - now)))
+
+    async def stop(self):
+        """Stop applying. Unfinished jobs stay in the table for the next start."""
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        save_cover_letter_cache()
+        self.store.close()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def _queue(self, ats: str) -> asyncio.Queue:
+        """The ATS's queue, starting its workers on first use."""
+        queue = self.queues.get(ats)
+        if queue is None:
+            queue = self.queues[ats] = asyncio.Queue()
+            for _ in range(APPLY_ATS_CONCURRENCY.get(ats, 1)):
+                self._spawn(self._worker(queue))
+        return queue
+
+    async def _put(self, item: tuple[dict, int]):
+        await self._queue(ats_name(item[0].get("source", ""))).put(item)
+
+    # ── producer side ──────────────────────────
+
+    async def enqueue(self, job: dict) -> bool:
+        """Persist a job and queue it; False if it was already queued."""
+        if not self.store.put(job["id"], job):
+            return False
+        self._spawn(prepare_cover_letter(job))
+        await self._put((job, 0))
+        return True
+
+    async def _retry_later(self, item: tuple[dict, int], delay: float):
+        await asyncio.sleep(delay)
+        await self._put(item)
+
+    def take_applied(self) -> int:
+        """Applications completed since the last call."""
+        applied, self.applied = self.applied, 0
+        return applied
+
+    # ── consumer side ──────────────────────────
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            try:
+                async with self.slots:
+                    await self._apply(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Apply worker error: {e}")
+            finally:
+                queue.task_done()
+
+    async def _apply(self, item: tuple[dict, int]):
+        job, attempts = item
+        result = await apply_to_job(job)
+
+        if result == "failed":
+            attempts += 1
+            if attempts < APPLY_MAX_ATTEMPTS:
+                delay = APPLY_BACKOFF * 2 ** (attempts - 1)
+                log.warning(
+                    f"Apply to {job.get('company')} failed, "
+                    f"retry {attempts}/{APPLY_MAX_ATTEMPTS - 1} in {delay:g}s"
+                )
+                self.store.retry_at(job["id"], attempts, time.time() + delay)
+                self._spawn(self._retry_later((job, attempts), delay))
+                return
+            log.error(f"Giving up on applying to {job.get('company')} after {attempts} attempts")
+
+        self.store.done(job["id"])
+        save_cover_letter_cache()
+        if result == "applied":
+            self.applied += 1
+        await self.results.put((job, result))
@@ -7,320 +7,338 @@ Supports: Internshala, Greenhouse, Lever, and generic forms.
 import asyncio
 import logging
 import os
+import re
 from pathlib import Path
+from urllib.parse import urlsplit
 
-from config import PROFILE
+from browser_pool import get_pool
+import form_filler
+from config import (
+    PROFILE, APPLY_NAV_TIMEOUT, APPLY_READY_TIMEOUT, APPLY_UPLOAD_TIMEOUT, APPLY_CONFIRM_TIMEOUT,
+)
 from cover_letter import generate_cover_letter
+from storage import AppliedLedger, FormSchemaStore
 
 log = logging.getLogger("AutoApply")
 
-# Track applied jobs this session
+# Pre-ledger text log, imported into the state DB on first use
 _applied_log = Path("applied_jobs.txt")
 
+_ledger: AppliedLedger | None = None
+_schemas: FormSchemaStore | None = None
 
-def mark_applied(job_id: str, job_title: str, company: str, url: str):
-    with open(_applied_log, "a") as f:
-        f.write(f"{job_id} | {company} | {job_title} | {url}\n")
+
+def get_ledger() -> AppliedLedger:
+    """The shared applied-jobs ledger, opened on first use."""
+    global _ledger
+    if _ledger is None:
+        _ledger = AppliedLedger()
+        _ledger.import_text(_applied_log)
+    return _ledger
+
+
+def get_schemas() -> FormSchemaStore:
+    """The shared form-plan cache, opened on first use."""
+    global _schemas
+    if _schemas is None:
+        _schemas = FormSchemaStore()
+    return _schemas
+
+
+def ats_name(source: str) -> str:
+    """ATS family of a job source, as recorded in the ledger and used for apply limits."""
+    if source in ("Internshala", "Greenhouse", "Lever"):
+        return source.lower()
+    return "generic"
+
+
+def cover_letter_args(job: dict) -> tuple[str, str, str]:
+    """(title, company, description) the job's handler writes its letter from."""
+    # Internshala letters are written from title and company alone
+    description = "" if job.get("source") == "Internshala" else job.get("description", "")
+    return job["title"], job["company"], description
+
+
+async def prepare_cover_letter(job: dict):
+    """Generate the job's cover letter ahead of its application, so the handler finds it cached."""
+    if not already_applied(job.get("id", "")):
+        await generate_cover_letter(*cover_letter_args(job))
+
+
+def mark_applied(job_id: str, job_title: str, company: str, url: str, ats: str = ""):
+    get_ledger().record(job_id, "applied", ats=ats, company=company, title=job_title, url=url)
 
 
 def already_applied(job_id: str) -> bool:
-    if not _applied_log.exists():
-        return False
-    return job_id in _applied_log.read_text()
+    return get_ledger().already_applied(job_id)
 
 
 async def apply_to_job(job: dict) -> str:
     """
     Master apply function. Routes to the right handler based on source.
-    Returns: "applied", "skipped", or "failed"
+    Returns: "applied", "unconfirmed" (submitted, but no confirmation seen),
+    "skipped", or "failed"
     """
     source = job.get("source", "")
     apply_url = job.get("apply_url") or job.get("link", "")
+    jid = job.get("id", apply_url)
+    ats = ats_name(source)
 
-    if already_applied(job.get("id", apply_url)):
-        return "skipped"
+    if already_applied(jid):
+        result = "skipped"
+    else:
+        try:
+            import playwright.async_api  # noqa: F401 — fail fast if Playwright is missing
+
+            if source == "Internshala":
+                result = await _apply_internshala(job, apply_url)
+            elif source in ("Greenhouse",):
+                result = await _apply_greenhouse(job, apply_url)
+            elif source in ("Lever",):
+                result = await _apply_lever(job, apply_url)
+            else:
+                result = await _apply_generic(job, apply_url)
+
+        except ImportError:
+            log.error("Playwright not installed. Run: playwright install chromium")
+            result = "failed"
+        except Exception as e:
+            log.error(f"Auto-apply error for {job.get('company')}: {e}")
+            result = "failed"
+
+    get_ledger().record(
+        jid, result, ats=ats,
+        company=job.get("company", ""),
+        title=job.get("title", ""),
+        url=apply_url,
+    )
+    return result
 
-    try:
-        from playwright.async_api import async_playwright
-
-        if source == "Internshala":
-            result = await _apply_internshala(job, apply_url)
-        elif source in ("Greenhouse",):
-            result = await _apply_greenhouse(job, apply_url)
-        elif source in ("Lever",):
-            result = await _apply_lever(job, apply_url)
-        else:
-            result = await _apply_generic(job, apply_url)
-
-        if result == "applied":
-            mark_applied(
-                job.get("id", apply_url),
-                job.get("title", ""),
-                job.get("company", ""),
-                apply_url
-            )
-        return result
 
-    except ImportError:
-        log.error("Playwright not installed. Run: playwright install chromium")
-        return "failed"
-    except Exception as e:
-        log.error(f"Auto-apply error for {job.get('company')}: {e}")
-        return "failed"
+# ─────────────────────────────────────────────
+# PAGE WAITS
+# ─────────────────────────────────────────────
 
+async def _open_form(page, url: str, ready: str):
+    """Load `url` and return as soon as `ready` is in the DOM, not once the network goes quiet."""
+    await page.goto(url, wait_until="domcontentloaded", timeout=APPLY_NAV_TIMEOUT)
+    await page.locator(ready).first.wait_for(state="attached", timeout=APPLY_READY_TIMEOUT)
 
-async def _apply_internshala(job: dict, url: str) -> str:
-    """Apply on Internshala — fills cover letter + submits."""
-    from playwright.async_api import async_playwright
 
-    cover = await generate_cover_letter(job["title"], job["company"])
+async def _upload(page, field, path: Path, settles_on: str = ""):
+    """
+    Attach a file. Sites that upload or parse it as soon as it is picked
+    (a request whose URL contains `settles_on`) get until
+    APPLY_UPLOAD_TIMEOUT to answer before we go on.
+    """
+    if not settles_on:
+        await field.set_input_files(str(path))
+        return
+    from playwright.async_api import TimeoutError as PlaywrightTimeout
+    try:
+        async with page.expect_response(lambda r: settles_on in r.url, timeout=APPLY_UPLOAD_TIMEOUT):
+            await field.set_input_files(str(path))
+    except PlaywrightTimeout:
+        log.debug("Upload not acknowledged in time, continuing")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        )
-        page = await context.new_page()
 
-        try:
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Click Apply button
-            apply_btn = page.locator("button:has-text('Apply'), a:has-text('Apply Now')")
-            if await apply_btn.count() > 0:
-                await apply_btn.first.click()
-                await page.wait_for_timeout(2000)
-
-            # Fill cover letter / "Why should we hire you"
-            textarea = page.locator("textarea[name*='cover'], textarea[placeholder*='cover'], textarea[placeholder*='why'], #cover_letter_text")
-            if await textarea.count() > 0:
-                await textarea.first.fill(cover)
-
-            # Availability field
-            availability = page.locator("input[name*='availability'], select[name*='availability']")
-            if await availability.count() > 0:
-                await availability.first.fill("Immediately")
-
-            # Submit
-            submit_btn = page.locator("button[type='submit']:has-text('Submit'), button:has-text('Submit Application')")
-            if await submit_btn.count() > 0:
-                await submit_btn.first.click()
-                await page.wait_for_timeout(3000)
-                log.info(f"✅ Applied to {job['company']} - {job['title']} on Internshala")
-                return "applied"
-            else:
-                log.warning(f"Could not find submit button for {job['company']}")
-                return "failed"
+async def _submit(page, button, success) -> bool:
+    """
+    Click submit and wait for the first sign it went through: the page
+    navigating away, the `success` locator showing up, or the site's own
+    host accepting a POST. False if none comes within APPLY_CONFIRM_TIMEOUT.
+    """
+    before = page.url
+    host = urlsplit(before).hostname
+
+    def accepted(response) -> bool:
+        request = response.request
+        return (request.method == "POST" and response.ok
+                and request.resource_type in ("document", "xhr", "fetch")
+                and urlsplit(response.url).hostname == host)
+
+    signs = [
+        asyncio.create_task(page.wait_for_url(
+            lambda u: u != before, wait_until="commit", timeout=APPLY_CONFIRM_TIMEOUT)),
+        asyncio.create_task(page.wait_for_event(
+            "response", predicate=accepted, timeout=APPLY_CONFIRM_TIMEOUT)),
+    ]
+    # Text that was on the page before we clicked proves nothing
+    if not await success.first.is_visible():
+        signs.append(asyncio.create_task(
+            success.first.wait_for(state="visible", timeout=APPLY_CONFIRM_TIMEOUT)))
+    try:
+        await button.click()
+        for sign in asyncio.as_completed(signs):
+            try:
+                await sign
+                return True
+            except Exception:
+                continue                   # that one timed out; others may still come
+        return False
+    finally:
+        for sign in signs:
+            sign.cancel()
+        await asyncio.gather(*signs, return_exceptions=True)
+
 
-        finally:
-            await browser.close()
+async def _fill_form(page, values: dict, resume: Path | None = None, settles_on: str = "") -> tuple[str, str]:
+    """
+    Fill the page's form with `values` (and the resume) and return its
+    (host, fingerprint). A layout already seen on this host is filled from
+    its cached plan; otherwise the fields are matched and, if every planned
+    field fills, the plan is cached. A cached plan that misses a field is
+    dropped and the form is matched afresh.
+    """
+    host = urlsplit(page.url).hostname or ""
+    schemas = get_schemas()
+    keys = list(values) + (["resume"] if resume and resume.exists() else [])
+
+    fingerprint, fields = await form_filler.discover(page, schemas.fingerprints(host))
+    cached = schemas.get(host, fingerprint) if fields is None else None
+    if cached is not None:
+        plan = {key: index for key, index in cached.items() if key in keys}
+        if not await _fill_plan(page, plan, values, resume, settles_on):
+            log.debug(f"Filled {host} form from cached plan {fingerprint}")
+            return host, fingerprint
+        schemas.invalidate(host, fingerprint)
+    if fields is None:
+        fingerprint, fields = await form_filler.discover(page)
+
+    plan = form_filler.match(fields, keys)
+    missed = await _fill_plan(page, plan, values, resume, settles_on)
+    if plan and not missed:
+        schemas.put(host, fingerprint, plan)
+    log.debug(f"Filled {len(plan) - len(missed)}/{len(fields)} fields: {', '.join(plan)}")
+    return host, fingerprint
+
+
+async def _fill_plan(page, plan: dict[str, int], values: dict, resume: Path | None, settles_on: str) -> list[str]:
+    """Apply one plan; returns the keys that could not be filled."""
+    # Resume first: Lever pre-fills fields from the parsed file, and our values should win
+    if "resume" in plan:
+        await _upload(page, form_filler.field(page, plan["resume"]), resume, settles_on)
+    return await form_filler.fill(page, plan, values)
+
+
+def _profile_values(cover: str) -> dict:
+    parts = PROFILE["name"].split()
+    return {
+        "first_name":   parts[0],
+        "last_name":    parts[-1] if len(parts) > 1 else ".",
+        "full_name":    PROFILE["name"],
+        "email":        PROFILE["email"],
+        "phone":        PROFILE["phone"],
+        "linkedin":     PROFILE["linkedin"],
+        "github":       PROFILE["github"],
+        "website":      PROFILE["github"],
+        "cover_letter": cover,
+    }
+
+
+def _submitted(job: dict, where: str, confirmed: bool, form: tuple[str, str]) -> str:
+    """Log a submit and return its result: "applied" if confirmed, else "unconfirmed"."""
+    if confirmed:
+        log.info(f"✅ Applied to {job['company']} - {job['title']}{where}")
+        return "applied"
+    log.warning(f"⚠️ Submitted to {job['company']} - {job['title']}{where}, but saw no confirmation")
+    # Maybe a field went in the wrong box; relearn this layout next time
+    get_schemas().invalidate(*form)
+    return "unconfirmed"
+
+
+# ─────────────────────────────────────────────
+# ATS HANDLERS
+# ─────────────────────────────────────────────
+
+async def _apply_internshala(job: dict, url: str) -> str:
+    """Apply on Internshala — fills cover letter + submits."""
+    # Written while the page loads, if it wasn't pre-generated
+    letter = asyncio.ensure_future(generate_cover_letter(*cover_letter_args(job)))
+
+    async with get_pool().page() as page:
+        await _open_form(page, url, "button:has-text('Apply'), a:has-text('Apply Now'), textarea")
+        cover = await letter
+
+        # Click Apply button, then wait for the application modal
+        apply_btn = page.locator("button:has-text('Apply'), a:has-text('Apply Now')")
+        if await apply_btn.count() > 0:
+            await apply_btn.first.click()
+            await page.locator("textarea, button[type='submit']").first.wait_for(timeout=APPLY_READY_TIMEOUT)
+
+        # Cover letter / "Why should we hire you" + availability
+        form = await _fill_form(page, {"cover_letter": cover, "availability": "Immediately"})
+
+        # Submit
+        submit_btn = page.locator("button[type='submit']:has-text('Submit'), button:has-text('Submit Application')")
+        if await submit_btn.count() > 0:
+            success = page.get_by_text(re.compile(r"application (has been )?submitted|applied successfully", re.I))
+            return _submitted(job, " on Internshala", await _submit(page, submit_btn.first, success), form)
+        else:
+            log.warning(f"Could not find submit button for {job['company']}")
+            return "failed"
 
 
 async def _apply_greenhouse(job: dict, url: str) -> str:
     """Apply via Greenhouse application form."""
-    from playwright.async_api import async_playwright
-
-    cover = await generate_cover_letter(
-        job["title"], job["company"], job.get("description", "")
-    )
+    letter = asyncio.ensure_future(generate_cover_letter(*cover_letter_args(job)))
     resume_path = Path(PROFILE["resume_path"]).resolve()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
+    async with get_pool().page() as page:
+        await _open_form(page, url, "#application_form, #application-form, input[name='first_name'], input[type='email']")
+        cover = await letter
+        form = await _fill_form(page, _profile_values(cover), resume_path)
 
-        try:
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # First name
-            first_name = page.locator("input[name='first_name'], input[id='first_name']")
-            if await first_name.count() > 0:
-                await first_name.first.fill(PROFILE["name"].split()[0])
-
-            # Last name
-            last_name = page.locator("input[name='last_name'], input[id='last_name']")
-            if await last_name.count() > 0:
-                parts = PROFILE["name"].split()
-                await last_name.first.fill(parts[-1] if len(parts) > 1 else ".")
-
-            # Email
-            email = page.locator("input[name='email'], input[type='email']")
-            if await email.count() > 0:
-                await email.first.fill(PROFILE["email"])
-
-            # Phone
-            phone = page.locator("input[name='phone'], input[type='tel']")
-            if await phone.count() > 0:
-                await phone.first.fill(PROFILE["phone"])
-
-            # Resume upload
-            if resume_path.exists():
-                resume_input = page.locator("input[type='file'][name*='resume'], input[type='file'][id*='resume']")
-                if await resume_input.count() > 0:
-                    await resume_input.first.set_input_files(str(resume_path))
-
-            # LinkedIn
-            linkedin_field = page.locator("input[name*='linkedin'], input[placeholder*='LinkedIn']")
-            if await linkedin_field.count() > 0:
-                await linkedin_field.first.fill(PROFILE["linkedin"])
-
-            # GitHub
-            github_field = page.locator("input[name*='github'], input[placeholder*='GitHub']")
-            if await github_field.count() > 0:
-                await github_field.first.fill(PROFILE["github"])
-
-            # Cover letter
-            cover_field = page.locator("textarea[name*='cover'], textarea[id*='cover']")
-            if await cover_field.count() > 0:
-                await cover_field.first.fill(cover)
-
-            # Website / portfolio
-            website_field = page.locator("input[name*='website'], input[name*='portfolio']")
-            if await website_field.count() > 0:
-                await website_field.first.fill(PROFILE["github"])
-
-            # Submit
-            submit_btn = page.locator("input[type='submit'], button[type='submit']")
-            if await submit_btn.count() > 0:
-                await submit_btn.first.click()
-                await page.wait_for_timeout(4000)
-                log.info(f"✅ Applied to {job['company']} - {job['title']} on Greenhouse")
-                return "applied"
-
-            return "failed"
+        # Submit
+        submit_btn = page.locator("input[type='submit'], button[type='submit']")
+        if await submit_btn.count() > 0:
+            success = page.locator("#application_confirmation").or_(
+                page.get_by_text(re.compile(r"thank you for applying|application (has been )?(submitted|received)", re.I))
+            )
+            return _submitted(job, " on Greenhouse", await _submit(page, submit_btn.first, success), form)
 
-        finally:
-            await browser.close()
+        return "failed"
 
 
 async def _apply_lever(job: dict, url: str) -> str:
     """Apply via Lever application form."""
-    from playwright.async_api import async_playwright
-
-    cover = await generate_cover_letter(
-        job["title"], job["company"], job.get("description", "")
-    )
+    letter = asyncio.ensure_future(generate_cover_letter(*cover_letter_args(job)))
     resume_path = Path(PROFILE["resume_path"]).resolve()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-
-        try:
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Full name
-            name_field = page.locator("input[name='name'], input[placeholder*='name' i]")
-            if await name_field.count() > 0:
-                await name_field.first.fill(PROFILE["name"])
-
-            # Email
-            email_field = page.locator("input[name='email'], input[type='email']")
-            if await email_field.count() > 0:
-                await email_field.first.fill(PROFILE["email"])
-
-            # Phone
-            phone_field = page.locator("input[name='phone'], input[type='tel']")
-            if await phone_field.count() > 0:
-                await phone_field.first.fill(PROFILE["phone"])
-
-            # Resume
-            if resume_path.exists():
-                file_input = page.locator("input[type='file']")
-                if await file_input.count() > 0:
-                    await file_input.first.set_input_files(str(resume_path))
-                    await page.wait_for_timeout(1500)
-
-            # LinkedIn
-            li_field = page.locator("input[placeholder*='LinkedIn' i], input[name*='linkedin' i]")
-            if await li_field.count() > 0:
-                await li_field.first.fill(PROFILE["linkedin"])
-
-            # GitHub / Portfolio
-            gh_field = page.locator("input[placeholder*='GitHub' i], input[placeholder*='portfolio' i]")
-            if await gh_field.count() > 0:
-                await gh_field.first.fill(PROFILE["github"])
-
-            # Cover letter / additional info
-            cl_field = page.locator("textarea[name*='comments'], textarea[name*='cover'], textarea[placeholder*='cover' i]")
-            if await cl_field.count() > 0:
-                await cl_field.first.fill(cover)
-
-            # Submit
-            submit = page.locator("button[type='submit'], input[type='submit']")
-            if await submit.count() > 0:
-                await submit.first.click()
-                await page.wait_for_timeout(4000)
-                log.info(f"✅ Applied to {job['company']} - {job['title']} on Lever")
-                return "applied"
-
-            return "failed"
+    async with get_pool().page() as page:
+        await _open_form(page, url, "input[name='email'], input[type='email']")
+        cover = await letter
+        # Lever parses the resume on upload; wait for that before filling
+        form = await _fill_form(page, _profile_values(cover), resume_path, settles_on="parseResume")
+
+        # Submit
+        submit = page.locator("button[type='submit'], input[type='submit']")
+        if await submit.count() > 0:
+            success = page.locator(".application-confirmation, [data-qa='msg-submit-success']").or_(
+                page.get_by_text(re.compile(r"application (has been )?submitted|thanks for applying", re.I))
+            )
+            return _submitted(job, " on Lever", await _submit(page, submit.first, success), form)
 
-        finally:
-            await browser.close()
+        return "failed"
 
 
 async def _apply_generic(job: dict, url: str) -> str:
     """
-    Generic form filler — tries common field names.
+    Generic form filler — matches profile fields by name, label and type.
     Works for many custom career pages.
     """
-    from playwright.async_api import async_playwright
-
-    cover = await generate_cover_letter(
-        job["title"], job["company"], job.get("description", "")
-    )
+    letter = asyncio.ensure_future(generate_cover_letter(*cover_letter_args(job)))
     resume_path = Path(PROFILE["resume_path"]).resolve()
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
+    async with get_pool().page() as page:
+        await _open_form(page, url, "form, input, textarea")
+        cover = await letter
+        form = await _fill_form(page, _profile_values(cover), resume_path)
 
-        try:
-            await page.goto(url, timeout=20000)
-            await page.wait_for_load_state("networkidle", timeout=15000)
-
-            # Try to find and fill common fields
-            field_map = {
-                "name":     PROFILE["name"],
-                "email":    PROFILE["email"],
-                "phone":    PROFILE["phone"],
-                "linkedin": PROFILE["linkedin"],
-                "github":   PROFILE["github"],
-            }
-
-            for key, value in field_map.items():
-                field = page.locator(f"input[name*='{key}' i], input[placeholder*='{key}' i], input[id*='{key}' i]")
-                if await field.count() > 0:
-                    await field.first.fill(value)
-
-            # Cover letter textarea
-            textarea = page.locator("textarea")
-            if await textarea.count() > 0:
-                await textarea.first.fill(cover)
-
-            # Resume file upload
-            if resume_path.exists():
-                file_input = page.locator("input[type='file']")
-                if await file_input.count() > 0:
-                    await file_input.first.set_input_files(str(resume_path))
-                    await page.wait_for_timeout(1500)
-
-            # Submit
-            submit = page.locator("button[type='submit'], input[type='submit'], button:has-text('Submit'), button:has-text('Apply')")
-            if await submit.count() > 0:
-                await submit.first.click()
-                await page.wait_for_timeout(3000)
-                log.info(f"✅ Auto-applied to {job['company']} - {job['title']}")
-                return "applied"
+        # Submit
+        submit = page.locator("button[type='submit'], input[type='submit'], button:has-text('Submit'), button:has-text('Apply')")
+        if await submit.count() > 0:
+            success = page.get_by_text(re.compile(r"thank you|application (has been )?(submitted|received)", re.I))
+            return _submitted(job, "", await _submit(page, submit.first, success), form)
 
-            return "failed"
-
-        finally:
-            await browser.close()
+        return "failed"
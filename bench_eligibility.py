@@ -0,0 +1,187 @@
+"""
+⏱️ Eligibility Benchmark
+Regression + timing for the fused engine in eligibility.py.
+
+Builds a corpus of synthetic jobs from fragments that hit every signal the
+checks look for (and their near misses), asserts evaluate() returns the same
+verdict as evaluate_sequential() for every job, then times both.
+
+Then feeds every check a set of adversarial descriptions (repeated near
+misses, long whitespace and digit runs) and fails if any single call takes
+longer than the budget, or grows more than 8x when the input quadruples — the
+signature of a pattern that backtracks quadratically.
+
+    python bench_eligibility.py [--jobs 20000] [--seed 11] [--size-kb 100] [--budget-ms 1000]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from eligibility import (
+    evaluate, evaluate_sequential,
+    check_technical_role, check_internship, check_location,
+    check_experience, check_seniority, check_degree,
+)
+
+_TITLES = [
+    "Backend Engineer Intern", "Software Engineer Intern", "SDE Intern", "SDE 2", "SDE-II",
+    "Senior Backend Engineer", "Staff Engineer", "Marketing Intern", "HR Intern", "UI/UX Designer",
+    "UI/UX Engineer Intern", "Product Designer", "Product Design Engineer", "Full Stack Developer",
+    "Data Engineer Trainee", "Java Developer", "java", "Go Developer Intern", "New Grad Software Engineer",
+    "Platform Engineer Intern", "Summer Intern 2026", "Apprentice - DevOps", "Co-op, Backend",
+    "Lead Developer", "Engineering Manager", "Growth Intern", "Content Writer", "Cloud Engineer Intern",
+    "Business Development Intern", "Site Reliability Engineering Intern", "L4 Engineer", "Intern",
+]
+_LOCATIONS = [
+    "", "India", "Remote", "Bengaluru", "Bangalore, India", "Hybrid - Pune", "Check listing",
+    "Not mentioned", "n/a", "San Francisco", "London, UK", "Remote - US", "Singapore", "Kochi",
+    "Worldwide", "New York", "script only", "Noida / Remote", "Toronto", "EMEA",
+]
+_FRAGMENTS = [
+    "We are hiring an intern to work on our node.js APIs.", "Build REST microservices in python.",
+    "0-2 years of experience", "0-2 years experience, internship available", "3+ years of experience",
+    "minimum 2 years", "at least 3 years", "proven track record", "deep expertise in distributed systems",
+    "This is not an internship.", "no internship", "non-internship role", "graduate program",
+    "campus hire", "no freshers", "Must be based in the US", "must be located in india",
+    "onsite required", "onsite required in Bengaluru, India", "visa sponsorship not available",
+    "work authorization required", "Masters degree required", "PhD preferred", "MBA", "postgraduate",
+    "graduating in 2024", "2024 graduates only", "Kubernetes and Docker", "golang", "java script only",
+    "sde 2", "sde2", "L5", "level 4", "band 6", "ui/ux", "ui/ux for engineers", "product designer",
+    "Work from home", "wfh", "remote friendly", "Hybrid", "Based in Singapore", "Summer program",
+    "intern to ppo", "full-time intern conversion", "trainee", "apprenticeship", "practicum",
+    "customer success", "talent acquisition", "social media", "seo specialist", "database",
+    "Line one\nintern on the next line", "0-2 years\nintern", "onsite only\nindia",
+    "experienced engineer", "industry experience", "seasoned", "vice president", "head of",
+    "architect", "principal", "sre", "mlops", "infrastructure", "c++", "c#", "rust", "api",
+]
+_SOURCES = ["Greenhouse", "Lever", "LinkedIn", "Internshala", "Unstop", "Naukri", "Career Page (X)"]
+
+
+# Units repeated to fill an adversarial description; each is a near miss
+# that leaves some pattern retrying from every position
+_ADVERSARIAL = {
+    "0-2 years, then intern":    ("0-2 years ", "intern"),
+    "onsite required, then india": ("onsite required ", "india"),
+    "ui/ux, then engineer":      ("ui/ux ", "engineer"),
+    "product designer, then engineer": ("product designer ", "engineer"),
+    "experience digits":        ("2-3-4-5-", " years"),
+    "whitespace run":           (" ", "x"),
+    "negation near miss":       ("not an ", "internship"),
+    "must be based near miss":  ("must be based in ", "india"),
+    "graduating near miss":     ("graduating in 20", "24"),
+    "tech near miss":           ("java ", "script"),
+    "signal soup":              ("intern api remote ", ""),
+    "no signals":               ("lorem ipsum dolor ", ""),
+}
+
+
+def adversarial_texts(size: int) -> dict[str, str]:
+    return {
+        name: (unit * (size // len(unit) + 1))[:size] + tail
+        for name, (unit, tail) in _ADVERSARIAL.items()
+    }
+
+
+def check_budget(size: int, budget_ms: float) -> int:
+    """
+    Time every check on every adversarial text; returns the number of calls
+    over budget or growing faster than linearly from quarter to full size.
+    """
+    title, location = "Software Engineer", "Bengaluru"
+    calls = {
+        "check_technical_role": lambda t: check_technical_role(t, t),
+        "check_internship":     lambda t: check_internship(title, t, "Career Page"),
+        "check_location":       lambda t: check_location(location, t),
+        "check_experience":     check_experience,
+        "check_seniority":      check_seniority,
+        "check_degree":         check_degree,
+        "evaluate":             lambda t: evaluate({"title": title, "location": location, "description": t}),
+    }
+    over, worst = 0, (0.0, "")
+    quarters, fulls = adversarial_texts(size // 4), adversarial_texts(size)
+    for text_name, text in fulls.items():
+        for call_name, fn in calls.items():
+            ms, quarter_ms = _time_ms(fn, text), _time_ms(fn, quarters[text_name])
+            worst = max(worst, (ms, f"{call_name} on {text_name}"))
+            # 4x the input: linear time grows ~4x, quadratic ~16x
+            growth = ms / quarter_ms if quarter_ms > 0 else 1.0
+            if ms > budget_ms or (ms > 20 and growth > 8):
+                over += 1
+                print(f"OVER BUDGET {ms:8.1f} ms  ({growth:.1f}x from quarter size)  {call_name} on {text_name}")
+    print(f"adversarial: {len(_ADVERSARIAL)} texts × {len(calls)} checks at {size // 1024} KB, "
+          f"worst {worst[0]:.1f} ms ({worst[1]}), budget {budget_ms:g} ms")
+    return over
+
+
+def _time_ms(fn, text: str, repeat: int = 3) -> float:
+    """Best of `repeat` runs, so one noisy run doesn't read as growth."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def build_corpus(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    jobs = []
+    for _ in range(n):
+        desc = " ".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(0, 6)))
+        job = {
+            "title": rng.choice(_TITLES),
+            "company": "Acme",
+            "location": rng.choice(_LOCATIONS),
+            "description": desc,
+            "source": rng.choice(_SOURCES),
+        }
+        if rng.random() < 0.2:
+            job["tags"] = rng.choice(_FRAGMENTS)
+        jobs.append(job)
+    return jobs
+
+
+def check_parity(jobs: list[dict]) -> int:
+    mismatches = 0
+    for job in jobs:
+        fused, reference = evaluate(job)[0], evaluate_sequential(job)[0]
+        if fused != reference:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"MISMATCH fused={fused} reference={reference}: {job}")
+    return mismatches
+
+
+def timed(fn, jobs: list[dict]) -> float:
+    start = time.perf_counter()
+    for job in jobs:
+        fn(job)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=20_000)
+    ap.add_argument("--seed", type=int, default=11)
+    ap.add_argument("--size-kb", type=int, default=100)
+    ap.add_argument("--budget-ms", type=float, default=1000.0)
+    args = ap.parse_args()
+
+    jobs = build_corpus(args.jobs, args.seed)
+    mismatches = check_parity(jobs)
+    passed = sum(evaluate(j)[0] for j in jobs)
+    print(f"{len(jobs):,} jobs, {passed:,} eligible, {mismatches} verdict mismatches\n")
+
+    t_ref, t_fused = timed(evaluate_sequential, jobs), timed(evaluate, jobs)
+    print(f"{'engine':<12}{'total ms':>10}{'µs/job':>9}")
+    print(f"{'sequential':<12}{t_ref * 1000:>10.1f}{t_ref / len(jobs) * 1e6:>9.1f}")
+    print(f"{'fused':<12}{t_fused * 1000:>10.1f}{t_fused / len(jobs) * 1e6:>9.1f}   ({t_ref / t_fused:.1f}x)")
+    print()
+    over_budget = check_budget(args.size_kb * 1024, args.budget_ms)
+    return 1 if mismatches or over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+⏱️ Keyword Matching Benchmark
+matches_keywords / is_internship from keywords.py against the original
+per-keyword `in` loops, on a synthetic corpus of job titles. Also checks
+that both give the same answer for every title. matches_keywords is the
+original loop again (a compiled version measured ~1.0x), so its row is
+a baseline for the noise between runs.
+
+    python bench_keywords.py [--titles 100000] [--seed 7]
+"""
+
+import argparse
+import random
+import time
+
+from config import KEYWORDS, EXCLUDE_KEYWORDS
+from keywords import matches_keywords, is_internship
+
+_LEVELS = ["", "Senior ", "Staff ", "Junior ", "Lead ", "Principal ", "Associate "]
+_ROLES = [
+    "Backend Engineer", "Software Engineer", "Software Developer", "SDE", "Full Stack",
+    "Frontend Engineer", "Data Scientist", "Product Manager", "Marketing Manager",
+    "Sales Executive", "HR", "Content Writer", "UI/UX Designer", "Platform Engineer",
+    "Node.js", "API Developer", "Site Reliability Engineer", "Graphic Design", "Express",
+    "MongoDB", "Account Executive", "Recruiter", "DevOps Engineer", "Backend Developer",
+]
+_SUFFIXES = ["", " Intern", " Internship", " - Remote", " (2026)", " Trainee", " II",
+             " Apprentice", ", Payments", " - Bengaluru", " Intern - Unpaid", " (Summer)"]
+_DESCRIPTIONS = ["", "internship", "internship opportunity", "full time role", "apprenticeship program"]
+
+
+def legacy_matches_keywords(title: str) -> bool:
+    title_lower = title.lower()
+    for ex in EXCLUDE_KEYWORDS:
+        if ex in title_lower:
+            return False
+    for kw in KEYWORDS:
+        if kw in title_lower:
+            return True
+    return False
+
+
+def legacy_is_internship(title: str, text: str = "") -> bool:
+    combined = (title + " " + text).lower()
+    return any(w in combined for w in ["intern", "internship", "trainee", "apprentice"])
+
+
+def build_corpus(n: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    return [
+        (rng.choice(_LEVELS) + rng.choice(_ROLES) + rng.choice(_SUFFIXES), rng.choice(_DESCRIPTIONS))
+        for _ in range(n)
+    ]
+
+
+def timed(fn, corpus) -> float:
+    start = time.perf_counter()
+    for title, text in corpus:
+        fn(title, text)
+    return time.perf_counter() - start
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--titles", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    corpus = build_corpus(args.titles, args.seed)
+    for title, text in corpus:
+        assert matches_keywords(title) == legacy_matches_keywords(title), title
+        assert is_internship(title, text) == legacy_is_internship(title, text), (title, text)
+
+    cases = [
+        ("matches_keywords", lambda t, _: legacy_matches_keywords(t), lambda t, _: matches_keywords(t)),
+        ("is_internship",    legacy_is_internship,                    is_internship),
+    ]
+    print(f"{len(corpus):,} titles — results identical\n")
+    print(f"{'function':<18}{'legacy ms':>11}{'new ms':>9}{'ns/title':>10}{'speedup':>10}")
+    for name, legacy, new in cases:
+        t_legacy, t_new = timed(legacy, corpus), timed(new, corpus)
+        print(f"{name:<18}{t_legacy * 1000:>11.1f}{t_new * 1000:>9.1f}"
+              f"{t_new / len(corpus) * 1e9:>10.0f}{t_legacy / t_new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+⏱️ Parsing Benchmark
+Parse time per page, before (html.parser, full tree, selectors compiled per
+call) and after (lxml, card subtrees only, precompiled selectors).
+
+Pages are synthetic but shaped like the real ones: N listing cards buried in
+navigation, scripts and footer markup.
+
+    python bench_parsing.py [--cards 40] [--repeat 20]
+"""
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from html_parsing import (
+    make_soup, css, career_page_strainer, PARSER,
+    INTERNSHALA, LINKEDIN, NAUKRI, UNSTOP, WELLFOUND,
+)
+
+# Page chrome that every real board carries around its listings
+_NOISE = (
+    "<nav>" + "".join(f"<div class='menu-item'><a href='/m{i}'>Menu {i}</a></div>" for i in range(60)) + "</nav>"
+    + "<script>" + "var x = 1;" * 2000 + "</script>"
+    + "<style>" + ".c{color:red}" * 1000 + "</style>"
+    + "<footer>" + "".join(f"<p class='foot'>Footer text {i} <span>more</span></p>" for i in range(200)) + "</footer>"
+)
+
+_CARDS = {
+    "Internshala": (INTERNSHALA, ".internship_meta", lambda i: (
+        f"<div class='container-fluid individual_internship'><div class='internship_meta'>"
+        f"<h3 class='job-internship-name'>Backend Developer Intern {i}</h3>"
+        f"<p class='company-name'>Company {i}</p>"
+        f"<a class='view_detail_button' href='/internship/detail/{i}'>View</a>"
+        f"<span class='stipend'>₹ 40,000 /month</span><div class='locations'>Remote</div>"
+        f"</div></div>")),
+    "LinkedIn": (LINKEDIN, "li.result-card, li[class*='job']", lambda i: (
+        f"<li class='jobs-search__result'><h3>Software Engineer Intern {i}</h3><h4>Company {i}</h4>"
+        f"<a href='https://www.linkedin.com/jobs/view/{i}?trk=x'>link</a>"
+        f"<span class='job-search-card__location'>Bengaluru</span></li>")),
+    "Naukri": (NAUKRI, "article.jobTuple, .cust-job-tuple", lambda i: (
+        f"<article class='jobTuple'><a class='title' href='https://naukri.com/j/{i}'>SDE Intern {i}</a>"
+        f"<div class='companyInfo'><a>Company {i}</a></div><span class='salary'>30k</span>"
+        f"<span class='location'>Pune</span></article>")),
+    "Unstop": (UNSTOP, ".opp-card, [class*='single_profile']", lambda i: (
+        f"<div class='single_profile card'><h2>Backend Intern {i}</h2><p class='org_name'>Company {i}</p>"
+        f"<a href='/internships/{i}'>go</a><span class='stipend_amount'>25000</span></div>")),
+    "Wellfound": (WELLFOUND, "[data-test='StartupResult']", lambda i: (
+        f"<div data-test='StartupResult'><a data-test='job-title' href='/jobs/{i}'>Backend Engineer Intern {i}</a>"
+        f"<a data-test='startup-link'>Startup {i}</a></div>")),
+    "Career page": (None, "a[href*='job'], a[href*='career']", lambda i: (
+        f"<div class='row'><a href='/jobs/{i}'>Software Engineer Intern {i}</a></div>")),
+}
+
+_FIELDS = ("title", "company", "link", "stipend", "location")
+
+
+def build_page(card, n: int) -> bytes:
+    body = "".join(card(i) for i in range(n))
+    return f"<html><head><title>x</title></head><body>{_NOISE}<main>{body}</main>{_NOISE}</body></html>".encode()
+
+
+def parse_before(page: bytes, layout: dict | None, card_sel: str) -> list[str]:
+    soup = BeautifulSoup(page.decode(), "html.parser")
+    out = []
+    for card in soup.select(card_sel):
+        if layout is None:
+            out.append(card.get_text(strip=True))
+            continue
+        for field in _FIELDS:
+            if field in layout:
+                el = card.select_one(layout[field].pattern)
+                out.append(el.get_text(strip=True) if el else "")
+    return out
+
+
+def parse_after(page: bytes, layout: dict | None, card_sel: str) -> list[str]:
+    if layout is None:
+        soup = make_soup(page, career_page_strainer(card_sel))
+        return [a.get_text(strip=True) for a in css(card_sel).select(soup)]
+    soup = make_soup(page, layout["strainer"])
+    out = []
+    for card in layout["card"].select(soup):
+        for field in _FIELDS:
+            if field in layout:
+                el = layout[field].select_one(card)
+                out.append(el.get_text(strip=True) if el else "")
+    return out
+
+
+def timed(fn, *args, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(*args)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--cards", type=int, default=40, help="listing cards per page")
+    ap.add_argument("--repeat", type=int, default=20, help="parses per measurement")
+    args = ap.parse_args()
+
+    print(f"parser after: {PARSER}   cards/page: {args.cards}   repeat: {args.repeat}\n")
+    print(f"{'source':<14}{'page KB':>9}{'before ms':>12}{'after ms':>11}{'speedup':>10}")
+    for name, (layout, card_sel, card) in _CARDS.items():
+        page = build_page(card, args.cards)
+        before = parse_before(page, layout, card_sel)
+        after = parse_after(page, layout, card_sel)
+        assert before == after, f"{name}: extracted fields differ"
+        t_before = timed(parse_before, page, layout, card_sel, repeat=args.repeat)
+        t_after = timed(parse_after, page, layout, card_sel, repeat=args.repeat)
+        print(f"{name:<14}{len(page) / 1024:>9.0f}{t_before:>12.2f}{t_after:>11.2f}{t_before / t_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+🗂️ Board Response Cache
+Persists ETag / Last-Modified validators per board API URL together with
+the jobs parsed from that response. Unchanged boards answer 304, and the
+last cycle's jobs are reused without downloading, decoding or filtering.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import httpx
+from config import KEYWORDS, EXCLUDE_KEYWORDS
+
+log = logging.getLogger("BoardCache")
+
+BOARD_CACHE_FILE = Path("board_cache.json")
+
+# Cached jobs are already keyword-filtered, so a keyword change must invalidate them
+_FILTER_VERSION = hashlib.md5(
+    json.dumps([KEYWORDS, EXCLUDE_KEYWORDS]).encode()
+).hexdigest()
+
+_entries: dict | None = None
+_dirty = False
+
+
+def _load() -> dict:
+    global _entries
+    if _entries is None:
+        _entries = {}
+        if BOARD_CACHE_FILE.exists():
+            try:
+                with open(BOARD_CACHE_FILE) as f:
+                    data = json.load(f)
+                if data.get("version") == _FILTER_VERSION:
+                    _entries = data.get("boards", {})
+                else:
+                    log.info("♻️ Keyword filters changed — board cache discarded")
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not read board cache: {e}")
+    return _entries
+
+
+def conditional_headers(url: str) -> dict:
+    """If-None-Match / If-Modified-Since headers for a previously fetched URL."""
+    entry = _load().get(url)
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def cached_jobs(url: str) -> list[dict]:
+    """Jobs parsed from the last 200 response for this URL (copies, safe to mutate)."""
+    entry = _load().get(url, {})
+    return [dict(job) for job in entry.get("jobs", [])]
+
+
+def remember(url: str, response: httpx.Response, jobs: list[dict]):
+    """Store validators and parsed jobs from a successful response."""
+    global _dirty
+    if not response.is_success:
+        return
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    entries = _load()
+    if not (etag or last_modified):
+        # Nothing to revalidate with next time
+        if entries.pop(url, None) is not None:
+            _dirty = True
+        return
+    entries[url] = {"etag": etag, "last_modified": last_modified,
+                    "jobs": [dict(job) for job in jobs]}
+    _dirty = True
+
+
+def save_board_cache():
+    """Write the cache to disk if anything changed this cycle."""
+    global _dirty
+    if not _dirty or _entries is None:
+        return
+    tmp = BOARD_CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"version": _FILTER_VERSION, "boards": _entries}, f)
+    tmp.replace(BOARD_CACHE_FILE)
+    _dirty = False
@@ -8,18 +8,29 @@
 
 import asyncio
 import hashlib
-import json
 import logging
 import re
+import time
 from pathlib import Path
 
-import httpx
-from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Bot
 from telegram.constants import ParseMode
 
-from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, CHECK_INTERVAL, MIN_STIPEND
-from scrapers import scrape_all
-from eligibility import filter_eligible
+from config import (
+    TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, CHECK_INTERVAL, MIN_STIPEND,
+    DIGEST_THRESHOLD, DIGEST_MAX_JOBS, DIGEST_BUTTONS_PER_ROW, PIPELINE_QUEUE_SIZE,
+    POLL_TICK, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, AUTO_APPLY_ENABLED,
+)
+from scrapers import scrape_stream, source_ids
+from poll_schedule import due_sources, seconds_until_next, record_poll, save_schedule
+from http_client import get_client, reset_client, reset_if_failing, close_client
+from browser_pool import close_pool
+from html_parsing import shutdown_parse_pool
+from eligibility import is_valid_internship, save_verdict_cache, verdict_cache_stats, RULES_VERSION
+from dedup import Deduper, canonical_url, company_key, title_key
+from storage import SeenStore, SnapshotStore
+from delivery import DeliveryQueue
+from apply_queue import ApplyQueue
 from stipend_parser import stipend_passes_filter, format_stipend, parse_stipend
 
 # ─────────────────────────────────────────────
@@ -38,29 +49,32 @@ log = logging.getLogger("BotV2")
 # ─────────────────────────────────────────────
 # SEEN DB
 # ─────────────────────────────────────────────
+# Pre-SQLite seen list, imported into the state DB on first start
 SEEN_DB = Path("seen_jobs_v2.json")
 
-def load_seen() -> set:
-    """Load seen jobs. Auto-reset every 7 days so recurring listings re-appear."""
-    import time
-    if SEEN_DB.exists():
-        age_days = (time.time() - SEEN_DB.stat().st_mtime) / 86400
-        if age_days > 7:
-            SEEN_DB.unlink()
-            log.info("♻️ Auto-reset seen_jobs (7-day rotation)")
-            return set()
-        with open(SEEN_DB) as f:
-            return set(json.load(f))
-    return set()
-
-def save_seen(seen: set):
-    with open(SEEN_DB, "w") as f:
-        json.dump(list(seen), f)
+def load_seen() -> SeenStore:
+    """Open the seen-jobs store and drop entries past their TTL."""
+    seen = SeenStore()
+    seen.import_json(SEEN_DB)
+    seen.expire()
+    return seen
 
 def job_id(title: str, company: str, url: str) -> str:
+    """Stable across tracking params, host aliases and title/company spelling."""
+    raw = f"{title_key(title)}|{company_key(company)}|{canonical_url(url)}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+def legacy_job_id(title: str, company: str, url: str) -> str:
+    """Id scheme before canonical keys — still checked so the switch doesn't
+    re-alert everything; entries under it expire after SEEN_TTL_DAYS."""
     raw = f"{title.lower().strip()}{company.lower().strip()}{url.strip()}"
     return hashlib.md5(raw.encode()).hexdigest()
 
+def snapshot_version() -> str:
+    """Board snapshots skip unchanged postings, so they must be dropped
+    whenever the filters those postings were judged by change."""
+    return hashlib.md5(f"{RULES_VERSION}|{MIN_STIPEND}".encode()).hexdigest()
+
 
 # ─────────────────────────────────────────────
 # TELEGRAM HELPERS
@@ -87,16 +101,29 @@ def get_emoji(source: str) -> str:
     return "🏢"
 
 def stipend_badge(stipend_text: str) -> str:
+    """MarkdownV2-safe stipend line ("₹1.2L/month" carries a reserved '.')."""
     value = parse_stipend(stipend_text)
     if value is None:
         return "💰 Unknown"
+    stipend = escape_md(format_stipend(stipend_text))
     if value >= 80000:
-        return f"💰 {format_stipend(stipend_text)} 🔥🔥"
+        return f"💰 {stipend} 🔥🔥"
     if value >= 40000:
-        return f"💰 {format_stipend(stipend_text)} ✅"
-    return f"💰 {format_stipend(stipend_text)}"
+        return f"💰 {stipend} ✅"
+    return f"💰 {stipend}"
 
-async def send_job_alert(bot: Bot, job: dict, auto_applied: bool = False):
+def job_urls(job: dict) -> tuple[str, str]:
+    """(view_url, apply_url), each falling back to the other when not http(s)."""
+    view_url  = job.get("link", "").strip()
+    apply_url = job.get("apply_url", view_url).strip() or view_url
+    if not view_url.startswith("http"):
+        view_url = apply_url
+    if not apply_url.startswith("http"):
+        apply_url = view_url
+    return view_url, apply_url
+
+def render_job_alert(job: dict, auto_applied: bool = False) -> dict:
+    """Delivery payload for one job alert (see delivery.py)."""
     emoji = get_emoji(job["source"])
     applied_tag = "\\[AUTO\\-APPLIED ✅\\]" if auto_applied else ""
 
@@ -109,45 +136,88 @@ async def send_job_alert(bot: Bot, job: dict, auto_applied: bool = False):
         f"🌐 *Source:* {escape_md(job['source'])}\n"
     )
 
-    # Ensure URLs are valid before adding buttons
-    view_url  = job.get("link", "").strip()
-    apply_url = job.get("apply_url", view_url).strip() or view_url
-    if not view_url.startswith("http"):
-        view_url = apply_url
-    if not apply_url.startswith("http"):
-        apply_url = view_url
-
+    view_url, apply_url = job_urls(job)
     buttons = []
     if view_url.startswith("http"):
-        buttons.append(InlineKeyboardButton("🔗 View Job", url=view_url))
+        buttons.append(["🔗 View Job", view_url])
     if apply_url.startswith("http") and apply_url != view_url:
-        buttons.append(InlineKeyboardButton("📝 Apply Now", url=apply_url))
-    keyboard = InlineKeyboardMarkup([buttons]) if buttons else None
-
-    await bot.send_message(
-        chat_id=TELEGRAM_CHAT_ID,
-        text=msg,
-        parse_mode=ParseMode.MARKDOWN_V2,
-        reply_markup=keyboard if keyboard else None,
-        disable_web_page_preview=True,
+        buttons.append(["📝 Apply Now", apply_url])
+
+    return {
+        "chat_id": TELEGRAM_CHAT_ID,
+        "text": msg,
+        "parse_mode": ParseMode.MARKDOWN_V2,
+        "buttons": [buttons] if buttons else [],
+        "disable_web_page_preview": True,
+        "titles": [job["title"]],
+    }
+
+# Telegram rejects messages over 4096 characters (UTF-16 code units, so
+# most emoji count twice); keep room for the header
+TELEGRAM_MAX_CHARS = 4096
+DIGEST_HEADER_ROOM = 80
+
+def _tg_len(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+def _digest_entry(n: int, job: dict) -> str:
+    title    = _clip(job["title"], 90)
+    location = _clip(job.get("location", "Check listing"), 60)
+    return (
+        f"*{n}\\.* {get_emoji(job['source'])} *{escape_md(title)}*\n"
+        f"🏢 {escape_md(_clip(job['company'], 60))} · 📍 {escape_md(location)}\n"
+        f"{stipend_badge(job.get('stipend', ''))}\n"
     )
 
-async def send_cycle_summary(bot: Bot, new_count: int, total_scanned: int, filtered_count: int, applied_count: int):
+def render_digests(jobs: list[dict]) -> list[dict]:
+    """
+    Pack jobs into as few messages as fit: each page holds up to
+    DIGEST_MAX_JOBS entries within Telegram's length limit, with one
+    numbered apply button per job, DIGEST_BUTTONS_PER_ROW to a row.
+    """
+    pages, entries, size = [], [], 0
+    for n, job in enumerate(jobs, 1):
+        entry = _digest_entry(n, job)
+        if entries and (size + _tg_len(entry) + 1 > TELEGRAM_MAX_CHARS - DIGEST_HEADER_ROOM
+                        or len(entries) >= DIGEST_MAX_JOBS):
+            pages.append(entries)
+            entries, size = [], 0
+        entries.append((n, entry, job_urls(job)[1]))
+        size += _tg_len(entry) + 1
+    if entries:
+        pages.append(entries)
+
+    payloads = []
+    for i, page in enumerate(pages, 1):
+        header = f"📦 *{escape_md(str(len(jobs)))} New Internships* \\({i}/{len(pages)}\\)\n\n"
+        buttons = [[f"📝 {n}", url] for n, _, url in page if url.startswith("http")]
+        payloads.append({
+            "chat_id": TELEGRAM_CHAT_ID,
+            "text": header + "\n".join(entry for _, entry, _ in page),
+            "parse_mode": ParseMode.MARKDOWN_V2,
+            "buttons": [buttons[k:k + DIGEST_BUTTONS_PER_ROW]
+                        for k in range(0, len(buttons), DIGEST_BUTTONS_PER_ROW)],
+            "disable_web_page_preview": True,
+            "titles": [job["title"] for job in jobs[page[0][0] - 1:page[-1][0]]],
+        })
+    return payloads
+
+async def send_cycle_summary(delivery: DeliveryQueue, new_count: int, total_scanned: int, filtered_count: int,
+                             applied_count: int, next_scan: float = CHECK_INTERVAL):
     msg = (
         f"📊 *Scan Complete*\n\n"
         f"🔍 Scanned: *{escape_md(str(total_scanned))}* listings\n"
         f"💰 Passed ₹{escape_md(str(MIN_STIPEND // 1000))}k\\+ filter: *{escape_md(str(filtered_count))}*\n"
         f"🆕 New jobs found: *{escape_md(str(new_count))}*\n"
         f"🤖 Auto\\-applied: *{escape_md(str(applied_count))}*\n\n"
-        f"_Next scan in {escape_md(str(CHECK_INTERVAL // 60))} minutes_"
-    )
-    await bot.send_message(
-        chat_id=TELEGRAM_CHAT_ID,
-        text=msg,
-        parse_mode=ParseMode.MARKDOWN_V2,
+        f"_Next scan in {escape_md(str(max(1, int(next_scan) // 60)))} minutes_"
     )
+    await delivery.enqueue({"chat_id": TELEGRAM_CHAT_ID, "text": msg, "parse_mode": ParseMode.MARKDOWN_V2})
 
-async def send_startup_message(bot: Bot):
+async def send_startup_message(delivery: DeliveryQueue):
     msg = (
         "🤖 *Internship Hunter Bot V2 Started\\!*\n\n"
         "📡 *Monitoring:*\n"
@@ -157,15 +227,18 @@ async def send_startup_message(bot: Bot):
         "⚙️ Lever API \\(Vercel, Linear, Retool\\+\\)\n"
         "🏢 Direct career pages \\(Razorpay, CRED, Zepto, Google, Amazon, Adobe\\+\\)\n\n"
         f"💰 *Stipend filter:* ₹{escape_md(str(MIN_STIPEND // 1000))}k\\+ per month\n"
-        f"⏱️ *Check interval:* every {escape_md(str(CHECK_INTERVAL // 60))} minutes\n"
-        "🤖 *Auto\\-apply:* Enabled\n\n"
+        f"⏱️ *Check interval:* adaptive per source, {escape_md(str(POLL_MIN_INTERVAL // 60))} min – {escape_md(str(POLL_MAX_INTERVAL // 3600))} h\n"
+        f"🤖 *Auto\\-apply:* {'Enabled' if AUTO_APPLY_ENABLED else 'Disabled'}\n\n"
         "_Sit back — I'll handle the rest\\!_ 🎯"
     )
-    await bot.send_message(
-        chat_id=TELEGRAM_CHAT_ID,
-        text=msg,
-        parse_mode=ParseMode.MARKDOWN_V2,
-    )
+    await delivery.enqueue({"chat_id": TELEGRAM_CHAT_ID, "text": msg, "parse_mode": ParseMode.MARKDOWN_V2})
+
+async def forward_apply_results(applier: ApplyQueue, delivery: DeliveryQueue):
+    """Alert each job again, tagged auto-applied, as its application goes through."""
+    while True:
+        job, result = await applier.results.get()
+        if result == "applied":
+            await delivery.enqueue(render_job_alert(job, auto_applied=True))
 
 
 
@@ -174,48 +247,153 @@ async def send_startup_message(bot: Bot):
 # MAIN CYCLE
 # ─────────────────────────────────────────────
 
-async def run_cycle(bot: Bot, seen: set) -> tuple[int, int, int, int]:
-    """Returns (new_count, total_scanned, filtered_count, applied_count)"""
-
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        all_jobs = await scrape_all(client)
-
-    # Filter by location + experience eligibility
-    all_jobs = filter_eligible(all_jobs)
-    total_scanned = len(all_jobs)
-    log.info(f"After eligibility filter: {total_scanned} jobs remain")
-
-    # Apply stipend filter
-    filtered_jobs = [
-        j for j in all_jobs
-        if stipend_passes_filter(j.get("stipend", ""), MIN_STIPEND)
-    ]
-    filtered_count = len(filtered_jobs)
-    log.info(f"{filtered_count} jobs passed ₹{MIN_STIPEND//1000}k+ stipend filter")
-
-    new_count = 0
-    applied_count = 0
-
-    for job in filtered_jobs:
-        jid = job_id(job["title"], job["company"], job["link"])
-        job["id"] = jid
-
-        if jid in seen:
-            continue
-
-        auto_applied = False
-
-        # Send Telegram alert
+async def run_cycle(delivery: DeliveryQueue, seen: SeenStore, snapshots: SnapshotStore,
+                    sources: list[str] | None = None,
+                    applier: ApplyQueue | None = None) -> tuple[int, int, int, int]:
+    """
+    Returns (new_count, total_scanned, filtered_count, queued_count)
+    Scrapes `sources` (ids from scrapers.source_ids()), or all of them.
+    New jobs are also handed to `applier` for auto-apply, if given;
+    queued_count is how many it accepted.
+
+    Streaming pipeline: each source's fetch is diffed against its last
+    snapshot, and only added or changed postings go through dedup →
+    eligibility → stipend → seen check → alert queue, as soon as that
+    source finishes. A copy of a role from a preferred source that arrives
+    before the first copy is alerted replaces it. Unchanged postings only
+    feed dedup and keep their seen entries alive. Snapshots are committed once the cycle succeeds,
+    and only then are the new-posting counts fed to the poll schedule.
+    Stages are joined by bounded queues, so a slow consumer holds back the
+    scrapers instead of piling up batches. The first DIGEST_THRESHOLD new
+    jobs of a cycle alert individually; after that they are collected into
+    digests, sent whenever a page fills and at the end of the cycle.
+    """
+    started = time.monotonic()
+    batches: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    new_jobs: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    deduper = Deduper()
+    deltas = []
+    polls = []     # (source id, added, fetched at), learned only once the snapshots commit
+    counts = {"scraped": 0, "fresh": 0, "removed": 0, "unique": 0, "eligible": 0, "stipend": 0, "new": 0,
+              "queued": 0}
+    first_alert = None
+    cache_before = verdict_cache_stats()
+
+    async def scrape_stage():
         try:
-            await send_job_alert(bot, job, auto_applied=auto_applied)
-            seen.add(jid)
-            new_count += 1
-            await asyncio.sleep(1.5)
-        except Exception as e:
-            log.error(f"Failed to send alert: {e}")
-
-    save_seen(seen)
-    return new_count, total_scanned, filtered_count, applied_count
+            async for source_id, jobs in scrape_stream(get_client(), sources):
+                if jobs is None:
+                    # Failed fetch: its snapshot stands and its rate learns nothing
+                    record_poll(source_id, None)
+                    continue
+                delta = snapshots.diff(source_id, jobs)
+                # A successful empty fetch is a real "0 new" for the schedule
+                polls.append((source_id, len(delta["added"]) if delta["known"] else None, time.time()))
+                deltas.append((source_id, delta))
+                await batches.put(delta)
+        finally:
+            await batches.put(None)
+
+    async def filter_stage():
+        try:
+            while (delta := await batches.get()) is not None:
+                jobs = delta["added"] + delta["changed"]
+                counts["scraped"] += len(jobs) + len(delta["unchanged"])
+                counts["fresh"] += len(jobs)
+                counts["removed"] += len(delta["removed"])
+                for job in delta["unchanged"]:
+                    # Already judged last time; still listed, so keep it
+                    # from expiring and let it claim its dedup cluster
+                    deduper.add(job, claimed=True)
+                    seen.refresh(job_id(job["title"], job["company"], job["link"]))
+                # One record per role, however many sources listed it: the
+                # preferred copy so far (a better one may still replace it)
+                jobs = [j for j in jobs if deduper.add(j)]
+                counts["unique"] += len(jobs)
+                # Location + experience eligibility
+                jobs = [j for j in jobs if is_valid_internship(j)]
+                counts["eligible"] += len(jobs)
+                jobs = [j for j in jobs if stipend_passes_filter(j.get("stipend", ""), MIN_STIPEND)]
+                counts["stipend"] += len(jobs)
+
+                for job in jobs:
+                    jid = job_id(job["title"], job["company"], job["link"])
+                    job["id"] = jid
+                    if jid in seen or legacy_job_id(job["title"], job["company"], job["link"]) in seen:
+                        seen.touch(jid)   # still listed — push its expiry out
+                        deduper.claim(job)
+                        continue
+                    await new_jobs.put(job)
+        finally:
+            await new_jobs.put(None)
+
+    async def alert_stage():
+        nonlocal first_alert
+        digest = []
+
+        async def send_digest():
+            payloads = render_digests(digest)
+            log.info(f"📦 {len(digest)} new jobs → {len(payloads)} digest messages")
+            for payload in payloads:
+                await delivery.enqueue(payload)
+            digest.clear()
+
+        while (job := await new_jobs.get()) is not None:
+            # Skip it if a copy from a preferred source (say the Greenhouse
+            # record of a LinkedIn repost) was found while it waited here
+            if not deduper.claim(job):
+                continue
+            # The outbox makes a queued alert durable, so the job counts as
+            # seen now rather than when Telegram confirms it
+            seen.add(job["id"])
+            counts["new"] += 1
+            if counts["new"] <= DIGEST_THRESHOLD:
+                await delivery.enqueue(render_job_alert(job, auto_applied=False))
+            else:
+                digest.append(job)
+                if len(digest) >= DIGEST_MAX_JOBS:
+                    await send_digest()
+            if first_alert is None:
+                first_alert = time.monotonic() - started
+                log.info(f"⏱️ Time to first alert: {first_alert:.1f}s")
+            if applier is not None and await applier.enqueue(job):
+                counts["queued"] += 1
+        if digest:
+            await send_digest()
+
+    stages = [asyncio.create_task(stage()) for stage in (scrape_stage, filter_stage, alert_stage)]
+    try:
+        # If one stage fails the others would block on its queue — stop them all
+        done, _ = await asyncio.wait(stages, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception():
+                raise task.exception()
+    finally:
+        for task in stages:
+            task.cancel()
+        seen.flush()
+        save_verdict_cache()
+
+    # Only a completed cycle advances the snapshots; otherwise this fetch's
+    # postings are diffed (and processed) again next time
+    for source_id, delta in deltas:
+        snapshots.commit(source_id, delta)
+    # ...and only then may the schedule count them, or a failed cycle's
+    # postings would be counted again against the next poll's window
+    for source_id, added, fetched_at in polls:
+        record_poll(source_id, added, now=fetched_at)
+
+    cache_after = verdict_cache_stats()
+    hits = cache_after["hits"] - cache_before["hits"]
+    log.info(
+        f"Pipeline: {counts['scraped']} scraped ({counts['removed']} removed since last poll) → "
+        f"{counts['fresh']} added/changed → {counts['unique']} unique → "
+        f"{counts['eligible']} eligible ({hits} cached verdicts) → "
+        f"{counts['stipend']} passed ₹{MIN_STIPEND//1000}k+ stipend → {counts['new']} new "
+        f"in {time.monotonic() - started:.1f}s"
+        + (f", first alert at {first_alert:.1f}s" if first_alert is not None else "")
+    )
+    return counts["new"], counts["eligible"], counts["stipend"], counts["queued"]
 
 
 # ─────────────────────────────────────────────
@@ -229,22 +407,56 @@ async def main():
 
     bot  = Bot(token=TELEGRAM_TOKEN)
     seen = load_seen()
+    delivery = DeliveryQueue(bot)
+    delivery.start()
+    snapshots = SnapshotStore(snapshot_version())
+    applier = ApplyQueue() if AUTO_APPLY_ENABLED else None
+    forwarder = None
+    if applier is not None:
+        applier.start()
+        forwarder = asyncio.create_task(forward_apply_results(applier, delivery))
 
     log.info("🚀 Internship Hunter Bot V2 starting...")
-    await send_startup_message(bot)
-
-    while True:
-        try:
-            log.info("🔍 Starting scrape cycle...")
-            new, total, filtered, applied = await run_cycle(bot, seen)
-            log.info(f"✅ Cycle done — {new} new, {applied} auto-applied")
-            if new > 0 or total > 0:
-                await send_cycle_summary(bot, new, total, filtered, applied)
-        except Exception as e:
-            log.error(f"Cycle error: {e}")
-
-        log.info(f"😴 Sleeping {CHECK_INTERVAL}s...")
-        await asyncio.sleep(CHECK_INTERVAL)
+    await send_startup_message(delivery)
+
+    names = source_ids()
+    try:
+        while True:
+            # Each wake-up scrapes only the sources the schedule says are due
+            due = due_sources(names)
+            try:
+                if due:
+                    log.info(f"🔍 Starting scrape cycle — {len(due)}/{len(names)} sources due...")
+                    new, total, filtered, queued = await run_cycle(delivery, seen, snapshots, due, applier)
+                    # Applications finish in the background; report those done since the last summary
+                    applied = applier.take_applied() if applier is not None else 0
+                    log.info(f"✅ Cycle done — {new} new, {queued} queued for auto-apply, {applied} auto-applied")
+                    if new > 0:
+                        await send_cycle_summary(delivery, new, total, filtered, applied,
+                                                 next_scan=seconds_until_next(names))
+                    # Scrapers swallow their own errors; a pool gone bad shows up as a failure rate
+                    await reset_if_failing()
+            except Exception as e:
+                log.error(f"Cycle error: {e}")
+                # Rebuild the pooled client in case it is what broke
+                await reset_client()
+            finally:
+                save_schedule()
+
+            seen.expire()
+            wait = min(CHECK_INTERVAL, max(POLL_TICK, seconds_until_next(names)))
+            log.info(f"😴 Sleeping {wait:.0f}s...")
+            await asyncio.sleep(wait)
+    finally:
+        if applier is not None:
+            forwarder.cancel()
+            await applier.stop()
+        await delivery.stop()
+        snapshots.close()
+        seen.close()
+        await close_client()
+        await close_pool()
+        shutdown_parse_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+🧭 Shared Browser Pool
+One headless Chromium that lives as long as the process. Auto-apply
+handlers borrow a page from get_pool().page() instead of starting
+Playwright and launching a browser for every application.
+
+- The browser is what is pooled. Each application gets a new context
+  (cheap next to a launch) that is closed when it finishes, so no
+  cookies, localStorage, sessionStorage or IndexedDB carry over and one
+  ATS never sees another's session.
+- At most BROWSER_POOL_SIZE contexts are open at once; callers beyond
+  that wait for one to close.
+- If Chromium itself dies, the next page() relaunches it.
+- Every context aborts images, fonts, media and known trackers
+  (BROWSER_BLOCK_*) before they are fetched; forms load without them.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from config import (
+    BROWSER_POOL_SIZE, BROWSER_USER_AGENT,
+    BROWSER_BLOCK_RESOURCE_TYPES, BROWSER_BLOCK_HOSTS,
+)
+
+log = logging.getLogger("Browser")
+
+
+def _blocked_host(url: str) -> bool:
+    host = urlsplit(url).hostname or ""
+    return any(host == h or host.endswith("." + h) for h in BROWSER_BLOCK_HOSTS)
+
+
+class BrowserPool:
+    def __init__(self, size: int = BROWSER_POOL_SIZE):
+        self.size = size
+        self.slots = asyncio.Semaphore(size)
+        self.launch_lock = asyncio.Lock()
+        self.playwright = None
+        self.browser = None
+        self.launches = 0
+        self.contexts_opened = 0
+        self.pages_served = 0
+        self.requests_blocked = 0
+
+    # ── browser ────────────────────────────────
+
+    async def _ensure_browser(self):
+        async with self.launch_lock:
+            if self.browser is not None and self.browser.is_connected():
+                return self.browser
+            if self.browser is not None:
+                log.warning("♻️ Chromium disconnected — relaunching")
+            if self.playwright is None:
+                # Imported here so the bot runs without Playwright until something applies
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.launches += 1
+            log.info("Chromium ready")
+            return self.browser
+
+    # ── contexts ───────────────────────────────
+
+    async def _new_context(self):
+        browser = await self._ensure_browser()
+        context = await browser.new_context(user_agent=BROWSER_USER_AGENT)
+        await context.route("**/*", self._route)
+        self.contexts_opened += 1
+        return context
+
+    async def _route(self, route):
+        request = route.request
+        if not request.is_navigation_request() and (
+                request.resource_type in BROWSER_BLOCK_RESOURCE_TYPES
+                or _blocked_host(request.url)):
+            self.requests_blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def page(self):
+        """A page in a fresh context of the shared browser; the context is closed on exit."""
+        async with self.slots:
+            context = await self._new_context()
+            try:
+                page = await context.new_page()
+                self.pages_served += 1
+                yield page
+            finally:
+                try:
+                    await context.close()
+                except Exception as e:
+                    log.debug(f"Error closing browser context: {e}")
+
+    # ── shutdown ───────────────────────────────
+
+    async def close(self):
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as e:
+                log.debug(f"Error closing Chromium: {e}")
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+        if self.pages_served:
+            log.info(
+                f"Browser pool: {self.pages_served} applications, "
+                f"{self.launches} launches, {self.contexts_opened} contexts, "
+                f"{self.requests_blocked} requests blocked"
+            )
+
+
+_pool: BrowserPool | None = None
+
+
+def get_pool() -> BrowserPool:
+    """Return the shared pool; Chromium itself starts on the first page()."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_pool():
+    """Close the browser on shutdown."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -52,7 +52,7 @@ ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 # FILTERS
 # ─────────────────────────────────────────────
 MIN_STIPEND = 40000
-CHECK_INTERVAL = 3600
+CHECK_INTERVAL = 3600             # first-poll interval, before a source's rate is learned
 
 KEYWORDS = [
     "backend", "backend developer", "backend engineer",
@@ -68,6 +68,152 @@ EXCLUDE_KEYWORDS = [
     "unpaid", "no stipend",
 ]
 
+# ─────────────────────────────────────────────
+# SCRAPE SCHEDULER
+# ─────────────────────────────────────────────
+MAX_CONCURRENT_REQUESTS = 24      # global in-flight cap across all sources
+DEFAULT_HOST_CONCURRENCY = 2      # per-host cap for hosts not listed below
+HOST_CONCURRENCY = {
+    "boards-api.greenhouse.io": 6,
+    "api.lever.co":             4,
+}
+
+# Seconds a single source may run before it is abandoned.
+# Job boards page through several searches sequentially, so they get more.
+SOURCE_TIMEOUTS = {
+    "board":       90,
+    "career_page": 30,
+    "greenhouse":  30,
+    "lever":       30,
+}
+
+# Lower starts first. Slow multi-request HTML sources go first so they
+# don't end up as the tail of the cycle; the fast JSON APIs fill the gaps.
+SOURCE_PRIORITY = {
+    "board":       0,
+    "career_page": 1,
+    "greenhouse":  2,
+    "lever":       2,
+}
+
+# Greenhouse: list boards without ?content=true, then fetch /jobs/{id}
+# only for titles that pass the keyword + internship filters
+GREENHOUSE_TWO_PHASE = True
+GREENHOUSE_DETAIL_CONCURRENCY = 4  # detail requests in flight per board
+
+# HTML parsing runs off the event loop: a process pool by default,
+# threads if processes are unavailable or PARSE_IN_PROCESSES is off
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+PARSE_IN_PROCESSES = True
+
+# Scrape → filter → alert stages hand batches over through queues this
+# deep; a full queue makes the stage before it wait (backpressure)
+PIPELINE_QUEUE_SIZE = 16
+
+# ─────────────────────────────────────────────
+# ADAPTIVE POLLING (poll_schedule.json)
+# ─────────────────────────────────────────────
+POLL_MIN_INTERVAL = 10 * 60       # never poll one source more often than this
+POLL_MAX_INTERVAL = 12 * 3600     # ...or less often than this
+POLL_TARGET_NEW = 1.0             # aim for about this many new postings per visit
+POLL_EWMA_ALPHA = 0.3             # weight of the latest poll in the learned rate
+POLL_BUDGET_PER_HOUR = 300        # source polls per hour across everything
+POLL_TICK = 60                    # shortest sleep between scheduler wake-ups
+
+# ─────────────────────────────────────────────
+# HTTP CLIENT
+# ─────────────────────────────────────────────
+HTTP2_ENABLED = True              # used when the server supports it and h2 is installed
+HTTP_KEEPALIVE_EXPIRY = 120       # seconds an idle pooled connection is kept
+HTTP_POOL_HEADROOM = 8            # connections beyond MAX_CONCURRENT_REQUESTS (cover letters etc.)
+HTTP_RESET_MIN_FAILURES = 10      # rebuild the client after a cycle with at least this many
+HTTP_RESET_FAILURE_RATIO = 0.5    # ...transport-level failures, making up this share of requests
+
+# ─────────────────────────────────────────────
+# CROSS-SOURCE DEDUP
+# ─────────────────────────────────────────────
+# When one role arrives from several sources, keep the record from the
+# earliest source in this list (ATS boards carry the real apply link)
+DEDUP_SOURCE_PREFERENCE = [
+    "Greenhouse", "Lever", "Career Page", "Internshala",
+    "Unstop", "Wellfound", "Naukri", "LinkedIn",
+]
+DEDUP_SIMILARITY = 0.7            # title-shingle Jaccard at which two postings of one company merge
+
+# ─────────────────────────────────────────────
+# TELEGRAM DELIVERY
+# ─────────────────────────────────────────────
+# Bot API flood limits: ~1 msg/s per chat (short bursts tolerated),
+# ~30 msg/s across all chats. Stay a little under both.
+TELEGRAM_CHAT_RATE = 1.0          # messages per second, per chat
+TELEGRAM_CHAT_BURST = 3
+TELEGRAM_GLOBAL_RATE = 25.0       # messages per second, all chats
+DELIVERY_WORKERS = 4
+DELIVERY_QUEUE_SIZE = 500         # enqueue waits when this many are in flight
+DELIVERY_MAX_ATTEMPTS = 5         # network failures before a message is dropped
+DELIVERY_BACKOFF = 2.0            # seconds, doubled per failed attempt
+
+# More new jobs than this in one cycle → send digests instead of one alert each
+DIGEST_THRESHOLD = 5
+DIGEST_MAX_JOBS = 20              # jobs per digest message (one apply button each)
+DIGEST_BUTTONS_PER_ROW = 4
+
+# ─────────────────────────────────────────────
+# AUTO-APPLY BROWSER
+# ─────────────────────────────────────────────
+# One headless Chromium per process; each application gets a fresh
+# context in it instead of launching its own browser
+BROWSER_POOL_SIZE = 2             # contexts (= applications) open at once
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Requests the application forms never need — aborted before they go out.
+# Page navigations are never blocked, whatever their host.
+BROWSER_BLOCK_RESOURCE_TYPES = {"image", "media", "font"}
+BROWSER_BLOCK_HOSTS = [          # a host and all its subdomains
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "facebook.net", "facebook.com", "hotjar.com",
+    "segment.io", "segment.com", "mixpanel.com", "amplitude.com",
+    "clarity.ms", "bat.bing.com", "px.ads.linkedin.com", "snap.licdn.com", "ads-twitter.com",
+    "fullstory.com", "intercom.io", "track.hubspot.com", "hs-analytics.net",
+    "newrelic.com", "nr-data.net", "sentry.io", "optimizely.com",
+]
+
+# Playwright timeouts (ms) for the apply flows
+APPLY_NAV_TIMEOUT = 20000         # page load, up to DOMContentLoaded
+APPLY_READY_TIMEOUT = 10000       # ...then until the form is in the DOM
+APPLY_UPLOAD_TIMEOUT = 5000       # resume upload/parse request to settle
+APPLY_CONFIRM_TIMEOUT = 10000     # submit → URL change, success message or accepted POST
+
+# ─────────────────────────────────────────────
+# AUTO-APPLY QUEUE (apply_queue table in bot_state.db)
+# ─────────────────────────────────────────────
+AUTO_APPLY_ENABLED = False        # queue every new alerted job for auto-apply (opt in)
+APPLY_WORKERS = 2                 # applications in flight (each holds a pooled browser context)
+APPLY_ATS_CONCURRENCY = {         # ...and per ATS, so one site never sees a burst
+    "internshala": 1,
+    "greenhouse":  2,
+    "lever":       2,
+    "generic":     1,
+}
+APPLY_MAX_ATTEMPTS = 3            # failed attempts before a job is given up
+APPLY_BACKOFF = 300.0             # seconds before the first retry, doubled per failure
+
+# ─────────────────────────────────────────────
+# COVER LETTERS (cover_letters.json)
+# ─────────────────────────────────────────────
+COVER_LETTER_CACHE_SIZE = 2000    # letters kept, least recently used evicted first
+COVER_LETTER_CONCURRENCY = 4      # Claude API calls in flight
+COVER_LETTER_RATE = 0.8           # Claude API calls per second (~50/min)
+
+# ─────────────────────────────────────────────
+# STATE DB (bot_state.db)
+# ─────────────────────────────────────────────
+SEEN_TTL_DAYS = 7                 # forget a job once it hasn't been listed for this long
+SEEN_FLUSH_EVERY = 25             # seen-job writes batched per transaction
+
 # ─────────────────────────────────────────────
 # ELIGIBILITY FILTERS
 # ─────────────────────────────────────────────
@@ -91,6 +237,10 @@ EXPERIENCE_ALLOWLIST = [
     "2026", "2027",
 ]
 
+# Eligibility verdicts are cached by job content (verdict_cache.json);
+# any change to the rules or the lists above discards the cache
+VERDICT_CACHE_SIZE = 50_000       # entries kept, least recently used evicted first
+
 # ─────────────────────────────────────────────
 # COMPANY CAREER PAGES (Direct monitoring)
 # ─────────────────────────────────────────────
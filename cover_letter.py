@@ -2,10 +2,34 @@
 ✍️ AI Cover Letter Generator
 Uses Claude API to generate personalized cover letters for each job.
 Falls back to a template if no API key is set.
+
+Generated letters are cached on disk (cover_letters.json), keyed by a hash
+of the model and the exact prompt, so a re-scraped listing never costs a
+second API call. The least recently used letters are evicted past
+COVER_LETTER_CACHE_SIZE. API calls are limited to
+COVER_LETTER_CONCURRENCY at once and COVER_LETTER_RATE per second.
+Concurrent requests for the same letter share one call, so pre-generating
+a batch ahead of the apply handlers never duplicates work.
 """
 
-import httpx
-from config import PROFILE, ANTHROPIC_API_KEY
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+
+from config import (
+    PROFILE, ANTHROPIC_API_KEY,
+    COVER_LETTER_CACHE_SIZE, COVER_LETTER_CONCURRENCY, COVER_LETTER_RATE,
+)
+from http_client import get_client
+from rate_limit import TokenBucket
+
+log = logging.getLogger("CoverLetter")
+
+MODEL = "claude-haiku-4-5-20251001"
+COVER_LETTER_CACHE_FILE = Path("cover_letters.json")
 
 
 TEMPLATE = """Dear Hiring Team,
@@ -27,25 +51,8 @@ Best regards,
 """
 
 
-async def generate_cover_letter(job_title: str, company: str, job_description: str = "") -> str:
-    """Generate a personalized cover letter. Uses Claude API if key is set, else template."""
-
-    if ANTHROPIC_API_KEY:
-        try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers={
-                        "x-api-key": ANTHROPIC_API_KEY,
-                        "anthropic-version": "2023-06-01",
-                        "content-type": "application/json",
-                    },
-                    json={
-                        "model": "claude-haiku-4-5-20251001",
-                        "max_tokens": 600,
-                        "messages": [{
-                            "role": "user",
-                            "content": f"""Write a concise, professional cover letter for this internship application.
+def _prompt(job_title: str, company: str, job_description: str) -> str:
+    return f"""Write a concise, professional cover letter for this internship application.
 
 Applicant profile:
 - Name: {PROFILE['name']}
@@ -66,13 +73,113 @@ Instructions:
 - Do NOT use placeholders like [Your Name] — use the actual values above
 - Plain text only, no markdown
 """
-                        }]
-                    }
-                )
-                data = resp.json()
-                return data["content"][0]["text"].strip()
+
+
+# ─────────────────────────────────────────────
+# LETTER CACHE
+# ─────────────────────────────────────────────
+
+_letters: OrderedDict | None = None    # prompt hash → letter, LRU order
+_dirty = False
+_inflight: dict[str, asyncio.Future] = {}
+_limits: tuple[asyncio.Semaphore, TokenBucket] | None = None
+
+
+def _load() -> OrderedDict:
+    global _letters
+    if _letters is None:
+        _letters = OrderedDict()
+        if COVER_LETTER_CACHE_FILE.exists():
+            try:
+                with open(COVER_LETTER_CACHE_FILE) as f:
+                    _letters.update(json.load(f))
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not read cover letter cache: {e}")
+    return _letters
+
+
+def _key(prompt: str) -> str:
+    return hashlib.sha256(f"{MODEL}\x1f{prompt}".encode()).hexdigest()
+
+
+def save_cover_letter_cache():
+    """Write the cache to disk if a letter was added since the last save."""
+    global _dirty
+    if not _dirty or _letters is None:
+        return
+    tmp = COVER_LETTER_CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(list(_letters.items()), f)
+    tmp.replace(COVER_LETTER_CACHE_FILE)
+    _dirty = False
+
+
+async def _call_api(prompt: str) -> str:
+    global _limits
+    if _limits is None:
+        _limits = (asyncio.Semaphore(COVER_LETTER_CONCURRENCY),
+                   TokenBucket(COVER_LETTER_RATE, COVER_LETTER_CONCURRENCY))
+    slots, bucket = _limits
+    async with slots:
+        await bucket.acquire()
+        client = get_client()
+        resp = await client.post(
+            "https://api.anthropic.com/v1/messages",
+            timeout=30,
+            headers={
+                "x-api-key": ANTHROPIC_API_KEY,
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json",
+            },
+            json={
+                "model": MODEL,
+                "max_tokens": 600,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        )
+    resp.raise_for_status()
+    data = resp.json()
+    return data["content"][0]["text"].strip()
+
+
+async def _generate(key: str, prompt: str) -> str:
+    global _dirty
+    letter = await _call_api(prompt)
+    letters = _load()
+    letters[key] = letter
+    while len(letters) > COVER_LETTER_CACHE_SIZE:
+        letters.popitem(last=False)
+    _dirty = True
+    return letter
+
+
+# ─────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────
+
+async def generate_cover_letter(job_title: str, company: str, job_description: str = "") -> str:
+    """Generate a personalized cover letter. Uses Claude API if key is set, else template."""
+    global _dirty
+
+    if ANTHROPIC_API_KEY:
+        prompt = _prompt(job_title, company, job_description)
+        key = _key(prompt)
+        letters = _load()
+        if key in letters:
+            letters.move_to_end(key)
+            _dirty = True
+            return letters[key]
+        try:
+            task = _inflight.get(key)
+            if task is None:
+                task = _inflight[key] = asyncio.ensure_future(_generate(key, prompt))
+                task.add_done_callback(lambda _: _inflight.pop(key, None))
+            # Shielded: a caller giving up must not cancel the call others wait on
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"Claude API error, using template: {e}")
+            log.warning(f"Claude API error, using template: {e}")
 
     # Fallback template
     return TEMPLATE.format(
@@ -0,0 +1,280 @@
+"""
+🧬 Cross-Source Dedup
+The same internship reaches us from several paths — a company's career
+page and its Greenhouse/Lever board, LinkedIn reposting an ATS listing,
+tracking params on an otherwise identical URL. This stage clusters those
+records and lets one preferred record per cluster through.
+
+Records are linked when they share a canonical URL that names a single
+posting (see is_posting_url) or a normalized (company, title) key. Inside a company they are also linked by MinHash
+over title words, bucketed with LSH, so near-duplicate titles
+("Software Engineer Intern - Payments" / "Software Engineer Intern,
+Payments Team") are found without comparing every pair.
+"""
+
+import functools
+import hashlib
+import logging
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from config import DEDUP_SOURCE_PREFERENCE, DEDUP_SIMILARITY
+
+log = logging.getLogger("Dedup")
+
+# ─────────────────────────────────────────────
+# CANONICAL URL
+# ─────────────────────────────────────────────
+
+# Query params that only say how a visitor arrived, never which job it is
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "_ga", "igshid",
+    "ref", "refid", "referrer", "src", "source", "trk", "trackingid", "lipi",
+    "gh_src", "lever-source", "lever-origin", "originalsubdomain",
+}
+TRACKING_PREFIXES = ("utm_", "lever-source[")
+
+# Hosts that serve the same posting under another name
+HOST_ALIASES = {
+    "job-boards.greenhouse.io": "boards.greenhouse.io",
+    "in.linkedin.com":          "linkedin.com",
+}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a job URL so the same posting compares equal: lowercase
+    scheme/host, no www., tracking params dropped, remaining params sorted,
+    no trailing slash, no fragment — except hash routes ("#/job/42"),
+    which identify the page on single-page career sites.
+    """
+    url = url.strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    host = host[4:] if host.startswith("www.") else host
+    host = HOST_ALIASES.get(host, host)
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip("/")
+    if host == "jobs.lever.co" and path.endswith("/apply"):
+        path = path[: -len("/apply")]          # applyUrl vs hostedUrl
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit(("https", host, path, urlencode(query), fragment))
+
+
+# Last path segments of pages that list many postings rather than one
+LISTING_SEGMENTS = {
+    "jobs", "job", "careers", "career", "internships", "internship", "openings",
+    "positions", "vacancies", "opportunities", "search", "join-us", "work-with-us",
+}
+
+
+def is_posting_url(url: str) -> bool:
+    """
+    True if a canonical URL can point at one posting only — not a bare
+    domain ("https://naukri.com") or a listing page ("/jobs", "/careers/#/").
+    Scrapers fall back to such links when a card has none of its own, so
+    they must never tie two records together.
+    """
+    parts = urlsplit(url)
+    route = parts.path.strip("/")
+    if parts.fragment.strip("/!"):
+        route = f"{route}/{parts.fragment.strip('/!')}"   # hash-routed career sites
+    if not route:
+        return False
+    return route.rsplit("/", 1)[-1].lower() not in LISTING_SEGMENTS
+
+
+# ─────────────────────────────────────────────
+# NORMALIZED KEYS
+# ─────────────────────────────────────────────
+
+_COMPANY_SUFFIXES = {
+    "inc", "ltd", "llc", "llp", "pvt", "private", "limited", "corp", "corporation",
+    "co", "company", "technologies", "technology", "tech", "labs", "india", "hq",
+    "software", "solutions",
+}
+
+# Spellings of the same title word
+_TITLE_SYNONYMS = {
+    "sde": "software engineer", "swe": "software engineer", "sw": "software",
+    "engg": "engineer", "engineering": "engineer", "dev": "developer",
+    "development": "developer", "internship": "intern",
+    "interns": "intern", "fullstack": "full stack", "backend": "back end",
+    "frontend": "front end", "ml": "machine learning", "ai": "artificial intelligence",
+}
+
+# Words that vary between copies of one posting without changing the role
+_TITLE_NOISE = {"summer", "winter", "fall", "spring", "the", "a", "an", "and", "for", "of", "role", "opening"}
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+_YEAR = re.compile(r"^20\d\d$")
+
+
+def company_key(company: str) -> str:
+    words = _NON_WORD.sub(" ", company.lower()).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return "".join(words)
+
+
+def title_key(title: str) -> str:
+    words = []
+    for word in _NON_WORD.sub(" ", title.lower()).split():
+        if word in _TITLE_NOISE or _YEAR.match(word):
+            continue
+        words.extend(_TITLE_SYNONYMS.get(word, word).split())
+    return " ".join(words)
+
+
+# ─────────────────────────────────────────────
+# MINHASH / LSH
+# ─────────────────────────────────────────────
+
+MINHASH_BANDS = 4
+MINHASH_ROWS = 4               # 16 hashes; pairs above ~0.7 Jaccard usually share a band
+BUCKET_SCAN = 32               # newest bucket members compared per record — keeps a huge company linear
+
+
+def shingles(key: str) -> frozenset[str]:
+    """Word set of a title key. Words, not character n-grams: "android engineer
+    intern" and "ios engineer intern" share most 3-grams but are different roles."""
+    return frozenset(key.split())
+
+
+@functools.lru_cache(maxsize=65536)
+def _token_hashes(token: str) -> tuple[int, ...]:
+    """One 64-byte digest = 16 independent 32-bit hashes of a token."""
+    return tuple(memoryview(hashlib.blake2b(token.encode(), digest_size=64).digest()).cast("I"))
+
+
+def minhash(tokens: frozenset[str]) -> tuple[int, ...]:
+    if not tokens:
+        return ()
+    return tuple(map(min, zip(*map(_token_hashes, tokens))))
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+# ─────────────────────────────────────────────
+# CLUSTERING
+# ─────────────────────────────────────────────
+
+def _source_rank(job: dict) -> int:
+    source = job.get("source", "")
+    for rank, name in enumerate(DEDUP_SOURCE_PREFERENCE):
+        if source.startswith(name):
+            return rank
+    return len(DEDUP_SOURCE_PREFERENCE)
+
+
+def _has_stipend(job: dict) -> bool:
+    return job.get("stipend", "") not in ("", "Check listing", "Not mentioned")
+
+
+class Deduper:
+    """
+    Incremental clustering: add() records one at a time, as sources finish.
+    Each record is hashed once and only compared with records that share an
+    LSH bucket, so the cost stays near-linear in the number of records.
+
+    Records arrive in whatever order their sources finish, so each cluster
+    tracks its preferred record (DEDUP_SOURCE_PREFERENCE, then a known
+    stipend, then the longer description) and whether one of its records
+    has been claimed — alerted, or judged in an earlier cycle. A better
+    copy can take over a cluster until the moment it is claimed.
+    """
+
+    def __init__(self):
+        self.jobs: list[dict] = []
+        self.parent: list[int] = []
+        self.best: list[int] = []          # per root: index of the preferred record
+        self.claimed: list[bool] = []      # per root
+        self.index: dict[int, int] = {}    # id(job) → index
+        self.shingle_sets: list[frozenset[str]] = []
+        self.first_by_key: dict[tuple, int] = {}
+        self.buckets: dict[tuple, list[int]] = {}
+
+    def _rank(self, i: int) -> tuple:
+        job = self.jobs[i]
+        return _source_rank(job), not _has_stipend(job), -len(job.get("description", "")), i
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            root, child = min(ri, rj), max(ri, rj)
+            self.parent[child] = root
+            self.best[root] = min(self.best[root], self.best[child], key=self._rank)
+            self.claimed[root] = self.claimed[root] or self.claimed[child]
+
+    def add(self, job: dict, claimed: bool = False) -> bool:
+        """
+        Cluster one record. True if it is now the preferred record of a
+        cluster nobody has claimed yet, i.e. the one worth processing.
+        `claimed` marks a record that was already handled.
+        """
+        i = len(self.jobs)
+        self.jobs.append(job)
+        self.parent.append(i)
+        self.best.append(i)
+        self.claimed.append(claimed)
+        self.index[id(job)] = i
+        company = company_key(job.get("company", ""))
+        title = title_key(job.get("title", ""))
+        self.shingle_sets.append(shingles(title))
+
+        urls = {canonical_url(job.get("link", "")), canonical_url(job.get("apply_url", ""))}
+        keys = [("url", url) for url in urls if is_posting_url(url)]
+        if title:
+            keys.append(("title", company, title))
+        for key in keys:
+            self.union(i, self.first_by_key.setdefault(key, i))
+
+        signature = minhash(self.shingle_sets[i])
+        for band in range(MINHASH_BANDS if signature else 0):
+            bucket = self.buckets.setdefault(
+                (company, band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]), []
+            )
+            for j in bucket[-BUCKET_SCAN:]:
+                if (self.find(i) != self.find(j)
+                        and jaccard(self.shingle_sets[i], self.shingle_sets[j]) >= DEDUP_SIMILARITY):
+                    self.union(i, j)
+            bucket.append(i)
+        root = self.find(i)
+        return not self.claimed[root] and self.best[root] == i
+
+    def claim(self, job: dict) -> bool:
+        """
+        Mark an added record as the one its cluster is handled by. False if
+        a preferred copy has arrived since, or the cluster is already claimed.
+        """
+        i = self.index[id(job)]
+        root = self.find(i)
+        if self.claimed[root] or self.best[root] != i:
+            return False
+        self.claimed[root] = True
+        return True
+
+    def clusters(self) -> list[list[dict]]:
+        """Records grouped by cluster, in order of each cluster's first record."""
+        grouped: dict[int, list[dict]] = {}
+        for i, job in enumerate(self.jobs):
+            grouped.setdefault(self.find(i), []).append(job)
+        return list(grouped.values())
@@ -0,0 +1,182 @@
+"""
+📬 Telegram Delivery Queue
+Alerts are rendered to plain payload dicts, written to the outbox table and
+sent by background workers, so a cycle never waits on Telegram.
+
+- Token buckets per chat and across all chats keep us under the Bot API
+  flood limits instead of a fixed sleep between messages.
+- RetryAfter pauses that chat's bucket for as long as Telegram asks, and
+  the message goes back in the queue without counting as a failure.
+- Network errors retry with exponential backoff, up to
+  DELIVERY_MAX_ATTEMPTS.
+- A formatted message Telegram rejects (bad markup) is sent once more as
+  plain text; anything rejected after that (bot blocked, bad plain text)
+  is dropped, and the job titles it carried are logged.
+- Anything unsent at shutdown stays in the outbox and is sent after restart.
+
+Payload: {"chat_id", "text", "parse_mode", "buttons": [[[label, url], ...], ...],
+          "disable_web_page_preview", "titles": [job titles, for the log]}
+"""
+
+import asyncio
+import logging
+import re
+from datetime import timedelta
+
+from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from config import (
+    TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST, TELEGRAM_GLOBAL_RATE,
+    DELIVERY_WORKERS, DELIVERY_QUEUE_SIZE, DELIVERY_MAX_ATTEMPTS, DELIVERY_BACKOFF,
+)
+from rate_limit import TokenBucket
+from storage import Outbox
+
+log = logging.getLogger("Delivery")
+
+
+def _seconds(retry_after) -> float:
+    """RetryAfter.retry_after is an int in PTB 21, a timedelta in later releases."""
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+_MARKDOWN_V2 = re.compile(r"\\(.)|[*_~`]")
+
+
+def as_plain_text(payload: dict) -> dict:
+    """The payload without MarkdownV2: escapes undone, emphasis markers dropped."""
+    text = payload["text"]
+    if payload.get("parse_mode"):
+        text = _MARKDOWN_V2.sub(lambda m: m.group(1) or "", text)
+    return {**payload, "text": text, "parse_mode": None}
+
+
+def _message_kwargs(payload: dict) -> dict:
+    rows = [
+        [InlineKeyboardButton(label, url=url) for label, url in row]
+        for row in payload.get("buttons", [])
+    ]
+    return {
+        "chat_id":    payload["chat_id"],
+        "text":       payload["text"],
+        "parse_mode": payload.get("parse_mode"),
+        "reply_markup": InlineKeyboardMarkup(rows) if rows else None,
+        "disable_web_page_preview": payload.get("disable_web_page_preview", False),
+    }
+
+
+class DeliveryQueue:
+    def __init__(self, bot: Bot, outbox: Outbox | None = None):
+        self.bot = bot
+        self.outbox = outbox or Outbox()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=DELIVERY_QUEUE_SIZE)
+        self.global_bucket = TokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_RATE)
+        self.chat_buckets: dict = {}
+        self.tasks: set[asyncio.Task] = set()
+        self.sent = 0
+        self.dropped = 0
+
+    # ── lifecycle ──────────────────────────────
+
+    def start(self):
+        """Start the workers and re-queue whatever the last run left unsent."""
+        for _ in range(DELIVERY_WORKERS):
+            self._spawn(self._worker())
+        pending = self.outbox.pending()
+        if pending:
+            log.info(f"📬 Resuming {len(pending)} undelivered messages")
+            self._spawn(self._requeue(pending))
+
+    async def stop(self):
+        """Stop sending. Unsent messages stay in the outbox for the next start."""
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.outbox.close()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    # ── producer side ──────────────────────────
+
+    async def enqueue(self, payload: dict):
+        """Persist a message and queue it; waits while the queue is full."""
+        msg_id = self.outbox.put(payload)
+        await self.queue.put((msg_id, payload, 0))
+
+    async def _requeue(self, items: list[tuple[int, dict, int]]):
+        for item in items:
+            await self.queue.put(item)
+
+    async def _retry_later(self, item: tuple[int, dict, int], delay: float):
+        await asyncio.sleep(delay)
+        await self.queue.put(item)
+
+    # ── consumer side ──────────────────────────
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(TELEGRAM_CHAT_RATE, TELEGRAM_CHAT_BURST)
+        return self.chat_buckets[chat_id]
+
+    async def _worker(self):
+        while True:
+            item = await self.queue.get()
+            try:
+                await self._deliver(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Delivery worker error: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def _deliver(self, item: tuple[int, dict, int]):
+        msg_id, payload, attempts = item
+        bucket = self._chat_bucket(payload["chat_id"])
+        await bucket.acquire()
+        await self.global_bucket.acquire()
+        try:
+            await self.bot.send_message(**_message_kwargs(payload))
+        except RetryAfter as e:
+            wait = _seconds(e.retry_after)
+            log.warning(f"Telegram flood control — pausing chat {payload['chat_id']} for {wait:g}s")
+            bucket.pause(wait)
+            self._spawn(self._retry_later(item, wait))
+            return
+        except BadRequest as e:
+            if payload.get("parse_mode"):
+                # Most likely the markup; the same alert as plain text still gets through
+                log.warning(f"Message rejected ({e}), resending as plain text")
+                self._spawn(self._retry_later((msg_id, as_plain_text(payload), attempts), 0))
+                return
+            self._drop(msg_id, payload, f"rejected: {e}")
+            return
+        except Forbidden as e:
+            # The same request would be rejected again
+            self._drop(msg_id, payload, f"rejected: {e}")
+            return
+        except NetworkError as e:
+            attempts += 1
+            if attempts >= DELIVERY_MAX_ATTEMPTS:
+                self._drop(msg_id, payload, f"gave up after {attempts} attempts: {e}")
+                return
+            delay = DELIVERY_BACKOFF * 2 ** (attempts - 1)
+            log.warning(f"Send failed ({e}), retry {attempts}/{DELIVERY_MAX_ATTEMPTS - 1} in {delay:g}s")
+            self.outbox.set_attempts(msg_id, attempts)
+            self._spawn(self._retry_later((msg_id, payload, attempts), delay))
+            return
+        self.outbox.done(msg_id)
+        self.sent += 1
+
+    def _drop(self, msg_id: int, payload: dict, reason: str):
+        titles = payload.get("titles") or []
+        log.error(f"Dropping message, {reason}" + (f" — jobs: {'; '.join(titles)}" if titles else ""))
+        self.outbox.done(msg_id)
+        self.dropped += 1
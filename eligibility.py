@@ -1,10 +1,18 @@
 """
 eligibility.py — Strict Internship Eligibility Engine
 All regex compiled once at module load. Single entry point: is_valid_internship(job)
+Verdicts are memoised by job content across cycles (see VERDICT CACHE).
 """
 
+import hashlib
+import itertools
+import json
 import re
 import logging
+from collections import OrderedDict
+from pathlib import Path
+
+from config import ALLOWED_LOCATIONS, EXPERIENCE_BLOCKLIST, EXPERIENCE_ALLOWLIST, VERDICT_CACHE_SIZE
 
 log = logging.getLogger("Eligibility")
 
@@ -77,7 +85,6 @@ RE_HARD_REJECT = re.compile(r"""
   | no\s+students?\b
   | not\s+(open\s+to\s+)?freshers?
   | experienced\s+(professional|candidate|engineer|developer)
-  | (\b0\s*[-–]\s*2\s*years?\b(?!.*intern))         # 0-2 years unless intern
   | no\s+internship                                   # "no internship" negation
   | not\s+(a\s+)?internship                          # "not an internship"
   | this\s+is\s+not\s+(a\s+)?intern                # explicit negation
@@ -117,7 +124,6 @@ RE_LOC_BLOCKED = re.compile(r"""
   | visa\s+sponsorship | work\s+authoriz
   | authorized\s+to\s+work\s+in\s+the\s+us
   | must\s+be\s+(based|located|residing)\s+in\s+(?!india)
-  | onsite\s+(required|only|mandatory)(?!.*india)
 """, re.VERBOSE | re.IGNORECASE)
 
 # ── 7. Degree requirement blockers ─────────────────────────────────────
@@ -140,10 +146,8 @@ RE_NON_TECH = re.compile(r"""
   | \bgrowth\s*(intern|hacker|marketing)\b
   | \bseo\s*(intern|specialist)?\b
   | \bsocial\s+media\b
-  | \bui[\s/]ux\b(?!.*engineer)                     # UI/UX but NOT UI/UX engineer
   | \bux\s+(design(er)?|research(er)?)\b
   | \bgraphic\s+design(er)?\b
-  | \bproduct\s+design(er)?\b(?!.*engineer)         # Product design NOT product engineer
   | \bcopywriter\b | \bcopywrit(er|ing)\b
   | \bbusiness\s+development\b
   | \bfinance\s+intern\b | \baccounting\s+intern\b
@@ -170,6 +174,31 @@ RE_TECH_ROLE = re.compile(r"""
 """, re.VERBOSE | re.IGNORECASE)
 
 
+# ── 10. Guarded signals ────────────────────────────────────────────────
+# Signals that only count when a cancelling word does NOT appear later on
+# the same line. This used to be a (?!.*word) lookahead, which rescans to
+# the end of the line for every candidate and goes quadratic on long
+# descriptions; _NotFollowedBy answers the same question in linear time.
+# Each pattern must have at most one match per start position.
+#   (pattern, cancelling word)
+GUARDED_HARD_REJECT = [
+    (re.compile(r"\b0\s*[-–]\s*2\s*years?\b", re.IGNORECASE),       # 0-2 years unless intern
+     re.compile(r"intern", re.IGNORECASE)),
+]
+
+GUARDED_NON_TECH = [
+    (re.compile(r"\bui[\s/]ux\b", re.IGNORECASE),                   # UI/UX but NOT UI/UX engineer
+     re.compile(r"engineer", re.IGNORECASE)),
+    (re.compile(r"\bproduct\s+design(er)?\b", re.IGNORECASE),        # Product design NOT product engineer
+     re.compile(r"engineer", re.IGNORECASE)),
+]
+
+GUARDED_LOC_BLOCKED = [
+    (re.compile(r"onsite\s+(required|only|mandatory)", re.IGNORECASE),  # onsite unless in India
+     re.compile(r"india", re.IGNORECASE)),
+]
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════════════
@@ -192,10 +221,66 @@ def _get_location(job: dict) -> str:
     return job.get("location", "").lower().strip()
 
 
+# Location values that carry no information
+UNKNOWN_LOCATIONS = ("check listing", "not mentioned", "n/a")
+
+# Internship-only platforms — trusted even without an internship keyword
+INTERNSHIP_SOURCES = {"internshala", "unstop", "letsintern", "internshala.com"}
+
+
+class _NotFollowedBy:
+    """
+    Linear-time stand-in for a (?!.*word) tail on one text: is `word` absent
+    from the rest of the line after `pos`? The next word and newline positions
+    are remembered, so a run of increasing queries scans the text once.
+    """
+
+    def __init__(self, text: str, word: re.Pattern):
+        self.text = text
+        self.word = word
+        self.word_from = self.newline_from = None
+        self.next_word = self.next_newline = -1
+
+    def __call__(self, pos: int) -> bool:
+        # Re-search only when the cached hit lies behind `pos` (or was found
+        # from further ahead); otherwise it is still the next one.
+        if self.word_from is None or pos < self.word_from or -1 < self.next_word < pos:
+            m = self.word.search(self.text, pos)
+            self.word_from, self.next_word = pos, (m.start() if m else -1)
+        if self.newline_from is None or pos < self.newline_from or -1 < self.next_newline < pos:
+            self.newline_from, self.next_newline = pos, self.text.find("\n", pos)
+        if self.next_word == -1:
+            return True
+        # `.` stops at a newline, so a word on a later line doesn't count
+        return -1 < self.next_newline < self.next_word
+
+
+def _guarded_search(guarded: list, text: str) -> bool:
+    """True if any guarded pattern matches without its cancelling word after it."""
+    for pattern, word in guarded:
+        not_followed = _NotFollowedBy(text, word)
+        for m in pattern.finditer(text):
+            if not_followed(m.end()):
+                return True
+    return False
+
+
+def _is_non_tech(title: str) -> bool:
+    return bool(RE_NON_TECH.search(title)) or _guarded_search(GUARDED_NON_TECH, title)
+
+
+def _is_hard_reject(text: str) -> bool:
+    return bool(RE_HARD_REJECT.search(text)) or _guarded_search(GUARDED_HARD_REJECT, text)
+
+
+def _is_loc_blocked(text: str) -> bool:
+    return bool(RE_LOC_BLOCKED.search(text)) or _guarded_search(GUARDED_LOC_BLOCKED, text)
+
+
 # ── Individual checks (each returns bool + optional reason) ──────────
 
 def check_technical_role(title: str, combined: str) -> tuple[bool, str]:
-    if RE_NON_TECH.search(title):
+    if _is_non_tech(title):
         return False, "non-technical role in title"
     if not RE_TECH_ROLE.search(title) and not RE_TECH_ROLE.search(combined):
         return False, "no technical engineering signal found"
@@ -203,7 +288,7 @@ def check_technical_role(title: str, combined: str) -> tuple[bool, str]:
 
 
 def check_internship(title: str, combined: str, source: str = "") -> tuple[bool, str]:
-    if RE_HARD_REJECT.search(combined):
+    if _is_hard_reject(combined):
         return False, "hard reject signal (new grad / graduate program / no freshers)"
     if RE_INTERN_NEGATION.search(combined):
         return False, "internship negated in description"
@@ -214,7 +299,6 @@ def check_internship(title: str, combined: str, source: str = "") -> tuple[bool,
     if RE_INTERNSHIP.search(combined):
         return True, ""
     # Sources that are internship-only platforms — trust them
-    INTERNSHIP_SOURCES = {"internshala", "unstop", "letsintern", "internshala.com"}
     if any(s in source.lower() for s in INTERNSHIP_SOURCES):
         return True, ""
     return False, "no internship signal in title or description"
@@ -222,14 +306,14 @@ def check_internship(title: str, combined: str, source: str = "") -> tuple[bool,
 
 def check_location(location: str, combined: str) -> tuple[bool, str]:
     # Unknown location → check only for blocked signals in description
-    if not location or location in ("check listing", "not mentioned", "n/a"):
-        if RE_LOC_BLOCKED.search(combined):
+    if not location or location in UNKNOWN_LOCATIONS:
+        if _is_loc_blocked(combined):
             return False, "blocked location found in description"
         return True, ""
 
-    if RE_LOC_BLOCKED.search(location):
+    if _is_loc_blocked(location):
         return False, f"blocked location field: {location}"
-    if RE_LOC_BLOCKED.search(combined):
+    if _is_loc_blocked(combined):
         return False, "blocked location found in description"
     if not RE_LOC_ALLOWED.search(location) and not RE_LOC_ALLOWED.search(combined):
         return False, f"no allowed location signal found: {location}"
@@ -255,23 +339,136 @@ def check_degree(combined: str) -> tuple[bool, str]:
 
 
 # ═══════════════════════════════════════════════════════════════════════
-# MASTER VALIDATION FUNCTION
+# FUSED ENGINE — one scan of `combined` instead of one search per check
 # ═══════════════════════════════════════════════════════════════════════
 
-def is_valid_internship(job: dict) -> bool:
+# Signals that fail a job wherever they appear in `combined`, in check order
+_REJECTS = {
+    "hard_reject": (RE_HARD_REJECT,     "hard reject signal (new grad / graduate program / no freshers)"),
+    "negation":    (RE_INTERN_NEGATION, "internship negated in description"),
+    "loc_blocked": (RE_LOC_BLOCKED,     "blocked location found in description"),
+    "experience":  (RE_EXPERIENCE,      "experience requirement found"),
+    "seniority":   (RE_SENIORITY,       "seniority level found (senior/staff/lead/SDE3+/L4+)"),
+    "degree":      (RE_DEGREE_BLOCKED,  "advanced degree required (Masters/PhD)"),
+}
+
+# Guarded rejects, as named alternatives: name → (reject they count as, pattern, cancelling word)
+_GUARDED = {
+    f"{reject}_g{i}": (reject, pattern, word)
+    for reject, guarded in (("hard_reject", GUARDED_HARD_REJECT), ("loc_blocked", GUARDED_LOC_BLOCKED))
+    for i, (pattern, word) in enumerate(guarded)
+}
+
+# Signals a job must show somewhere
+_POSITIVES = {
+    "tech":        RE_TECH_ROLE,
+    "internship":  RE_INTERNSHIP,
+    "loc_allowed": RE_LOC_ALLOWED,
+}
+
+
+def _named(name: str, pattern: re.Pattern) -> str:
+    """Wrap a compiled pattern as a named group, keeping its own VERBOSE flag."""
+    if pattern.flags & re.VERBOSE:
+        return f"(?P<{name}>(?x:{pattern.pattern}))"
+    return f"(?P<{name}>{pattern.pattern})"
+
+
+def _fused(positives: frozenset) -> re.Pattern:
+    # Rejects come first: where a reject and a positive start at the same
+    # position the reject wins, and a reject decides the verdict on its own.
+    # Guarded rejects go last: a match there means nothing else starts at
+    # that position, so if its guard cancels it the scan can step past it
+    parts = [_named(n, r) for n, (r, _) in _REJECTS.items()]
+    parts += [_named(n, _POSITIVES[n]) for n in _POSITIVES if n in positives]
+    parts += [_named(n, p) for n, (_, p, _) in _GUARDED.items()]
+    return re.compile("|".join(parts), re.IGNORECASE)
+
+
+# One union per set of still-missing positives (2³ = 8 patterns)
+_FUSED = {
+    frozenset(combo): _fused(frozenset(combo))
+    for k in range(len(_POSITIVES) + 1)
+    for combo in itertools.combinations(_POSITIVES, k)
+}
+
+
+def _scan(combined: str, wanted: set) -> tuple[str | None, set]:
     """
-    Returns True only if ALL conditions pass:
-      1. Technical engineering role
-      2. Clearly internship/trainee (not new-grad/full-time)
-      3. Location is India / Remote / WFH / Worldwide
-      4. No 2+ years experience requirement
-      5. No senior/staff/lead/SDE3+/L4+ seniority
-      6. No PhD/Masters degree requirement
+    Single left-to-right pass over `combined`.
+    Returns (first reject signal or None, positives seen).
+
+    Each positive hit is dropped from the union and the search resumes at
+    the same position, so a signal starting where another matched is still
+    found; the loop runs at most len(wanted) + 1 searches. It stops at the
+    first reject, since nothing after it can change the verdict. A guarded
+    match whose cancelling word follows it is skipped over.
+    """
+    guards = {}
+    found = set()
+    missing = frozenset(wanted)
+    pos = 0
+    while True:
+        m = _FUSED[missing].search(combined, pos)
+        if m is None:
+            return None, found
+        name = m.lastgroup
+        if name in _REJECTS:
+            return name, found
+        if name in _GUARDED:
+            reject, _, word = _GUARDED[name]
+            if name not in guards:
+                guards[name] = _NotFollowedBy(combined, word)
+            if guards[name](m.end()):
+                return reject, found
+            pos = m.start() + 1
+            continue
+        found.add(name)
+        missing = missing - {name}
+        pos = m.start()
+
+
+def evaluate(job: dict) -> tuple[bool, str]:
+    """
+    Fused eligibility check. Returns (passed, reason).
+    Same verdict as evaluate_sequential(); on rejection the reason names the
+    first reject signal in the text rather than the first failing check.
     """
     combined = _build_combined(job)
     title    = _get_title(job)
     location = _get_location(job)
 
+    # Title / location-field checks run on short strings — settle them first
+    if _is_non_tech(title):
+        return False, "non-technical role in title"
+    location_known = bool(location) and location not in UNKNOWN_LOCATIONS
+    if location_known and _is_loc_blocked(location):
+        return False, f"blocked location field: {location}"
+
+    wanted = {"tech", "internship"} | ({"loc_allowed"} if location_known else set())
+    reject, found = _scan(combined, wanted)
+    if reject:
+        return False, _REJECTS[reject][1]
+
+    # Title and location are inside `combined`, but a field's end can still
+    # satisfy \b or a lookahead that the joined text doesn't — check them too
+    if "tech" not in found and not RE_TECH_ROLE.search(title):
+        return False, "no technical engineering signal found"
+    if "internship" not in found and not RE_INTERNSHIP.search(title):
+        source = job.get("source", "").lower()
+        if not any(s in source for s in INTERNSHIP_SOURCES):
+            return False, "no internship signal in title or description"
+    if location_known and "loc_allowed" not in found and not RE_LOC_ALLOWED.search(location):
+        return False, f"no allowed location signal found: {location}"
+    return True, ""
+
+
+def evaluate_sequential(job: dict) -> tuple[bool, str]:
+    """Reference path: every check_* in order. evaluate() must agree with it."""
+    combined = _build_combined(job)
+    title    = _get_title(job)
+    location = _get_location(job)
+
     source = job.get("source", "")
     checks = [
         check_technical_role(title, combined),
@@ -281,17 +478,141 @@ def is_valid_internship(job: dict) -> bool:
         check_seniority(combined),
         check_degree(combined),
     ]
-
     for passed, reason in checks:
         if not passed:
-            log.debug(f"FILTERED [{job.get('company','?')}] {job.get('title','?')} — {reason}")
-            return False
+            return False, reason
+    return True, ""
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# VERDICT CACHE — most listings are unchanged between cycles
+# ═══════════════════════════════════════════════════════════════════════
 
-    return True
+VERDICT_CACHE_FILE = Path("verdict_cache.json")
+
+
+def _rules_version() -> str:
+    """
+    Hash of everything a verdict depends on besides the job: every compiled
+    pattern (source + flags), the lookup sets, the config lists and this
+    file's own source, so editing any rule discards cached verdicts.
+    """
+    patterns = sorted(
+        (name, value.pattern, value.flags)
+        for name, value in globals().items()
+        if isinstance(value, re.Pattern)
+    )
+    guarded = [
+        [(p.pattern, p.flags, w.pattern, w.flags) for p, w in group]
+        for group in (GUARDED_HARD_REJECT, GUARDED_NON_TECH, GUARDED_LOC_BLOCKED)
+    ]
+    rules = [
+        patterns, guarded, list(UNKNOWN_LOCATIONS), sorted(INTERNSHIP_SOURCES),
+        ALLOWED_LOCATIONS, EXPERIENCE_BLOCKLIST, EXPERIENCE_ALLOWLIST,
+        hashlib.md5(Path(__file__).read_bytes()).hexdigest(),
+    ]
+    return hashlib.md5(json.dumps(rules).encode()).hexdigest()
+
+
+RULES_VERSION = _rules_version()
+
+_verdicts: OrderedDict | None = None   # content key → [passed, reason], LRU order
+_verdicts_dirty = False
+_verdict_stats = {"hits": 0, "misses": 0}
+
+
+def _load_verdicts() -> OrderedDict:
+    global _verdicts
+    if _verdicts is None:
+        _verdicts = OrderedDict()
+        if VERDICT_CACHE_FILE.exists():
+            try:
+                with open(VERDICT_CACHE_FILE) as f:
+                    data = json.load(f)
+                if data.get("version") == RULES_VERSION:
+                    _verdicts.update((key, [passed, reason]) for key, passed, reason in data.get("verdicts", []))
+                else:
+                    log.info("♻️ Eligibility rules changed — verdict cache discarded")
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not read verdict cache: {e}")
+    return _verdicts
+
+
+def _content_key(job: dict) -> str:
+    """Hash of every field evaluate() reads."""
+    fields = [job.get(k, "") for k in ("title", "location", "description", "tags", "source")]
+    return hashlib.md5("\x1f".join(map(str, fields)).encode()).hexdigest()
+
+
+def cached_evaluate(job: dict) -> tuple[bool, str]:
+    """evaluate(), memoised by job content. LRU-bounded by VERDICT_CACHE_SIZE."""
+    global _verdicts_dirty
+    verdicts = _load_verdicts()
+    key = _content_key(job)
+    hit = verdicts.get(key)
+    _verdicts_dirty = True
+    if hit is not None:
+        _verdict_stats["hits"] += 1
+        verdicts.move_to_end(key)
+        return hit[0], hit[1]
+
+    _verdict_stats["misses"] += 1
+    passed, reason = evaluate(job)
+    verdicts[key] = [passed, reason]
+    while len(verdicts) > VERDICT_CACHE_SIZE:
+        verdicts.popitem(last=False)
+    return passed, reason
+
+
+def verdict_cache_stats() -> dict:
+    """Cumulative hits / misses / hit_rate since start-up."""
+    hits, misses = _verdict_stats["hits"], _verdict_stats["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+
+def save_verdict_cache():
+    """Write the cache to disk if it was used since the last save."""
+    global _verdicts_dirty
+    if not _verdicts_dirty or _verdicts is None:
+        return
+    tmp = VERDICT_CACHE_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({
+            "version":  RULES_VERSION,
+            "verdicts": [[key, passed, reason] for key, (passed, reason) in _verdicts.items()],
+        }, f)
+    tmp.replace(VERDICT_CACHE_FILE)
+    _verdicts_dirty = False
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# MASTER VALIDATION FUNCTION
+# ═══════════════════════════════════════════════════════════════════════
+
+def is_valid_internship(job: dict) -> bool:
+    """
+    Returns True only if ALL conditions pass:
+      1. Technical engineering role
+      2. Clearly internship/trainee (not new-grad/full-time)
+      3. Location is India / Remote / WFH / Worldwide
+      4. No 2+ years experience requirement
+      5. No senior/staff/lead/SDE3+/L4+ seniority
+      6. No PhD/Masters degree requirement
+    """
+    passed, reason = cached_evaluate(job)
+    if not passed:
+        log.debug(f"FILTERED [{job.get('company','?')}] {job.get('title','?')} — {reason}")
+    return passed
 
 
 def filter_eligible(jobs: list[dict]) -> list[dict]:
     """Filter jobs list using is_valid_internship(). Returns only eligible jobs."""
+    before = verdict_cache_stats()
     eligible = [job for job in jobs if is_valid_internship(job)]
-    log.info(f"Eligibility filter: {len(eligible)}/{len(jobs)} jobs passed")
-    return eligible
\ No newline at end of file
+    after = verdict_cache_stats()
+    hits = after["hits"] - before["hits"]
+    rate = hits / len(jobs) if jobs else 0.0
+    log.info(f"Eligibility filter: {len(eligible)}/{len(jobs)} jobs passed "
+             f"(verdict cache: {hits}/{len(jobs)} hits, {rate:.0%})")
+    return eligible
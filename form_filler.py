@@ -0,0 +1,176 @@
+"""
+📝 Form Filler
+Reads an application form in one browser round trip, decides locally
+which field gets which profile value, and fills them all in a second one.
+This replaces probing a locator per field with `await locator.count()`.
+
+discover() tags every fillable input/textarea/select with data-ff="<n>"
+and returns the form's fingerprint plus a descriptor per field:
+    {"index", "kind", "name", "id", "placeholder", "label", "required", "visible"}
+kind is the input type ("text", "email", "file", ...), or "textarea"/"select".
+The fingerprint hashes every field's kind, name, id and label, so two
+pages with the same fingerprint number the same fields the same way and a
+plan made for one fills the other.
+
+match() maps value keys (FIELD_RULES) to field indexes, and fill() sets
+the values and fires input/change events so React/Vue forms see them.
+File inputs cannot be set from page JS; callers attach those through
+field().
+"""
+
+import logging
+import re
+
+log = logging.getLogger("FormFiller")
+
+_DISCOVER_JS = """
+(known) => {
+    const SKIP = new Set(["hidden", "submit", "button", "reset", "image"]);
+    const text = el => (el ? el.innerText || el.textContent || "" : "").trim();
+    const fields = [];
+    for (const el of document.querySelectorAll("input, textarea, select")) {
+        const tag = el.tagName.toLowerCase();
+        const kind = tag === "input" ? (el.getAttribute("type") || "text").toLowerCase() : tag;
+        if (SKIP.has(kind) || el.disabled || el.readOnly) continue;
+        let label = el.labels && el.labels.length ? text(el.labels[0]) : text(el.closest("label"));
+        if (!label && el.getAttribute("aria-labelledby")) {
+            label = el.getAttribute("aria-labelledby").split(/\\s+/)
+                .map(id => text(document.getElementById(id))).join(" ");
+        }
+        el.setAttribute("data-ff", String(fields.length));
+        fields.push({
+            index: fields.length,
+            kind: kind,
+            name: el.getAttribute("name") || "",
+            id: el.id || "",
+            placeholder: el.getAttribute("placeholder") || "",
+            label: (label || el.getAttribute("aria-label") || "").slice(0, 200),
+            required: el.required,
+            visible: !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length),
+        });
+    }
+    // cyrb53 over the structure — a cheap, stable 64-bit-ish string hash
+    const sig = fields.map(f => [f.kind, f.name, f.id, f.label.toLowerCase()].join("\u0001")).join("\u0002");
+    let h1 = 0xdeadbeef, h2 = 0x41c6ce57;
+    for (let i = 0; i < sig.length; i++) {
+        const c = sig.charCodeAt(i);
+        h1 = Math.imul(h1 ^ c, 2654435761);
+        h2 = Math.imul(h2 ^ c, 1597334677);
+    }
+    h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+    h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    const fingerprint = (h2 >>> 0).toString(16).padStart(8, "0") + (h1 >>> 0).toString(16).padStart(8, "0");
+    // A known layout needs no descriptors: the caller already has its plan
+    return { fingerprint: fingerprint, fields: known.includes(fingerprint) ? null : fields };
+}
+"""
+
+_FILL_JS = """
+(entries) => {
+    const missed = [];
+    for (const [key, index, value] of entries) {
+        const el = document.querySelector(`[data-ff="${index}"]`);
+        if (!el) { missed.push(key); continue; }
+        let v = value;
+        if (el.tagName === "SELECT") {
+            const want = String(value).trim().toLowerCase();
+            const opt = [...el.options].find(o =>
+                o.value.toLowerCase() === want || o.text.trim().toLowerCase() === want);
+            if (!opt) { missed.push(key); continue; }
+            v = opt.value;
+        }
+        // The prototype setter, so frameworks that wrap .value still see the change
+        const proto = Object.getPrototypeOf(el);
+        const setter = Object.getOwnPropertyDescriptor(proto, "value").set;
+        el.focus();
+        setter.call(el, v);
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        el.blur();
+    }
+    return missed;
+}
+"""
+
+_TEXT = {"text", "search", "url", ""}
+
+# (value key, field kinds it may go in, pattern over name/id/placeholder/label).
+# Order matters: each field takes the first key that claims it, so specific
+# keys come before the ones that would also match ("first name" before "name").
+FIELD_RULES = [
+    ("resume",       {"file"},                    r"resume|\bcv\b|curriculum"),
+    ("email",        {"email"} | _TEXT,           r"e-?mail"),
+    ("phone",        {"tel", "number"} | _TEXT,   r"phone|mobile|contact.?(no|number)|whatsapp"),
+    ("first_name",   _TEXT,                       r"first.?name|\bfname\b|given.?name|forename"),
+    ("last_name",    _TEXT,                       r"last.?name|\blname\b|surname|family.?name"),
+    ("full_name",    _TEXT,                       r"^(your |full |candidate |applicant )?name\W*$|full.?name"),
+    ("linkedin",     _TEXT,                       r"linked.?in"),
+    ("github",       _TEXT,                       r"github"),
+    ("website",      _TEXT,                       r"website|portfolio|personal.?(site|url)|blog"),
+    ("cover_letter", {"textarea"},                r"cover|why|motivation|additional|comments|message|about you"),
+    ("availability", {"select", "date"} | _TEXT,  r"availab|notice.?period|start.?date|join"),
+]
+_RULES = [(key, kinds, re.compile(pattern, re.I)) for key, kinds, pattern in FIELD_RULES]
+
+# A field of this type is the key's field, whatever it is called
+_BY_KIND = {"email": "email", "tel": "phone"}
+
+# Keys that fall back to the first free field of a kind when nothing is named for them
+_FALLBACK_KIND = {"resume": "file", "cover_letter": "textarea"}
+
+
+async def discover(page, known=()) -> tuple[str, list[dict] | None]:
+    """
+    (fingerprint, field descriptors) of the page's form in one round trip.
+    Descriptors are None when the fingerprint is one of `known`.
+    """
+    result = await page.evaluate(_DISCOVER_JS, list(known))
+    return result["fingerprint"], result["fields"]
+
+
+def _names_it(field: dict, pattern: re.Pattern) -> bool:
+    return any(pattern.search(field[attr]) for attr in ("name", "id", "placeholder", "label"))
+
+
+def match(fields: list[dict], keys) -> dict[str, int]:
+    """Which field each of `keys` goes in, as {key: field index}; unmatched keys are left out."""
+    wanted = set(keys)
+    taken: set[int] = set()
+    plan: dict[str, int] = {}
+    # Visible fields first; file inputs are usually hidden behind a styled button
+    ordered = sorted(fields, key=lambda f: not f["visible"] and f["kind"] != "file")
+
+    for key, kinds, pattern in _RULES:
+        if key not in wanted:
+            continue
+        for field in ordered:
+            if field["index"] in taken or field["kind"] not in kinds:
+                continue
+            if _BY_KIND.get(field["kind"]) == key or _names_it(field, pattern):
+                plan[key] = field["index"]
+                taken.add(field["index"])
+                break
+
+    for key, kind in _FALLBACK_KIND.items():
+        if key in wanted and key not in plan:
+            field = next((f for f in ordered if f["kind"] == kind and f["index"] not in taken), None)
+            if field:
+                plan[key] = field["index"]
+                taken.add(field["index"])
+    return plan
+
+
+async def fill(page, plan: dict[str, int], values: dict) -> list[str]:
+    """Fill every planned non-file field in one round trip; returns keys that could not be filled."""
+    entries = [[key, index, values[key]] for key, index in plan.items() if key in values]
+    if not entries:
+        return []
+    missed = await page.evaluate(_FILL_JS, entries)
+    if missed:
+        log.debug(f"Could not fill: {', '.join(missed)}")
+    return missed
+
+
+def field(page, index: int):
+    """Locator for one discovered field, e.g. to attach a file."""
+    return page.locator(f'[data-ff="{index}"]')
@@ -0,0 +1,283 @@
+"""
+🧩 HTML Parsing
+lxml-backed BeautifulSoup trees, restricted to each source's card containers
+(SoupStrainer), with every CSS selector compiled once instead of per card.
+
+parse_* functions are pure (raw bytes in, plain dicts out) so they can run in
+a worker process; scrapers dispatch them with run_parser().
+"""
+
+import asyncio
+import functools
+import logging
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlparse
+
+import soupsieve as sv
+from bs4 import BeautifulSoup, SoupStrainer
+from config import PARSE_WORKERS, PARSE_IN_PROCESSES
+
+log = logging.getLogger("Parsing")
+
+# lxml is in requirements.txt; html.parser keeps things working without it
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+@functools.lru_cache(maxsize=None)
+def css(selector: str) -> sv.SoupSieve:
+    """Compile a CSS selector once; later calls return the same compiled pattern."""
+    return sv.compile(selector)
+
+
+def make_soup(markup: str | bytes, strainer: SoupStrainer | None = None) -> BeautifulSoup:
+    """Parse markup with lxml, building only the subtrees the strainer matches."""
+    return BeautifulSoup(markup, PARSER, parse_only=strainer)
+
+
+def _class_contains(*fragments: str):
+    """Strainer test for [class*='...'] — any fragment inside the class attribute."""
+    def test(value) -> bool:
+        return bool(value) and any(f in value for f in fragments)
+    return test
+
+
+# ─────────────────────────────────────────────
+# PER-SOURCE LAYOUTS
+# strainer → subtrees worth building; card → one listing; the rest → fields
+# ─────────────────────────────────────────────
+
+INTERNSHALA = {
+    "strainer": SoupStrainer(class_="internship_meta"),
+    "card":     css(".internship_meta"),
+    "title":    css(".job-internship-name"),
+    "company":  css(".company-name"),
+    "link":     css("a.view_detail_button"),
+    "stipend":  css(".stipend"),
+    "location": css(".locations"),
+}
+
+LINKEDIN = {
+    "strainer": SoupStrainer("li"),
+    "card":     css("li.result-card, li[class*='job']"),
+    "title":    css("h3"),
+    "company":  css("h4"),
+    "link":     css("a"),
+    "location": css("[class*='location']"),
+}
+
+NAUKRI = {
+    "strainer": SoupStrainer(class_=["jobTuple", "cust-job-tuple"]),
+    "card":     css("article.jobTuple, .cust-job-tuple"),
+    "title":    css("a.title, .title"),
+    "company":  css(".companyInfo a, .company-name"),
+    "stipend":  css(".salary, [class*='salary']"),
+    "location": css(".location, [class*='location']"),
+}
+
+UNSTOP = {
+    "strainer": SoupStrainer(class_=_class_contains("opp-card", "single_profile")),
+    "card":     css(".opp-card, [class*='single_profile']"),
+    "title":    css("h2, .name"),
+    "company":  css(".org_name, h3"),
+    "link":     css("a"),
+    "stipend":  css("[class*='stipend'], [class*='salary']"),
+}
+
+WELLFOUND = {
+    "strainer": SoupStrainer(attrs={"data-test": "StartupResult"}),
+    "card":     css("[data-test='StartupResult']"),
+    "title":    css("a[data-test='job-title'], h2"),
+    "company":  css("a[data-test='startup-link'], h3"),
+}
+
+# A bare compound selector on <a>: a, a.job-link, a[href*='job'] — no combinators
+_ANCHOR_ONLY = re.compile(r"^\s*a(?:[.#\[:][^\s>+~]*)*\s*$")
+
+
+@functools.lru_cache(maxsize=None)
+def career_page_strainer(selector: str) -> SoupStrainer | None:
+    """Keep only <a> subtrees when every part of the selector targets anchors."""
+    if all(_ANCHOR_ONLY.match(part) for part in selector.split(",")):
+        return SoupStrainer("a")
+    return None
+
+
+def _text(el, default: str = "") -> str:
+    return el.get_text(strip=True) if el else default
+
+
+def _absolute(href: str, origin: str) -> str:
+    return f"{origin}{href}" if href.startswith("/") else href
+
+
+# ─────────────────────────────────────────────
+# PARSERS — markup in, job records out
+# ─────────────────────────────────────────────
+
+def parse_internshala(markup: bytes) -> list[dict]:
+    records = []
+    for card in INTERNSHALA["card"].select(make_soup(markup, INTERNSHALA["strainer"])):
+        try:
+            title_el   = INTERNSHALA["title"].select_one(card)
+            company_el = INTERNSHALA["company"].select_one(card)
+            link_el    = INTERNSHALA["link"].select_one(card)
+            if not (title_el and company_el):
+                continue
+            records.append({
+                "title":    _text(title_el),
+                "company":  _text(company_el),
+                "link":     _absolute(link_el["href"] if link_el else "", "https://internshala.com"),
+                "stipend":  _text(INTERNSHALA["stipend"].select_one(card), "Not mentioned"),
+                "location": _text(INTERNSHALA["location"].select_one(card), "Remote/WFH"),
+            })
+        except Exception:
+            continue
+    return records
+
+
+def parse_linkedin(markup: bytes) -> list[dict]:
+    records = []
+    for card in LINKEDIN["card"].select(make_soup(markup, LINKEDIN["strainer"])):
+        try:
+            title_el = LINKEDIN["title"].select_one(card)
+            link_el  = LINKEDIN["link"].select_one(card)
+            if not title_el:
+                continue
+            records.append({
+                "title":    _text(title_el),
+                "company":  _text(LINKEDIN["company"].select_one(card), "Company"),
+                "link":     link_el["href"].split("?")[0] if link_el else "",
+                "location": _text(LINKEDIN["location"].select_one(card), "India"),
+            })
+        except Exception:
+            continue
+    return records
+
+
+def parse_naukri(markup: bytes) -> list[dict]:
+    records = []
+    for card in NAUKRI["card"].select(make_soup(markup, NAUKRI["strainer"])):
+        try:
+            title_el = NAUKRI["title"].select_one(card)
+            if not title_el:
+                continue
+            records.append({
+                "title":    _text(title_el),
+                "company":  _text(NAUKRI["company"].select_one(card), "Company"),
+                "link":     title_el.get("href", "https://naukri.com"),
+                "stipend":  _text(NAUKRI["stipend"].select_one(card), "Not mentioned"),
+                "location": _text(NAUKRI["location"].select_one(card), "India"),
+            })
+        except Exception:
+            continue
+    return records
+
+
+def parse_unstop(markup: bytes) -> list[dict]:
+    records = []
+    for card in UNSTOP["card"].select(make_soup(markup, UNSTOP["strainer"])):
+        try:
+            title_el = UNSTOP["title"].select_one(card)
+            link_el  = UNSTOP["link"].select_one(card)
+            if not title_el:
+                continue
+            records.append({
+                "title":    _text(title_el),
+                "company":  _text(UNSTOP["company"].select_one(card), "Company"),
+                "link":     _absolute(link_el["href"] if link_el else "", "https://unstop.com"),
+                "stipend":  _text(UNSTOP["stipend"].select_one(card), "Not mentioned"),
+            })
+        except Exception:
+            continue
+    return records
+
+
+def parse_wellfound(markup: bytes) -> list[dict]:
+    records = []
+    for card in WELLFOUND["card"].select(make_soup(markup, WELLFOUND["strainer"])):
+        try:
+            title_el   = WELLFOUND["title"].select_one(card)
+            company_el = WELLFOUND["company"].select_one(card)
+            if not (title_el and company_el):
+                continue
+            records.append({
+                "title":   _text(title_el),
+                "company": _text(company_el),
+                "link":    _absolute(title_el.get("href", ""), "https://wellfound.com"),
+            })
+        except Exception:
+            continue
+    return records
+
+
+def parse_career_page(markup: bytes, selector: str, page_url: str) -> list[dict]:
+    """Anchor text + absolute href for every link the page's selector matches."""
+    base = urlparse(page_url)
+    records = []
+    for link_el in css(selector).select(make_soup(markup, career_page_strainer(selector))):
+        try:
+            title = link_el.get_text(strip=True)
+            href  = link_el.get("href", "")
+            if not title or len(title) < 5:
+                continue
+            # Make absolute URL
+            if href.startswith("/"):
+                href = f"{base.scheme}://{base.netloc}{href}"
+            elif not href.startswith("http"):
+                continue
+            records.append({"title": title, "link": href})
+        except Exception:
+            continue
+    return records
+
+
+# ─────────────────────────────────────────────
+# WORKER POOL
+# ─────────────────────────────────────────────
+
+_executor: Executor | None = None
+
+
+def _thread_pool() -> Executor:
+    return ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if PARSE_IN_PROCESSES:
+            try:
+                _executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+            except (OSError, NotImplementedError) as e:
+                log.warning(f"Process pool unavailable, parsing in threads: {e}")
+                _executor = _thread_pool()
+        else:
+            _executor = _thread_pool()
+    return _executor
+
+
+async def run_parser(parser, *args) -> list[dict]:
+    """Run a parse_* function in the worker pool, keeping the event loop free."""
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_get_executor(), parser, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM, killed); fall back to threads for the rest of the run
+        log.warning("Parse process pool broke, switching to threads")
+        _executor = _thread_pool()
+        return await loop.run_in_executor(_executor, parser, *args)
+
+
+def shutdown_parse_pool():
+    """Stop the worker pool on shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,115 @@
+"""
+🌐 Shared HTTP Client
+One pooled httpx.AsyncClient that lives as long as the process.
+Scrapers, the cover letter generator and any future fetchers take it
+from get_client() instead of opening their own.
+
+Scrapers handle their own errors, so a broken pool would never surface
+as an exception. Instead the client counts requests that fail below HTTP
+(connect, read, timeout), and reset_if_failing() rebuilds it after a
+cycle in which most requests did. A reset client is retired rather than
+closed: background tasks (cover letters for the apply queue) may still be
+using it, so it is closed at the next reset or at shutdown.
+"""
+
+import logging
+from urllib.parse import urlparse
+
+import httpx
+from config import (
+    CAREER_PAGES, MAX_CONCURRENT_REQUESTS,
+    HTTP2_ENABLED, HTTP_KEEPALIVE_EXPIRY, HTTP_POOL_HEADROOM,
+    HTTP_RESET_MIN_FAILURES, HTTP_RESET_FAILURE_RATIO,
+)
+
+log = logging.getLogger("HTTP")
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2 = HTTP2_ENABLED
+except ImportError:
+    _HTTP2 = False
+
+# Job boards + Anthropic API, on top of the career page hosts
+_EXTRA_HOSTS = 6
+
+_client: httpx.AsyncClient | None = None
+# The client replaced by the last reset, left open for requests still using it
+_retired: httpx.AsyncClient | None = None
+
+# Requests since the last reset_if_failing()
+_outcomes = {"ok": 0, "failed": 0}
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TransportError:
+            _outcomes["failed"] += 1
+            raise
+        _outcomes["ok"] += 1
+        return response
+
+
+def _pool_limits() -> httpx.Limits:
+    """Size the pool so every source host can keep one idle connection around."""
+    hosts = {urlparse(cfg["url"]).netloc for cfg in CAREER_PAGES}
+    return httpx.Limits(
+        max_connections=MAX_CONCURRENT_REQUESTS + HTTP_POOL_HEADROOM,
+        max_keepalive_connections=len(hosts) + _EXTRA_HOSTS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, building it on first use or after a reset."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            transport=_CountingTransport(http2=_HTTP2, limits=_pool_limits()),
+            timeout=httpx.Timeout(20, connect=10),
+            follow_redirects=True,
+        )
+        log.info(f"HTTP client ready (http2={_HTTP2})")
+    return _client
+
+
+async def _close(client: httpx.AsyncClient | None):
+    if client is not None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            log.debug(f"Error closing HTTP client: {e}")
+
+
+async def reset_client():
+    """
+    Swap out the shared client after a fatal error; the next get_client()
+    builds a new one. The old one is retired, not closed, so requests still
+    in flight on it finish. The client retired by the previous reset is
+    closed now: resets are at least POLL_TICK apart, longer than any
+    request's timeout, so nothing is still waiting on it.
+    """
+    global _client, _retired
+    await _close(_retired)
+    _retired, _client = _client, None
+    log.warning("♻️ HTTP client reset")
+
+
+async def reset_if_failing():
+    """Reset the client if most requests since the last call failed at the transport level."""
+    ok, failed = _outcomes["ok"], _outcomes["failed"]
+    _outcomes.update(ok=0, failed=0)
+    if failed >= HTTP_RESET_MIN_FAILURES and failed >= HTTP_RESET_FAILURE_RATIO * (ok + failed):
+        log.warning(f"{failed}/{ok + failed} requests failed to connect or read")
+        await reset_client()
+
+
+async def close_client():
+    """Close the shared client, and any retired one, on shutdown."""
+    global _client, _retired
+    await _close(_retired)
+    await _close(_client)
+    _client = _retired = None
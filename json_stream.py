@@ -0,0 +1,89 @@
+"""
+🧵 Streaming JSON
+Yields the elements of a JSON array one at a time as text chunks arrive,
+so a board payload never has to be held or decoded as a whole.
+Handles a top-level array ([...]) or an array under a key ({"jobs": [...]}).
+"""
+
+import json
+import re
+from typing import AsyncIterator, Iterable
+
+_decoder = json.JSONDecoder()
+_WS = " \t\r\n"
+
+
+async def iter_json_array(chunks: AsyncIterator[str], key: str | None = None,
+                          fields: Iterable[str] | None = None) -> AsyncIterator[dict]:
+    """
+    Yield each element of the array in a streamed JSON document.
+
+    key     — if the document is an object, the array is taken from the first
+              occurrence of "key": [ ... ]
+    fields  — if given, each element is reduced to these keys as soon as it
+              is decoded, so large fields we never read are dropped early
+    """
+    fields = tuple(fields) if fields else None
+    key_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key)) if key else None
+    buf, pos = "", 0
+    in_array = False
+    eof = False
+    need = 0     # unread chars required before a partial element is re-decoded
+
+    async def more() -> bool:
+        nonlocal buf, pos, eof
+        if not eof:
+            async for chunk in chunks:
+                # Drop everything already consumed before growing the buffer
+                buf, pos = buf[pos:] + chunk, 0
+                return True
+            eof = True
+        return False
+
+    while True:
+        # Skip whitespace, and commas between elements
+        while pos < len(buf) and (buf[pos] in _WS or (in_array and buf[pos] == ",")):
+            pos += 1
+        if pos >= len(buf):
+            if not await more():
+                if in_array:
+                    raise ValueError("JSON array not terminated")
+                return
+            continue
+
+        if not in_array:
+            if buf[pos] == "[":
+                in_array, pos = True, pos + 1
+                continue
+            if key_re is None:
+                raise ValueError(f"Expected a JSON array, got {buf[pos]!r}")
+            m = key_re.search(buf, pos)
+            if m:
+                in_array, pos = True, m.end()
+                continue
+            # Only keep a tail long enough to hold a key split across chunks
+            pos = max(pos, len(buf) - len(key) - 16)
+            if not await more():
+                return
+            continue
+
+        if buf[pos] == "]":
+            return
+
+        if len(buf) - pos >= need or eof:
+            try:
+                item, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # Wait until the element has at least doubled before retrying,
+                # so one large element costs linear rather than quadratic time
+                need = 2 * (len(buf) - pos)
+            else:
+                pos, need = end, 0
+                if fields is not None and isinstance(item, dict):
+                    item = {k: item[k] for k in fields if k in item}
+                yield item
+                continue
+
+        await more()
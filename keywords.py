@@ -0,0 +1,67 @@
+"""
+🔤 Keyword Matcher
+is_internship() scans with a keyword list compiled once into a trie-shaped
+regex: one pass over the text instead of one `in` per word, and no
+title + text concatenation. matches_keywords() stays a plain `in` loop —
+on short titles with config's lists the compiled version measured no
+faster (see bench_keywords.py).
+"""
+
+import re
+
+import config
+
+INTERNSHIP_WORDS = ["intern", "internship", "trainee", "apprentice"]
+
+
+def trie_pattern(words) -> str:
+    """
+    Regex matching any of the words as a substring, shaped like their trie.
+    A word that is a prefix of another ends the branch — for "is any keyword
+    present?" the shorter one already decides it.
+    """
+    root: dict = {}
+    for word in words:
+        node = root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        if "" in node:
+            return ""
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items())]
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(root)
+
+
+class KeywordMatcher:
+    """Any-of-these-substrings test over a fixed keyword set, compiled once."""
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self._re = re.compile(trie_pattern(self.words)) if self.words else None
+
+    def search(self, text: str) -> bool:
+        return self._re is not None and self._re.search(text) is not None
+
+
+_internship = KeywordMatcher(INTERNSHIP_WORDS)
+
+
+def matches_keywords(title: str) -> bool:
+    title_lower = title.lower()
+    for ex in config.EXCLUDE_KEYWORDS:
+        if ex in title_lower:
+            return False
+    for kw in config.KEYWORDS:
+        if kw in title_lower:
+            return True
+    return False
+
+
+def is_internship(title: str, text: str = "") -> bool:
+    # None of the words contain a space, so title and text can be scanned
+    # separately instead of building title + " " + text
+    return _internship.search(title.lower()) or (bool(text) and _internship.search(text.lower()))
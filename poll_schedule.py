@@ -0,0 +1,120 @@
+"""
+⏲️ Adaptive Poll Schedule
+Learns how fast each source posts new jobs and polls it accordingly: hot
+boards every few minutes, boards that haven't changed in months a few
+times a day. The schedule persists across restarts.
+
+Per source we keep an EWMA of new postings per hour (from the board
+snapshot diff) and poll often enough to expect about POLL_TARGET_NEW new
+postings per visit, clamped to
+[POLL_MIN_INTERVAL, POLL_MAX_INTERVAL]. If the resulting polls/hour across
+all sources exceed POLL_BUDGET_PER_HOUR, every interval is stretched by
+the same factor.
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+
+from config import (
+    CHECK_INTERVAL, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL,
+    POLL_TARGET_NEW, POLL_EWMA_ALPHA, POLL_BUDGET_PER_HOUR,
+)
+
+log = logging.getLogger("PollSchedule")
+
+POLL_SCHEDULE_FILE = Path("poll_schedule.json")
+
+# source id → {"rate": new postings/hour, "last_poll": epoch,
+#              "last_ok": epoch of the last poll that updated the rate}
+_sources: dict | None = None
+_dirty = False
+
+
+def _load() -> dict:
+    global _sources
+    if _sources is None:
+        _sources = {}
+        if POLL_SCHEDULE_FILE.exists():
+            try:
+                with open(POLL_SCHEDULE_FILE) as f:
+                    _sources = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not read poll schedule: {e}")
+    return _sources
+
+
+def _own_interval(state: dict | None) -> float:
+    """Interval from this source's rate alone, before the budget is applied."""
+    if state is None or state.get("rate") is None:
+        return CHECK_INTERVAL                      # nothing learned yet
+    rate = state["rate"]
+    if rate <= 0:
+        return POLL_MAX_INTERVAL
+    interval = POLL_TARGET_NEW / rate * 3600
+    return min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+
+
+def intervals(names: list[str]) -> dict[str, float]:
+    """Poll interval per source, stretched to fit POLL_BUDGET_PER_HOUR."""
+    sources = _load()
+    own = {name: _own_interval(sources.get(name)) for name in names}
+    polls_per_hour = sum(3600 / i for i in own.values())
+    stretch = max(1.0, polls_per_hour / POLL_BUDGET_PER_HOUR)
+    return {name: min(POLL_MAX_INTERVAL, i * stretch) for name, i in own.items()}
+
+
+def due_sources(names: list[str], now: float | None = None) -> list[str]:
+    """Sources whose interval has elapsed since their last poll."""
+    now = now or time.time()
+    sources = _load()
+    return [
+        name for name, interval in intervals(names).items()
+        if now - sources.get(name, {}).get("last_poll", 0) >= interval
+    ]
+
+
+def seconds_until_next(names: list[str], now: float | None = None) -> float:
+    """How long until the next source falls due (0 if one already is)."""
+    now = now or time.time()
+    sources = _load()
+    waits = [
+        sources.get(name, {}).get("last_poll", 0) + interval - now
+        for name, interval in intervals(names).items()
+    ]
+    return max(0.0, min(waits, default=CHECK_INTERVAL))
+
+
+def record_poll(source_id: str, added: int | None, now: float | None = None):
+    """
+    Update a source's rate from one poll: `added` postings that were not in
+    its previous snapshot (0 for a successful fetch of an empty board).
+    None means the poll taught us nothing — the fetch failed or there was
+    no snapshot to compare with — so only the poll time moves.
+    """
+    global _dirty
+    now = now or time.time()
+    state = _load().setdefault(source_id, {"rate": None, "last_poll": 0})
+    if added is not None:
+        # `added` counts since the last snapshot, i.e. the last successful poll
+        if state.get("last_ok"):
+            hours = max((now - state["last_ok"]) / 3600, 1 / 60)
+            observed = added / hours
+            state["rate"] = (observed if state["rate"] is None else
+                             POLL_EWMA_ALPHA * observed + (1 - POLL_EWMA_ALPHA) * state["rate"])
+        state["last_ok"] = now
+    state["last_poll"] = now
+    _dirty = True
+
+
+def save_schedule():
+    """Write the schedule to disk if anything changed."""
+    global _dirty
+    if not _dirty or _sources is None:
+        return
+    tmp = POLL_SCHEDULE_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(_sources, f)
+    tmp.replace(POLL_SCHEDULE_FILE)
+    _dirty = False
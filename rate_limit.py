@@ -0,0 +1,40 @@
+"""
+🪣 Rate Limiting
+A token bucket shared by everything that paces outbound calls: Telegram
+delivery and the cover letter API. Kept apart from either so importing
+one never drags in the other's dependencies.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity`; acquire() waits for one."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Hand out nothing for `seconds`, then start again from an empty bucket."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
@@ -2,14 +2,36 @@
 🔍 Scrapers v2
 Sources: Internshala, LinkedIn, Naukri, Unstop, Wellfound,
          Greenhouse API, Lever API, Direct Career Pages
+
+Every scraper returns the source's matching jobs, [] if it lists none,
+or None if it could not be fetched (network error or an error status),
+so callers never mistake an outage for an empty board.
 """
 
+import asyncio
+import contextlib
+import contextvars
+import functools
 import logging
 import re
+from urllib.parse import urlparse, urlsplit, urlunsplit, parse_qsl, urlencode
+
 import httpx
-from bs4 import BeautifulSoup
-from config import KEYWORDS, EXCLUDE_KEYWORDS, CAREER_PAGES
+from config import (
+    CAREER_PAGES,
+    MAX_CONCURRENT_REQUESTS, DEFAULT_HOST_CONCURRENCY, HOST_CONCURRENCY,
+    SOURCE_TIMEOUTS, SOURCE_PRIORITY,
+    GREENHOUSE_TWO_PHASE, GREENHOUSE_DETAIL_CONCURRENCY,
+)
 from eligibility import is_valid_internship, filter_eligible
+from keywords import matches_keywords, is_internship
+from html_parsing import (
+    run_parser, parse_internshala, parse_linkedin, parse_naukri,
+    parse_unstop, parse_wellfound, parse_career_page,
+)
+from json_stream import iter_json_array
+from board_cache import conditional_headers, cached_jobs, remember, save_board_cache
+from dedup import canonical_url
 
 log = logging.getLogger("Scrapers")
 
@@ -23,62 +45,30 @@ HEADERS = {
 }
 
 
-def matches_keywords(title: str) -> bool:
-    title_lower = title.lower()
-    for ex in EXCLUDE_KEYWORDS:
-        if ex in title_lower:
-            return False
-    for kw in KEYWORDS:
-        if kw in title_lower:
-            return True
-    return False
-
-
-def is_internship(title: str, text: str = "") -> bool:
-    combined = (title + " " + text).lower()
-    return any(w in combined for w in ["intern", "internship", "trainee", "apprentice"])
-
-
 # ─────────────────────────────────────────────
 # JOB BOARD SCRAPERS
 # ─────────────────────────────────────────────
 
-async def scrape_internshala(client: httpx.AsyncClient) -> list[dict]:
-    jobs = []
+async def scrape_internshala(client: httpx.AsyncClient) -> list[dict] | None:
+    jobs, failed = [], 0
     categories = ["software-development", "web-development", "computer-science"]
     for cat in categories:
         try:
             url = f"https://internshala.com/internships/{cat}-internship/"
             r = await client.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(r.text, "html.parser")
-            for card in soup.select(".internship_meta"):
-                try:
-                    title_el   = card.select_one(".job-internship-name")
-                    company_el = card.select_one(".company-name")
-                    link_el    = card.select_one("a.view_detail_button")
-                    stipend_el = card.select_one(".stipend")
-                    location_el= card.select_one(".locations")
-                    if not (title_el and company_el):
-                        continue
-                    title   = title_el.get_text(strip=True)
-                    company = company_el.get_text(strip=True)
-                    href    = link_el["href"] if link_el else ""
-                    link    = f"https://internshala.com{href}" if href.startswith("/") else href
-                    stipend = stipend_el.get_text(strip=True) if stipend_el else "Not mentioned"
-                    location= location_el.get_text(strip=True) if location_el else "Remote/WFH"
-                    if matches_keywords(title):
-                        jobs.append({"title": title, "company": company, "link": link,
-                                     "apply_url": link, "stipend": stipend, "location": location,
-                                     "source": "Internshala", "description": "internship"})
-                except Exception:
-                    continue
+            r.raise_for_status()
+            for rec in await run_parser(parse_internshala, r.content):
+                if matches_keywords(rec["title"]):
+                    jobs.append({**rec, "apply_url": rec["link"], "posting_id": canonical_url(rec["link"]),
+                                 "source": "Internshala", "description": "internship"})
         except Exception as e:
+            failed += 1
             log.warning(f"Internshala error [{cat}]: {e}")
-    return jobs
+    return None if failed == len(categories) else jobs
 
 
-async def scrape_linkedin(client: httpx.AsyncClient) -> list[dict]:
-    jobs = []
+async def scrape_linkedin(client: httpx.AsyncClient) -> list[dict] | None:
+    jobs, failed = [], 0
     searches = [
         "backend developer intern",
         "software engineer intern",
@@ -93,118 +83,64 @@ async def scrape_linkedin(client: httpx.AsyncClient) -> list[dict]:
                 f"&location=India&f_TP=1&f_E=1"
             )
             r = await client.get(url, headers=HEADERS, timeout=20)
-            soup = BeautifulSoup(r.text, "html.parser")
-            for card in soup.select("li.result-card, li[class*='job']"):
-                try:
-                    title_el   = card.select_one("h3")
-                    company_el = card.select_one("h4")
-                    link_el    = card.select_one("a")
-                    location_el= card.select_one("[class*='location']")
-                    if not title_el:
-                        continue
-                    title   = title_el.get_text(strip=True)
-                    company = company_el.get_text(strip=True) if company_el else "Company"
-                    link    = link_el["href"].split("?")[0] if link_el else ""
-                    location= location_el.get_text(strip=True) if location_el else "India"
-                    if matches_keywords(title):
-                        jobs.append({"title": title, "company": company, "link": link,
-                                     "apply_url": link, "stipend": "Check listing",
-                                     "location": location, "source": "LinkedIn",
-                                     "description": "internship"})
-                except Exception:
-                    continue
+            r.raise_for_status()
+            for rec in await run_parser(parse_linkedin, r.content):
+                if matches_keywords(rec["title"]):
+                    jobs.append({**rec, "apply_url": rec["link"], "posting_id": canonical_url(rec["link"]),
+                                 "stipend": "Check listing", "source": "LinkedIn", "description": "internship"})
         except Exception as e:
+            failed += 1
             log.warning(f"LinkedIn error [{keyword}]: {e}")
-    return jobs
+    return None if failed == len(searches) else jobs
 
 
-async def scrape_naukri(client: httpx.AsyncClient) -> list[dict]:
-    jobs = []
+async def scrape_naukri(client: httpx.AsyncClient) -> list[dict] | None:
+    jobs, failed = [], 0
     queries = ["backend-developer-internship", "software-engineer-internship", "sde-internship"]
     for q in queries:
         try:
             url = f"https://www.naukri.com/{q}-jobs?jobAge=1"
             r = await client.get(url, headers=HEADERS, timeout=15)
-            soup = BeautifulSoup(r.text, "html.parser")
-            for card in soup.select("article.jobTuple, .cust-job-tuple"):
-                try:
-                    title_el   = card.select_one("a.title, .title")
-                    company_el = card.select_one(".companyInfo a, .company-name")
-                    stipend_el = card.select_one(".salary, [class*='salary']")
-                    location_el= card.select_one(".location, [class*='location']")
-                    if not title_el:
-                        continue
-                    title   = title_el.get_text(strip=True)
-                    company = company_el.get_text(strip=True) if company_el else "Company"
-                    link    = title_el.get("href", "https://naukri.com")
-                    stipend = stipend_el.get_text(strip=True) if stipend_el else "Not mentioned"
-                    location= location_el.get_text(strip=True) if location_el else "India"
-                    if matches_keywords(title):
-                        jobs.append({"title": title, "company": company, "link": link,
-                                     "apply_url": link, "stipend": stipend,
-                                     "location": location, "source": "Naukri",
-                                     "description": "internship opportunity"})
-                except Exception:
-                    continue
+            r.raise_for_status()
+            for rec in await run_parser(parse_naukri, r.content):
+                if matches_keywords(rec["title"]):
+                    jobs.append({**rec, "apply_url": rec["link"], "posting_id": canonical_url(rec["link"]),
+                                 "source": "Naukri", "description": "internship opportunity"})
         except Exception as e:
+            failed += 1
             log.warning(f"Naukri error [{q}]: {e}")
-    return jobs
+    return None if failed == len(queries) else jobs
 
 
-async def scrape_unstop(client: httpx.AsyncClient) -> list[dict]:
+async def scrape_unstop(client: httpx.AsyncClient) -> list[dict] | None:
     jobs = []
     try:
         url = "https://unstop.com/internships?oppstatus=open&domain=tech"
         r = await client.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.text, "html.parser")
-        for card in soup.select(".opp-card, [class*='single_profile']"):
-            try:
-                title_el  = card.select_one("h2, .name")
-                company_el= card.select_one(".org_name, h3")
-                link_el   = card.select_one("a")
-                stipend_el= card.select_one("[class*='stipend'], [class*='salary']")
-                if not title_el:
-                    continue
-                title  = title_el.get_text(strip=True)
-                company= company_el.get_text(strip=True) if company_el else "Company"
-                href   = link_el["href"] if link_el else ""
-                link   = f"https://unstop.com{href}" if href.startswith("/") else href
-                stipend= stipend_el.get_text(strip=True) if stipend_el else "Not mentioned"
-                if matches_keywords(title):
-                    jobs.append({"title": title, "company": company, "link": link,
-                                 "apply_url": link, "stipend": stipend,
-                                 "location": "Check listing", "source": "Unstop"})
-            except Exception:
-                continue
+        r.raise_for_status()
+        for rec in await run_parser(parse_unstop, r.content):
+            if matches_keywords(rec["title"]):
+                jobs.append({**rec, "apply_url": rec["link"], "posting_id": canonical_url(rec["link"]),
+                             "location": "Check listing", "source": "Unstop"})
     except Exception as e:
         log.warning(f"Unstop error: {e}")
+        return None
     return jobs
 
 
-async def scrape_wellfound(client: httpx.AsyncClient) -> list[dict]:
+async def scrape_wellfound(client: httpx.AsyncClient) -> list[dict] | None:
     jobs = []
     try:
         url = "https://wellfound.com/jobs?jobType=intern&role=Backend+Engineer&role=Software+Engineer"
         r = await client.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(r.text, "html.parser")
-        for card in soup.select("[data-test='StartupResult']"):
-            try:
-                title_el  = card.select_one("a[data-test='job-title'], h2")
-                company_el= card.select_one("a[data-test='startup-link'], h3")
-                if not (title_el and company_el):
-                    continue
-                title  = title_el.get_text(strip=True)
-                company= company_el.get_text(strip=True)
-                href   = title_el.get("href", "")
-                link   = f"https://wellfound.com{href}" if href.startswith("/") else href
-                if matches_keywords(title):
-                    jobs.append({"title": title, "company": company, "link": link,
-                                 "apply_url": link, "stipend": "Check listing",
-                                 "location": "Check listing", "source": "Wellfound"})
-            except Exception:
-                continue
+        r.raise_for_status()
+        for rec in await run_parser(parse_wellfound, r.content):
+            if matches_keywords(rec["title"]):
+                jobs.append({**rec, "apply_url": rec["link"], "posting_id": canonical_url(rec["link"]),
+                             "stipend": "Check listing", "location": "Check listing", "source": "Wellfound"})
     except Exception as e:
         log.warning(f"Wellfound error: {e}")
+        return None
     return jobs
 
 
@@ -212,25 +148,90 @@ async def scrape_wellfound(client: httpx.AsyncClient) -> list[dict]:
 # GREENHOUSE API
 # ─────────────────────────────────────────────
 
-async def scrape_greenhouse_board(client: httpx.AsyncClient, company: str, url: str) -> list[dict]:
+# Fields read from each posting; everything else is dropped as it is decoded
+GREENHOUSE_FIELDS = ("id", "title", "location", "absolute_url", "content")
+
+
+def _greenhouse_listing_url(url: str) -> str:
+    """Board URL without ?content=true — titles, locations and ids only."""
+    parts = urlsplit(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if k != "content"])
+    return urlunsplit(parts._replace(query=query))
+
+
+async def _greenhouse_details(client: httpx.AsyncClient, company: str,
+                              listing_url: str, postings: list[dict]) -> list[str | None]:
+    """
+    Fetch /jobs/{id} for each posting; returns their content, None where
+    the fetch failed. Each request
+    takes its own host and global slot, at most GREENHOUSE_DETAIL_CONCURRENCY
+    per board, after handing back the slot the board was listed under.
+    """
+    base = urlsplit(listing_url)._replace(query="").geturl()
+    sem = asyncio.Semaphore(GREENHOUSE_DETAIL_CONCURRENCY)
+    slot = _source_slot.get()
+    if slot is not None:
+        slot.release()
+
+    async def fetch(posting: dict) -> str | None:
+        async with sem, (slot.request() if slot is not None else contextlib.nullcontext()):
+            try:
+                r = await client.get(f"{base}/{posting['id']}",
+                                     headers={**HEADERS, "Accept": "application/json"}, timeout=15)
+                r.raise_for_status()
+                return r.json().get("content", "")
+            except Exception as e:
+                log.debug(f"Greenhouse detail error [{company} #{posting.get('id')}]: {e}")
+                return None
+
+    return await asyncio.gather(*(fetch(p) for p in postings))
+
+
+async def scrape_greenhouse_board(client: httpx.AsyncClient, company: str, url: str) -> list[dict] | None:
+    """
+    With GREENHOUSE_TWO_PHASE the board is listed without content, titles are
+    filtered, and descriptions are fetched only for the postings that survive.
+    """
     jobs = []
+    if GREENHOUSE_TWO_PHASE:
+        url = _greenhouse_listing_url(url)
     try:
-        r = await client.get(url, headers={**HEADERS, "Accept": "application/json"}, timeout=15)
-        data = r.json()
-        for job in data.get("jobs", []):
+        async with client.stream("GET", url, timeout=15, headers={
+                **HEADERS, "Accept": "application/json", **conditional_headers(url)}) as r:
+            if r.status_code == 304:
+                return cached_jobs(url)
+            r.raise_for_status()
+            # Postings are decoded one at a time and dropped unless the title matches
+            candidates = [
+                job async for job in iter_json_array(r.aiter_text(), "jobs", GREENHOUSE_FIELDS)
+                if matches_keywords(job.get("title", "")) and is_internship(job.get("title", ""))
+            ]
+        if GREENHOUSE_TWO_PHASE:
+            contents = await _greenhouse_details(client, company, url, candidates)
+        else:
+            contents = [job.get("content", "") for job in candidates]
+
+        for job, content in zip(candidates, contents):
+            content = content or ""
             title = job.get("title", "")
             location = job.get("location", {}).get("name", "Remote")
             apply_url = job.get("absolute_url", "")
-            if (matches_keywords(title) and is_internship(title)):
-                jobs.append({
-                    "title": title, "company": company,
-                    "link": apply_url, "apply_url": apply_url,
-                    "stipend": "Check listing", "location": location,
-                    "source": "Greenhouse",
-                    "description": job.get("content", "")[:500],
-                })
+            jobs.append({
+                "title": title, "company": company,
+                "link": apply_url, "apply_url": apply_url,
+                "posting_id": f"greenhouse:{job['id']}" if job.get("id") else canonical_url(apply_url),
+                "stipend": "Check listing", "location": location,
+                "source": "Greenhouse",
+                "description": content[:500],
+            })
+        if None in contents:
+            # Don't let a 304 serve these missing descriptions from now on
+            log.debug(f"Greenhouse [{company}]: some details failed, listing not cached")
+        else:
+            remember(url, r, jobs)
     except Exception as e:
         log.warning(f"Greenhouse error [{company}]: {e}")
+        return None
     return jobs
 
 
@@ -238,26 +239,37 @@ async def scrape_greenhouse_board(client: httpx.AsyncClient, company: str, url:
 # LEVER API
 # ─────────────────────────────────────────────
 
-async def scrape_lever_board(client: httpx.AsyncClient, company: str, url: str) -> list[dict]:
+LEVER_FIELDS = ("id", "text", "categories", "applyUrl", "hostedUrl", "descriptionPlain")
+
+
+async def scrape_lever_board(client: httpx.AsyncClient, company: str, url: str) -> list[dict] | None:
     jobs = []
     try:
-        r = await client.get(url, headers={**HEADERS, "Accept": "application/json"}, timeout=15)
-        data = r.json()
-        postings = data if isinstance(data, list) else data.get("postings", [])
-        for job in postings:
-            title    = job.get("text", "")
-            location = job.get("categories", {}).get("location", "Remote")
-            apply_url= job.get("applyUrl", job.get("hostedUrl", ""))
-            desc     = job.get("descriptionPlain", "")[:500]
-            if (matches_keywords(title) and is_internship(title, desc)):
-                jobs.append({
-                    "title": title, "company": company,
-                    "link": apply_url, "apply_url": apply_url,
-                    "stipend": "Check listing", "location": location,
-                    "source": "Lever", "description": desc,
-                })
+        async with client.stream("GET", url, timeout=15, headers={
+                **HEADERS, "Accept": "application/json", **conditional_headers(url)}) as r:
+            if r.status_code == 304:
+                return cached_jobs(url)
+            r.raise_for_status()
+            # Either a bare list of postings or {"postings": [...]}
+            async for job in iter_json_array(r.aiter_text(), "postings", LEVER_FIELDS):
+                title = job.get("text", "")
+                if not matches_keywords(title):
+                    continue
+                location = job.get("categories", {}).get("location", "Remote")
+                apply_url= job.get("applyUrl", job.get("hostedUrl", ""))
+                desc     = job.get("descriptionPlain", "")[:500]
+                if is_internship(title, desc):
+                    jobs.append({
+                        "title": title, "company": company,
+                        "link": apply_url, "apply_url": apply_url,
+                        "posting_id": f"lever:{job['id']}" if job.get("id") else canonical_url(apply_url),
+                        "stipend": "Check listing", "location": location,
+                        "source": "Lever", "description": desc,
+                    })
+        remember(url, r, jobs)
     except Exception as e:
         log.warning(f"Lever error [{company}]: {e}")
+        return None
     return jobs
 
 
@@ -265,7 +277,7 @@ async def scrape_lever_board(client: httpx.AsyncClient, company: str, url: str)
 # DIRECT CAREER PAGES
 # ─────────────────────────────────────────────
 
-async def scrape_career_page(client: httpx.AsyncClient, page_config: dict) -> list[dict]:
+async def scrape_career_page(client: httpx.AsyncClient, page_config: dict) -> list[dict] | None:
     """Scrape a direct company career page."""
     jobs = []
     company = page_config["company"]
@@ -279,63 +291,175 @@ async def scrape_career_page(client: httpx.AsyncClient, page_config: dict) -> li
 
     try:
         r = await client.get(url, headers=HEADERS, timeout=20)
-        soup = BeautifulSoup(r.text, "html.parser")
+        r.raise_for_status()
         selector = page_config.get("selector", "a[href*='job'], a[href*='career']")
-
-        for link_el in soup.select(selector):
-            try:
-                title = link_el.get_text(strip=True)
-                href  = link_el.get("href", "")
-                if not title or len(title) < 5:
-                    continue
-                # Make absolute URL
-                if href.startswith("/"):
-                    from urllib.parse import urlparse
-                    base = urlparse(url)
-                    href = f"{base.scheme}://{base.netloc}{href}"
-                elif not href.startswith("http"):
-                    continue
-                if matches_keywords(title) and is_internship(title):
-                    jobs.append({
-                        "title": title, "company": company,
-                        "link": href, "apply_url": href,
-                        "stipend": "Check listing", "location": "Check listing",
-                        "source": f"Career Page ({company})",
-                    })
-            except Exception:
-                continue
+        for rec in await run_parser(parse_career_page, r.content, selector, url):
+            title, href = rec["title"], rec["link"]
+            if matches_keywords(title) and is_internship(title):
+                jobs.append({
+                    "title": title, "company": company,
+                    "link": href, "apply_url": href, "posting_id": canonical_url(href),
+                    "stipend": "Check listing", "location": "Check listing",
+                    "source": f"Career Page ({company})",
+                })
     except Exception as e:
         log.warning(f"Career page error [{company}]: {e}")
+        return None
     return jobs
 
 
 # ─────────────────────────────────────────────
-# MASTER SCRAPE FUNCTION
+# SCHEDULER
 # ─────────────────────────────────────────────
 
-async def scrape_all(client: httpx.AsyncClient) -> list[dict]:
-    import asyncio
+# (name, host, scraper) for the fixed job boards
+BOARD_SCRAPERS = [
+    ("Internshala", "internshala.com",  scrape_internshala),
+    ("LinkedIn",    "www.linkedin.com", scrape_linkedin),
+    ("Naukri",      "www.naukri.com",   scrape_naukri),
+    ("Unstop",      "unstop.com",       scrape_unstop),
+    ("Wellfound",   "wellfound.com",    scrape_wellfound),
+]
+
 
-    # Run all job board scrapers
-    board_tasks = [
-        scrape_internshala(client),
-        scrape_linkedin(client),
-        scrape_naukri(client),
-        scrape_unstop(client),
-        scrape_wellfound(client),
+def source_kind(page_config: dict) -> str:
+    """Classify a CAREER_PAGES entry the same way scrape_career_page routes it."""
+    if page_config.get("greenhouse"):
+        return "greenhouse"
+    if page_config.get("lever") and "api.lever.co" in page_config["url"]:
+        return "lever"
+    return "career_page"
+
+
+def build_sources() -> list[dict]:
+    """
+    One entry per schedulable unit of scraping, in priority order:
+      {"id", "name", "kind", "host", "run"}  where run(client) -> list[dict] | None
+    `name` is for display only — a company can have both a career page and
+    an ATS board. `id` ("kind:url") is unique and keys all per-source state.
+    """
+    sources = [
+        {"id": f"board:{host}", "name": name, "kind": "board", "host": host, "run": scraper}
+        for name, host, scraper in BOARD_SCRAPERS
     ]
+    ids = {s["id"] for s in sources}
+    for cfg in CAREER_PAGES:
+        kind = source_kind(cfg)
+        source_id = f"{kind}:{cfg['url']}"
+        if source_id in ids:
+            continue                    # the same page listed twice is scraped once
+        ids.add(source_id)
+        sources.append({
+            "id":   source_id,
+            "name": cfg["company"],
+            "kind": kind,
+            "host": urlparse(cfg["url"]).netloc,
+            "run":  functools.partial(scrape_career_page, page_config=cfg),
+        })
+    return sorted(sources, key=lambda s: SOURCE_PRIORITY.get(s["kind"], 99))
+
+
+class _SourceSlot:
+    """
+    The host slot and global slot a source runs under. A scraper that fans
+    out into many requests hands it back with release() and takes one per
+    request with request() instead, so its requests count against the same
+    limits as everyone else's.
+    """
+
+    def __init__(self, host_limit: asyncio.Semaphore, global_limit: asyncio.Semaphore):
+        self.host_limit = host_limit
+        self.global_limit = global_limit
+        self.held = False
+
+    async def __aenter__(self):
+        # Host slot first, so a source queued behind its host never sits on a global slot
+        await self.host_limit.acquire()
+        try:
+            await self.global_limit.acquire()
+        except BaseException:
+            self.host_limit.release()
+            raise
+        self.held = True
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+    def release(self):
+        if self.held:
+            self.held = False
+            self.global_limit.release()
+            self.host_limit.release()
+
+    @contextlib.asynccontextmanager
+    async def request(self):
+        async with self.host_limit, self.global_limit:
+            yield
+
+
+# Slot of the source running in the current task, for scrapers that fan out
+_source_slot: contextvars.ContextVar[_SourceSlot | None] = contextvars.ContextVar("source_slot", default=None)
+
+
+async def _run_source(client: httpx.AsyncClient, source: dict,
+                      host_limits: dict, global_limit: asyncio.Semaphore) -> list[dict] | None:
+    """Run one source under its host slot, a global slot and its timeout; None if it failed."""
+    async with _SourceSlot(host_limits[source["host"]], global_limit) as slot:
+        _source_slot.set(slot)
+        timeout = SOURCE_TIMEOUTS.get(source["kind"], 30)
+        try:
+            return await asyncio.wait_for(source["run"](client), timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"Source timed out after {timeout}s [{source['name']}]")
+            return None
 
-    # Run all career page scrapers
-    career_tasks = [scrape_career_page(client, cfg) for cfg in CAREER_PAGES]
 
-    all_tasks = board_tasks + career_tasks
-    results = await asyncio.gather(*all_tasks, return_exceptions=True)
+# ─────────────────────────────────────────────
+# MASTER SCRAPE FUNCTION
+# ─────────────────────────────────────────────
+
+async def scrape_stream(client: httpx.AsyncClient, only: list[str] | None = None):
+    """
+    Async generator of (source id, jobs), yielded as each source finishes
+    rather than when the slowest one does; jobs is None for a source that
+    failed. `only` limits it to those ids.
+    """
+    sources = build_sources()
+    if only is not None:
+        wanted = set(only)
+        sources = [s for s in sources if s["id"] in wanted]
+
+    # Semaphores hand out slots FIFO, so creating the tasks in priority
+    # order is enough to make higher-priority sources start first.
+    global_limit = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    host_limits = {
+        s["host"]: asyncio.Semaphore(HOST_CONCURRENCY.get(s["host"], DEFAULT_HOST_CONCURRENCY))
+        for s in sources
+    }
+
+    async def run(source: dict) -> tuple[str, list[dict] | None]:
+        try:
+            return source["id"], await _run_source(client, source, host_limits, global_limit)
+        except Exception as e:
+            log.debug(f"Scraper exception [{source['name']}]: {e}")
+            return source["id"], None
+
+    tasks = [asyncio.create_task(run(s)) for s in sources]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # The consumer may stop early; don't leave sources running
+        for task in tasks:
+            task.cancel()
+        save_board_cache()
+
+
+async def scrape_all(client: httpx.AsyncClient, only: list[str] | None = None) -> list[dict]:
+    """Every source's jobs in one list, once all sources have finished."""
+    return [job async for _, jobs in scrape_stream(client, only) for job in jobs or []]
 
-    jobs = []
-    for r in results:
-        if isinstance(r, Exception):
-            log.debug(f"Scraper exception: {r}")
-        else:
-            jobs.extend(r)
 
-    return jobs
\ No newline at end of file
+def source_ids() -> list[str]:
+    return [s["id"] for s in build_sources()]
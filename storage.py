@@ -0,0 +1,511 @@
+"""
+🗄️ Persistent State
+SQLite (WAL mode) stores for state that outlives a cycle. Lookups hit the
+primary-key index instead of loading the whole history into memory, and
+writes are batched into one transaction per flush.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import SEEN_TTL_DAYS, SEEN_FLUSH_EVERY
+from dedup import canonical_url, company_key, is_posting_url, title_key
+
+log = logging.getLogger("Storage")
+
+STATE_DB = Path("bot_state.db")
+
+
+def connect(path: Path = STATE_DB) -> sqlite3.Connection:
+    """Open the state DB in WAL mode so readers never block the writer."""
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+# ─────────────────────────────────────────────
+# SEEN JOBS
+# ─────────────────────────────────────────────
+
+class SeenStore:
+    """
+    Job ids already alerted, with first/last-seen timestamps.
+
+    An entry expires SEEN_TTL_DAYS after the listing was last *seen*, not
+    first alerted — a listing that stays open is never re-sent, and one that
+    disappears and is re-posted later alerts again.
+    """
+
+    def __init__(self, path: Path = STATE_DB, ttl_days: float = SEEN_TTL_DAYS):
+        self.conn = connect(path)
+        self.ttl = ttl_days * 86400
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                id         TEXT PRIMARY KEY,
+                first_seen REAL NOT NULL,
+                last_seen  REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS seen_jobs_last_seen ON seen_jobs(last_seen)")
+        self.conn.commit()
+        self._pending: dict[str, float] = {}   # id → last_seen, not yet flushed
+        self._refresh: dict[str, float] = {}   # ids to keep alive, only if present
+
+    def __contains__(self, jid: str) -> bool:
+        if jid in self._pending:
+            return True
+        row = self.conn.execute(
+            "SELECT 1 FROM seen_jobs WHERE id = ? AND last_seen >= ?",
+            (jid, time.time() - self.ttl),
+        ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def add(self, jid: str):
+        """Record an alerted job (or refresh one still listed)."""
+        self._pending[jid] = time.time()
+        if len(self._pending) >= SEEN_FLUSH_EVERY:
+            self.flush()
+
+    touch = add
+
+    def refresh(self, jid: str):
+        """Push out the expiry of an id if it is stored; never adds one."""
+        self._refresh[jid] = time.time()
+        if len(self._refresh) >= SEEN_FLUSH_EVERY:
+            self.flush()
+
+    def flush(self):
+        """Write pending ids in one transaction."""
+        if not (self._pending or self._refresh):
+            return
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO seen_jobs (id, first_seen, last_seen) VALUES (?, ?, ?)
+                   ON CONFLICT(id) DO UPDATE SET last_seen = excluded.last_seen""",
+                [(jid, ts, ts) for jid, ts in self._pending.items()],
+            )
+            self.conn.executemany(
+                "UPDATE seen_jobs SET last_seen = ? WHERE id = ?",
+                [(ts, jid) for jid, ts in self._refresh.items()],
+            )
+        self._pending.clear()
+        self._refresh.clear()
+
+    def expire(self) -> int:
+        """Drop entries not seen for longer than the TTL. Returns rows removed."""
+        self.flush()
+        with self.conn:
+            cur = self.conn.execute(
+                "DELETE FROM seen_jobs WHERE last_seen < ?", (time.time() - self.ttl,)
+            )
+        if cur.rowcount:
+            log.info(f"♻️ Expired {cur.rowcount} seen jobs not listed for {self.ttl / 86400:g} days")
+        return cur.rowcount
+
+    def import_json(self, path: Path):
+        """One-off migration from the old seen_jobs_v2.json list."""
+        if not path.exists():
+            return
+        try:
+            with open(path) as f:
+                ids = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not migrate {path}: {e}")
+            return
+        ts = path.stat().st_mtime
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_jobs (id, first_seen, last_seen) VALUES (?, ?, ?)",
+                [(jid, ts, ts) for jid in ids],
+            )
+        path.rename(path.with_suffix(".json.migrated"))
+        log.info(f"📦 Migrated {len(ids)} seen jobs from {path}")
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────
+# APPLIED JOBS LEDGER
+# ─────────────────────────────────────────────
+
+class AppliedLedger:
+    """
+    Every auto-apply attempt (applied / unconfirmed / failed / skipped) with time and ATS.
+
+    Ids that were submitted — "applied", or "unconfirmed" when the site
+    showed no confirmation — are never submitted again. They are kept in an
+    in-memory hot set, so the per-job check is a set lookup. A miss falls through to the indexed table,
+    which catches rows written by another process. Writes are serialised by
+    a lock and committed one attempt at a time, so apply workers running in
+    threads can share a ledger.
+    """
+
+    def __init__(self, path: Path = STATE_DB):
+        self.conn = connect(path)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS apply_attempts (
+                    job_id  TEXT NOT NULL,
+                    status  TEXT NOT NULL,
+                    ts      REAL NOT NULL,
+                    ats     TEXT NOT NULL DEFAULT '',
+                    company TEXT NOT NULL DEFAULT '',
+                    title   TEXT NOT NULL DEFAULT '',
+                    url     TEXT NOT NULL DEFAULT ''
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS apply_attempts_job ON apply_attempts(job_id, status)"
+            )
+            self._applied = {
+                row[0] for row in
+                self.conn.execute("SELECT DISTINCT job_id FROM apply_attempts WHERE status IN ('applied', 'unconfirmed')")
+            }
+
+    def already_applied(self, job_id: str) -> bool:
+        if job_id in self._applied:
+            return True
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM apply_attempts WHERE job_id = ? AND status IN ('applied', 'unconfirmed') LIMIT 1",
+                (job_id,),
+            ).fetchone()
+        if row:
+            self._applied.add(job_id)
+        return row is not None
+
+    def record(self, job_id: str, status: str, ats: str = "",
+               company: str = "", title: str = "", url: str = ""):
+        """Append one attempt. status is "applied", "unconfirmed", "failed" or "skipped"."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO apply_attempts (job_id, status, ts, ats, company, title, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, status, time.time(), ats, company, title, url),
+            )
+        if status in ("applied", "unconfirmed"):
+            self._applied.add(job_id)
+
+    def history(self, job_id: str) -> list[dict]:
+        """All attempts for one job, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, ts, ats, company, title, url FROM apply_attempts "
+                "WHERE job_id = ? ORDER BY ts", (job_id,),
+            ).fetchall()
+        keys = ("status", "ts", "ats", "company", "title", "url")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def import_text(self, path: Path):
+        """One-off migration from the old applied_jobs.txt ("id | company | title | url")."""
+        if not path.exists():
+            return
+        ts = path.stat().st_mtime
+        rows = []
+        for line in path.read_text().splitlines():
+            parts = [p.strip() for p in line.split(" | ", 3)]
+            if parts and parts[0]:
+                parts += [""] * (4 - len(parts))
+                rows.append((parts[0], "applied", ts, "", parts[1], parts[2], parts[3]))
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO apply_attempts (job_id, status, ts, ats, company, title, url) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows,
+            )
+        self._applied.update(row[0] for row in rows)
+        path.rename(path.with_suffix(".txt.migrated"))
+        log.info(f"📦 Migrated {len(rows)} applied jobs from {path}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+# ─────────────────────────────────────────────
+# BOARD SNAPSHOTS
+# ─────────────────────────────────────────────
+
+# Bumped whenever source ids or posting keys change meaning; stored
+# snapshots under the old keys are then discarded like a filter change
+SNAPSHOT_SCHEMA = 3
+
+# Fields that, when edited on the board, make a posting worth re-checking
+SNAPSHOT_FIELDS = ("title", "company", "location", "description", "tags", "stipend", "link", "apply_url")
+
+
+def posting_key(job: dict) -> str:
+    """
+    The posting's ATS id ("greenhouse:123") or canonical URL. A link that
+    isn't specific to one posting — a bare domain or listing page — would
+    make every role behind it one key, so those fall back to company+title.
+    """
+    key = job.get("posting_id") or canonical_url(job.get("link", ""))
+    if key and ("://" not in key or is_posting_url(key)):
+        return key
+    return f"title:{company_key(job.get('company', ''))}|{title_key(job.get('title', ''))}"
+
+
+def content_hash(job: dict) -> str:
+    return hashlib.md5(json.dumps([job.get(f, "") for f in SNAPSHOT_FIELDS]).encode()).hexdigest()
+
+
+class SnapshotStore:
+    """
+    Last fetched posting ids and content hashes per source id (see
+    scrapers.build_sources). diff() splits a fresh fetch into added /
+    changed / unchanged postings and removed ids; commit() stores the fetch
+    as the new snapshot. Committing is a separate step so a cycle that fails
+    half-way re-processes its postings next time.
+
+    `version` identifies the downstream filters. When it changes, every
+    snapshot is dropped, because unchanged postings were judged by the old
+    rules.
+    """
+
+    def __init__(self, version: str, path: Path = STATE_DB):
+        version = f"{SNAPSHOT_SCHEMA}:{version}"
+        self.conn = connect(path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS board_snapshots (
+                    source       TEXT NOT NULL,
+                    posting_id   TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    PRIMARY KEY (source, posting_id)
+                ) WITHOUT ROWID
+            """)
+            # Sources with a committed snapshot, including ones that listed nothing
+            self.conn.execute("CREATE TABLE IF NOT EXISTS snapshot_sources (source TEXT PRIMARY KEY)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS state_meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self.conn.execute("SELECT value FROM state_meta WHERE key = 'snapshot_version'").fetchone()
+            if row is None or row[0] != version:
+                if row is not None:
+                    log.info("♻️ Filters changed — board snapshots discarded")
+                self.conn.execute("DELETE FROM board_snapshots")
+                self.conn.execute("DELETE FROM snapshot_sources")
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO state_meta (key, value) VALUES ('snapshot_version', ?)", (version,)
+                )
+
+    def diff(self, source: str, jobs: list[dict]) -> dict:
+        """
+        {"added", "changed", "unchanged": [jobs], "removed": [posting ids],
+         "hashes": {posting id: hash}, "known": had a snapshot before}.
+        `jobs` must come from a successful fetch. Even so, an empty one
+        removes nothing: a board that suddenly lists nothing is more often
+        briefly broken than emptied.
+        """
+        previous = dict(self.conn.execute(
+            "SELECT posting_id, content_hash FROM board_snapshots WHERE source = ?", (source,)
+        ))
+        known = bool(previous) or self.conn.execute(
+            "SELECT 1 FROM snapshot_sources WHERE source = ?", (source,)
+        ).fetchone() is not None
+        delta = {"added": [], "changed": [], "unchanged": [], "removed": [], "hashes": {},
+                 "known": known}
+        for job in jobs:
+            key = posting_key(job)
+            if not key or key in delta["hashes"]:
+                continue
+            digest = delta["hashes"][key] = content_hash(job)
+            if key not in previous:
+                delta["added"].append(job)
+            elif previous[key] != digest:
+                delta["changed"].append(job)
+            else:
+                delta["unchanged"].append(job)
+        if jobs:
+            delta["removed"] = [key for key in previous if key not in delta["hashes"]]
+        return delta
+
+    def commit(self, source: str, delta: dict):
+        """Make a diff()'s fetch the stored snapshot of `source`."""
+        with self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO snapshot_sources (source) VALUES (?)", (source,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO board_snapshots (source, posting_id, content_hash) VALUES (?, ?, ?)",
+                [(source, key, delta["hashes"][key])
+                 for key in map(posting_key, delta["added"] + delta["changed"])],
+            )
+            self.conn.executemany(
+                "DELETE FROM board_snapshots WHERE source = ? AND posting_id = ?",
+                [(source, key) for key in delta["removed"]],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────
+# FORM SCHEMAS
+# ─────────────────────────────────────────────
+
+class FormSchemaStore:
+    """
+    Field plans (value key → field index) that filled an application form
+    cleanly, per ATS host and form fingerprint. Forms on one ATS come in a
+    few layouts, so after the first application to a layout the rest fill
+    straight from the stored plan. A plan that stops working is dropped and
+    relearned. The table is small, so it is also kept in memory.
+    """
+
+    def __init__(self, path: Path = STATE_DB):
+        self.conn = connect(path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS form_schemas (
+                    host        TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    plan        TEXT NOT NULL,
+                    updated     REAL NOT NULL,
+                    PRIMARY KEY (host, fingerprint)
+                ) WITHOUT ROWID
+            """)
+        self._plans: dict[tuple[str, str], dict[str, int]] = {
+            (host, fingerprint): json.loads(plan) for host, fingerprint, plan in
+            self.conn.execute("SELECT host, fingerprint, plan FROM form_schemas")
+        }
+
+    def fingerprints(self, host: str) -> list[str]:
+        return [fingerprint for h, fingerprint in self._plans if h == host]
+
+    def get(self, host: str, fingerprint: str) -> dict[str, int] | None:
+        return self._plans.get((host, fingerprint))
+
+    def put(self, host: str, fingerprint: str, plan: dict[str, int]):
+        self._plans[(host, fingerprint)] = plan
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO form_schemas (host, fingerprint, plan, updated) VALUES (?, ?, ?, ?)",
+                (host, fingerprint, json.dumps(plan), time.time()),
+            )
+
+    def invalidate(self, host: str, fingerprint: str):
+        if self._plans.pop((host, fingerprint), None) is not None:
+            with self.conn:
+                self.conn.execute(
+                    "DELETE FROM form_schemas WHERE host = ? AND fingerprint = ?", (host, fingerprint)
+                )
+            log.info(f"♻️ Dropped cached form plan for {host} ({fingerprint})")
+
+    def close(self):
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────
+# AUTO-APPLY QUEUE
+# ─────────────────────────────────────────────
+
+class ApplyJobStore:
+    """
+    Jobs waiting for auto-apply, with their failed-attempt count and the
+    earliest time of the next try. A row is deleted once the job reaches a
+    final result, so whatever is left at shutdown or after a crash —
+    including an application that was half-way through — is picked up
+    again on the next start.
+    """
+
+    def __init__(self, path: Path = STATE_DB):
+        self.conn = connect(path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS apply_queue (
+                    job_id   TEXT PRIMARY KEY,
+                    job      TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_try REAL NOT NULL,
+                    created  REAL NOT NULL
+                )
+            """)
+
+    def put(self, job_id: str, job: dict) -> bool:
+        """Queue a job; False if it is already queued."""
+        now = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO apply_queue (job_id, job, next_try, created) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(job), now, now),
+            )
+        return cur.rowcount > 0
+
+    def retry_at(self, job_id: str, attempts: int, next_try: float):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE apply_queue SET attempts = ?, next_try = ? WHERE job_id = ?",
+                (attempts, next_try, job_id),
+            )
+
+    def done(self, job_id: str):
+        with self.conn:
+            self.conn.execute("DELETE FROM apply_queue WHERE job_id = ?", (job_id,))
+
+    def pending(self) -> list[tuple[dict, int, float]]:
+        """(job, attempts, next_try) of every unfinished job, soonest first."""
+        rows = self.conn.execute(
+            "SELECT job, attempts, next_try FROM apply_queue ORDER BY next_try"
+        ).fetchall()
+        return [(json.loads(job), attempts, next_try) for job, attempts, next_try in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+# ─────────────────────────────────────────────
+# TELEGRAM OUTBOX
+# ─────────────────────────────────────────────
+
+class Outbox:
+    """
+    Messages accepted for delivery but not yet confirmed by Telegram.
+    A row is deleted once sent, so whatever is left at shutdown is
+    re-queued on the next start.
+    """
+
+    def __init__(self, path: Path = STATE_DB):
+        self.conn = connect(path)
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id       INTEGER PRIMARY KEY,
+                    payload  TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created  REAL NOT NULL
+                )
+            """)
+
+    def put(self, payload: dict) -> int:
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO outbox (payload, created) VALUES (?, ?)",
+                (json.dumps(payload), time.time()),
+            )
+        return cur.lastrowid
+
+    def done(self, msg_id: int):
+        with self.conn:
+            self.conn.execute("DELETE FROM outbox WHERE id = ?", (msg_id,))
+
+    def set_attempts(self, msg_id: int, attempts: int):
+        with self.conn:
+            self.conn.execute("UPDATE outbox SET attempts = ? WHERE id = ?", (attempts, msg_id))
+
+    def pending(self) -> list[tuple[int, dict, int]]:
+        """(id, payload, attempts) of every undelivered message, oldest first."""
+        rows = self.conn.execute("SELECT id, payload, attempts FROM outbox ORDER BY id").fetchall()
+        return [(msg_id, json.loads(payload), attempts) for msg_id, payload, attempts in rows]
+
+    def close(self):
+        self.conn.close()
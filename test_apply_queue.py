@@ -0,0 +1,177 @@
+import asyncio
+import time
+
+import apply_queue as aq
+from storage import ApplyJobStore
+
+
+def _job(jid, source="Lever"):
+    return {"id": jid, "title": "SDE Intern", "company": "Acme", "source": source}
+
+
+class FakeApply:
+    """Stands in for apply_to_job: hands out scripted results per job, "applied" once they run out."""
+
+    def __init__(self, results: dict[str, list[str]] | None = None):
+        self.results = results or {}
+        self.calls: list[tuple[str, float]] = []
+        self.gates: dict[str, asyncio.Event] = {}    # job id → held until set
+
+    async def __call__(self, job):
+        self.calls.append((job["id"], time.monotonic()))
+        if job["id"] in self.gates:
+            await self.gates[job["id"]].wait()
+        script = self.results.get(job["id"], [])
+        return script.pop(0) if script else "applied"
+
+
+async def _noop(*args):
+    pass
+
+
+def _patch(monkeypatch, fake: FakeApply, backoff: float = 0.02):
+    monkeypatch.setattr(aq, "apply_to_job", fake)
+    monkeypatch.setattr(aq, "prepare_cover_letter", _noop)
+    monkeypatch.setattr(aq, "save_cover_letter_cache", lambda: None)
+    monkeypatch.setattr(aq, "APPLY_BACKOFF", backoff)
+
+
+async def _results(queue: aq.ApplyQueue, n: int) -> list[tuple[str, str]]:
+    out = []
+    for _ in range(n):
+        job, result = await asyncio.wait_for(queue.results.get(), 2)
+        out.append((job["id"], result))
+    return out
+
+
+def test_failed_apply_is_retried_with_doubling_backoff(tmp_path, monkeypatch):
+    fake = FakeApply({"a": ["failed", "failed"]})
+    _patch(monkeypatch, fake)
+
+    async def run():
+        queue = aq.ApplyQueue(ApplyJobStore(tmp_path / "state.db"))
+        queue.start()
+        await queue.enqueue(_job("a"))
+        results = await _results(queue, 1)
+        applied = queue.take_applied()
+        pending = queue.store.pending()
+        await queue.stop()
+        return results, applied, pending
+
+    results, applied, pending = asyncio.run(run())
+    assert results == [("a", "applied")]
+    assert applied == 1
+    assert pending == []
+    times = [t for _, t in fake.calls]
+    assert len(times) == 3
+    assert times[1] - times[0] >= 0.02
+    assert times[2] - times[1] >= 0.04
+
+
+def test_gives_up_after_max_attempts(tmp_path, monkeypatch):
+    fake = FakeApply({"a": ["failed"] * 10})
+    _patch(monkeypatch, fake, backoff=0.001)
+
+    async def run():
+        queue = aq.ApplyQueue(ApplyJobStore(tmp_path / "state.db"))
+        queue.start()
+        await queue.enqueue(_job("a"))
+        results = await _results(queue, 1)
+        pending = queue.store.pending()
+        await queue.stop()
+        return results, pending
+
+    results, pending = asyncio.run(run())
+    assert results == [("a", "failed")]
+    assert len(fake.calls) == aq.APPLY_MAX_ATTEMPTS
+    assert pending == []
+
+
+def test_unconfirmed_is_final_and_not_counted_as_applied(tmp_path, monkeypatch):
+    fake = FakeApply({"a": ["unconfirmed"]})
+    _patch(monkeypatch, fake)
+
+    async def run():
+        queue = aq.ApplyQueue(ApplyJobStore(tmp_path / "state.db"))
+        queue.start()
+        await queue.enqueue(_job("a"))
+        results = await _results(queue, 1)
+        await asyncio.sleep(0.1)
+        applied = queue.take_applied()
+        pending = queue.store.pending()
+        await queue.stop()
+        return results, applied, pending
+
+    results, applied, pending = asyncio.run(run())
+    assert results == [("a", "unconfirmed")]
+    assert applied == 0
+    assert pending == []
+    assert len(fake.calls) == 1
+
+
+def test_unfinished_jobs_resume_after_restart(tmp_path, monkeypatch):
+    db = tmp_path / "state.db"
+    fake = FakeApply({"b": ["failed"]})
+    fake.gates["a"] = asyncio.Event()          # still in the browser at shutdown
+    _patch(monkeypatch, fake, backoff=60)
+
+    async def first_run():
+        queue = aq.ApplyQueue(ApplyJobStore(db))
+        queue.start()
+        await queue.enqueue(_job("a"))
+        await queue.enqueue(_job("b", source="Greenhouse"))
+        for _ in range(100):
+            if len(fake.calls) == 2 and queue.store.pending()[-1][1] == 1:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(first_run())
+    pending = {job["id"]: (attempts, next_try) for job, attempts, next_try in ApplyJobStore(db).pending()}
+    assert pending["a"][0] == 0
+    assert pending["b"][0] == 1 and pending["b"][1] > time.time() + 30
+
+    fake = FakeApply()
+    _patch(monkeypatch, fake, backoff=60)
+
+    async def second_run():
+        store = ApplyJobStore(db)
+        store.retry_at("b", 1, time.time())    # backoff elapsed while the bot was down
+        queue = aq.ApplyQueue(store)
+        queue.start()
+        results = await _results(queue, 2)
+        pending = queue.store.pending()
+        await queue.stop()
+        return results, pending
+
+    results, pending = asyncio.run(second_run())
+    assert sorted(results) == [("a", "applied"), ("b", "applied")]
+    assert pending == []
+
+
+def test_jobs_are_routed_per_ats_without_head_of_line_blocking(tmp_path, monkeypatch):
+    fake = FakeApply()
+    fake.gates["gh1"] = asyncio.Event()
+    _patch(monkeypatch, fake)
+    monkeypatch.setattr(aq, "APPLY_ATS_CONCURRENCY", {"greenhouse": 1, "lever": 1})
+
+    async def run():
+        queue = aq.ApplyQueue(ApplyJobStore(tmp_path / "state.db"))
+        queue.start()
+        await queue.enqueue(_job("gh1", source="Greenhouse"))
+        await queue.enqueue(_job("gh2", source="Greenhouse"))
+        await queue.enqueue(_job("lv1", source="Lever"))
+        await queue.enqueue(_job("gen1", source="Company Site"))
+        # gh1 holds greenhouse's only worker; the others still go through
+        early = await _results(queue, 2)
+        routed = {ats: q.qsize() for ats, q in queue.queues.items()}
+        fake.gates["gh1"].set()
+        late = await _results(queue, 2)
+        await queue.stop()
+        return early, routed, late
+
+    early, routed, late = asyncio.run(run())
+    assert sorted(early) == [("gen1", "applied"), ("lv1", "applied")]
+    assert set(routed) == {"greenhouse", "lever", "generic"}
+    assert routed["greenhouse"] == 1           # gh2 waits behind gh1, on its own queue
+    assert late == [("gh1", "applied"), ("gh2", "applied")]
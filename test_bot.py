@@ -0,0 +1,85 @@
+import asyncio
+import re
+
+import pytest
+
+import bot
+import poll_schedule
+from storage import SeenStore, SnapshotStore
+
+RESERVED = set(r"_*[]()~`>#+-=|{}.!")
+
+
+def unescaped_reserved(text: str, markup: str = "*_") -> list[str]:
+    """Reserved MarkdownV2 characters that are neither escaped nor used as markup."""
+    bare = re.sub(r"\\.", "", text)
+    return [ch for ch in bare if ch in RESERVED and ch not in markup]
+
+
+def _job(n: int, stipend: str) -> dict:
+    return {
+        "title": f"Backend (Node.js) Intern #{n} - Payments!", "company": "Acme [India] Pvt. Ltd.",
+        "location": "Bengaluru | Remote", "stipend": stipend, "source": "Greenhouse",
+        "link": f"https://boards.greenhouse.io/acme/jobs/{n}",
+    }
+
+
+@pytest.mark.parametrize("stipend", ["₹1,20,000/month", "₹ 2.5 lakh per month", "50000", "", "Check listing"])
+def test_stipend_badge_is_escaped(stipend):
+    assert unescaped_reserved(bot.stipend_badge(stipend)) == []
+
+
+def test_digest_with_lakh_stipend_escapes_every_reserved_character():
+    jobs = [_job(n, "₹1,20,000/month" if n % 2 else "₹45,000/month") for n in range(1, 26)]
+    payloads = bot.render_digests(jobs)
+    assert len(payloads) == 2
+    assert "1\\.2L/month" in payloads[0]["text"]
+    for payload in payloads:
+        assert unescaped_reserved(payload["text"]) == []
+
+
+def test_job_alert_with_lakh_stipend_is_escaped():
+    payload = bot.render_job_alert(_job(1, "₹1,50,000/month"))
+    assert unescaped_reserved(payload["text"]) == []
+
+
+def _run_cycle(monkeypatch, tmp_path, fetched: list, eligible):
+    async def scrape_stream(client, sources):
+        for item in fetched:
+            yield item
+
+    monkeypatch.setattr(bot, "scrape_stream", scrape_stream)
+    monkeypatch.setattr(bot, "get_client", lambda: None)
+    monkeypatch.setattr(bot, "is_valid_internship", eligible)
+    monkeypatch.setattr(bot, "save_verdict_cache", lambda: None)
+    seen = SeenStore(tmp_path / "state.db")
+    snapshots = SnapshotStore("v1", tmp_path / "state.db")
+    try:
+        return asyncio.run(bot.run_cycle(None, seen, snapshots))
+    finally:
+        snapshots.close()
+        seen.close()
+
+
+def test_poll_rates_are_learned_only_once_snapshots_commit(monkeypatch, tmp_path):
+    monkeypatch.setattr(poll_schedule, "POLL_SCHEDULE_FILE", tmp_path / "poll_schedule.json")
+    monkeypatch.setattr(poll_schedule, "_sources", None)
+    known = SnapshotStore("v1", tmp_path / "state.db")
+    listed = _job(1, "₹50,000")
+    posted = {**_job(2, "₹50,000"), "title": "Data Platform Intern"}
+    known.commit("lever:acme", known.diff("lever:acme", [listed]))
+    known.close()
+    fetched = [("lever:acme", [listed, posted]), ("lever:down", None)]
+
+    def broken(job):
+        raise RuntimeError("eligibility blew up")
+
+    with pytest.raises(RuntimeError):
+        _run_cycle(monkeypatch, tmp_path, fetched, broken)
+    state = poll_schedule._load()
+    assert "lever:acme" not in state          # its postings will be diffed again
+    assert state["lever:down"]["last_poll"] > 0 and "last_ok" not in state["lever:down"]
+
+    _run_cycle(monkeypatch, tmp_path, fetched, lambda job: False)
+    assert state["lever:acme"]["last_ok"] > 0
+    assert SnapshotStore("v1", tmp_path / "state.db").diff("lever:acme", fetched[0][1])["added"] == []
@@ -0,0 +1,76 @@
+from dedup import Deduper, canonical_url, is_posting_url
+
+
+def _job(source, title="Software Engineer Intern", company="Razorpay", link="", **extra):
+    return {"source": source, "title": title, "company": company, "link": link, **extra}
+
+
+def test_canonical_url_drops_tracking_and_aliases():
+    assert canonical_url("https://www.linkedin.com/jobs/view/1/?trk=abc&utm_source=x") == \
+        "https://linkedin.com/jobs/view/1"
+    assert canonical_url("https://jobs.lever.co/acme/abc/apply?lever-source=li") == \
+        canonical_url("https://jobs.lever.co/acme/abc")
+    assert canonical_url("https://careers.acme.com/#/job/42") == "https://careers.acme.com#/job/42"
+
+
+def test_is_posting_url():
+    assert is_posting_url(canonical_url("https://boards.greenhouse.io/acme/jobs/123"))
+    assert is_posting_url(canonical_url("https://careers.swiggy.com/#/job/42"))
+    assert not is_posting_url(canonical_url("https://naukri.com"))
+    assert not is_posting_url(canonical_url("https://razorpay.com/jobs/"))
+    assert not is_posting_url(canonical_url("https://careers.swiggy.com/#/"))
+    assert not is_posting_url("")
+
+
+def test_same_role_across_sources_is_one_cluster():
+    deduper = Deduper()
+    assert deduper.add(_job("Career Page (Razorpay)", "SDE Intern", "Razorpay Pvt Ltd"))
+    assert not deduper.add(_job("Internshala", "Software Engineer Internship", "Razorpay"))
+    assert len(deduper.clusters()) == 1
+
+
+def test_near_duplicate_titles_merge_within_company_only():
+    deduper = Deduper()
+    deduper.add(_job("Lever", "Backend Engineer Intern - Payments Platform"))
+    deduper.add(_job("LinkedIn", "Backend Engineer Intern, Payments Platform Team"))
+    deduper.add(_job("LinkedIn", "Backend Engineer Intern, Payments Platform Team", company="CRED"))
+    assert [len(c) for c in deduper.clusters()] == [2, 1]
+
+
+def test_shared_listing_link_does_not_merge_different_roles():
+    deduper = Deduper()
+    assert deduper.add(_job("Naukri", "Backend Intern", "Acme", "https://naukri.com"))
+    assert deduper.add(_job("Naukri", "Data Analyst Intern", "Globex", "https://naukri.com"))
+
+
+def test_shared_posting_link_merges_despite_titles():
+    deduper = Deduper()
+    link = "https://boards.greenhouse.io/acme/jobs/9"
+    deduper.add(_job("Greenhouse", "SWE Intern", "Acme", link))
+    assert not deduper.add(_job("LinkedIn", "Engineering Internship (Summer)", "Acme Inc", link + "?gh_src=li"))
+
+
+def test_preferred_source_takes_over_until_claimed():
+    deduper = Deduper()
+    linkedin = _job("LinkedIn")
+    greenhouse = _job("Greenhouse")
+    assert deduper.add(linkedin)
+    # The ATS copy outranks it, so it is let through and the first copy loses its claim
+    assert deduper.add(greenhouse)
+    assert not deduper.claim(linkedin)
+    assert deduper.claim(greenhouse)
+    assert not deduper.add(_job("Lever"))
+
+
+def test_claimed_cluster_rejects_better_copies():
+    deduper = Deduper()
+    linkedin = _job("LinkedIn")
+    deduper.add(linkedin)
+    assert deduper.claim(linkedin)
+    assert not deduper.add(_job("Greenhouse"))
+
+
+def test_unchanged_record_claims_its_cluster():
+    deduper = Deduper()
+    assert not deduper.add(_job("LinkedIn"), claimed=True)
+    assert not deduper.add(_job("Greenhouse"))
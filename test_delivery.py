@@ -0,0 +1,70 @@
+import asyncio
+import logging
+
+from telegram.error import BadRequest, Forbidden
+
+import bot
+from delivery import DeliveryQueue, as_plain_text
+from storage import Outbox
+
+
+class FakeBot:
+    """Rejects MarkdownV2 messages containing `bad`, and every message to chat `blocked`."""
+
+    def __init__(self, bad: str = "\x00"):
+        self.bad = bad
+        self.sent: list[dict] = []
+
+    async def send_message(self, **kwargs):
+        if kwargs["chat_id"] == "blocked":
+            raise Forbidden("bot was blocked by the user")
+        if kwargs["parse_mode"] and self.bad in kwargs["text"]:
+            raise BadRequest("Can't parse entities: character '.' is reserved")
+        self.sent.append(kwargs)
+
+
+def _run(fake: FakeBot, payloads: list[dict], tmp_path) -> DeliveryQueue:
+    async def run():
+        queue = DeliveryQueue(fake, Outbox(tmp_path / "state.db"))
+        queue.start()
+        for payload in payloads:
+            await queue.enqueue(payload)
+        for _ in range(100):
+            if queue.sent + queue.dropped == len(payloads):
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return queue
+    return asyncio.run(run())
+
+
+def test_as_plain_text_undoes_markdown():
+    payload = {"text": "*1\\.* 🌱 *Backend \\(Node\\.js\\) Intern*\n💰 ₹1\\.2L/month", "parse_mode": "MarkdownV2"}
+    assert as_plain_text(payload) == {"text": "1. 🌱 Backend (Node.js) Intern\n💰 ₹1.2L/month", "parse_mode": None}
+
+
+def test_rejected_markdown_is_resent_as_plain_text(tmp_path):
+    payload = {**bot.render_job_alert({"title": "SDE Intern", "company": "Acme", "source": "Lever",
+                                       "stipend": "₹50,000", "link": "https://jobs.lever.co/acme/1"}),
+               "chat_id": 1}
+    fake = FakeBot(bad="SDE")
+    queue = _run(fake, [payload], tmp_path)
+    assert queue.sent == 1 and queue.dropped == 0
+    assert fake.sent[0]["parse_mode"] is None
+    assert "*" not in fake.sent[0]["text"] and "SDE Intern" in fake.sent[0]["text"]
+    assert Outbox(tmp_path / "state.db").pending() == []
+
+
+def test_forbidden_is_dropped_and_logs_titles(tmp_path, caplog):
+    payload = {"chat_id": "blocked", "text": "x", "parse_mode": None, "titles": ["SDE Intern", "Backend Intern"]}
+    with caplog.at_level(logging.ERROR, logger="Delivery"):
+        queue = _run(FakeBot(), [payload], tmp_path)
+    assert queue.dropped == 1
+    assert "SDE Intern; Backend Intern" in caplog.text
+
+
+def test_digest_payload_titles_match_its_page():
+    jobs = [{"title": f"Intern {n}", "company": "Acme", "source": "Lever", "stipend": "",
+             "link": f"https://jobs.lever.co/acme/{n}"} for n in range(1, 26)]
+    pages = bot.render_digests(jobs)
+    assert [p["titles"] for p in pages] == [[j["title"] for j in jobs[:20]], [j["title"] for j in jobs[20:]]]
@@ -0,0 +1,92 @@
+import pytest
+
+import eligibility
+from eligibility import evaluate, evaluate_sequential, is_valid_internship
+
+# (title, location, description, source, verdict). Verdicts are frozen from
+# the pre-fused engine, whose checks each ran their own regex over the text.
+CORPUS = [
+    ("Backend Engineer Intern", "Bengaluru, India", "Build REST APIs in python.", "Greenhouse", True),
+    ("Software Engineer Intern", "Remote", "Work on our node.js services.", "Lever", True),
+    ("SDE Intern", "", "", "LinkedIn", True),
+    ("Software Engineer", "India", "Build microservices in golang.", "Greenhouse", False),
+    ("Software Engineer", "", "Backend work in java.", "Internshala", True),
+    ("Marketing Intern", "Remote", "Social media campaigns.", "Internshala", False),
+    ("HR Intern", "India", "Talent acquisition support.", "Unstop", False),
+    ("Content Writer Intern", "Remote", "SEO specialist work.", "Internshala", False),
+    ("Senior Backend Engineer", "Remote", "Backend intern mentoring.", "Lever", False),
+    ("Staff Engineer Intern", "India", "", "Greenhouse", False),
+    ("SDE 2", "Bengaluru", "internship", "Naukri", False),
+    ("Backend Intern", "Pune, India", "3+ years of experience with python.", "Greenhouse", False),
+    ("Backend Intern", "Pune, India", "Minimum 2 years of backend work.", "Greenhouse", False),
+    ("Backend Intern", "Pune, India", "0-2 years of experience", "Greenhouse", False),
+    ("Backend Intern", "Pune, India", "Masters degree required.", "Greenhouse", False),
+    ("Backend Intern", "Pune, India", "PhD preferred.", "Greenhouse", False),
+    ("New Grad Software Engineer", "Remote", "python", "Greenhouse", False),
+    ("Software Engineer Intern", "Remote", "Graduate program for 2025.", "Lever", False),
+    ("Software Engineer Intern", "Remote", "This is not an internship.", "Lever", True),
+    ("Software Engineer Intern", "San Francisco", "python", "Greenhouse", False),
+    ("Software Engineer Intern", "London, UK", "python", "Greenhouse", False),
+    ("Software Engineer Intern", "Remote - US", "python", "Greenhouse", True),
+    ("Software Engineer Intern", "Check listing", "Must be based in the US.", "Career Page (X)", False),
+    ("Software Engineer Intern", "Not mentioned", "python", "Career Page (X)", True),
+    ("Software Engineer Intern", "Singapore", "Kubernetes and Docker.", "Greenhouse", False),
+    ("Software Engineer Intern", "Hybrid - Pune", "Kubernetes and Docker.", "Greenhouse", False),
+    ("Software Engineer Intern", "Worldwide", "", "Lever", True),
+    ("Software Engineer Intern", "Toronto", "Must be located in India.", "Lever", False),
+    ("Software Engineer Intern", "Kochi", "", "Lever", True),
+    ("Software Engineer Intern", "Bengaluru", "Visa sponsorship not available.", "Lever", False),
+    ("UI/UX Designer Intern", "Remote", "Figma work.", "Internshala", False),
+    ("UI/UX Engineer Intern", "Remote", "React and TypeScript.", "Internshala", False),
+    ("Product Designer Intern", "India", "", "Internshala", False),
+    ("Product Design Engineer Intern", "India", "", "Internshala", False),
+    ("Java Developer", "India", "java script only", "Internshala", True),
+    ("Data Engineer Trainee", "Noida / Remote", "SQL and python pipelines.", "Naukri", True),
+    ("Apprentice - DevOps", "India", "CI/CD and infrastructure.", "Naukri", True),
+    ("Co-op, Backend", "Remote", "python", "Lever", True),
+    ("Site Reliability Engineering Intern", "Remote", "sre on-call", "Greenhouse", True),
+    ("Engineering Manager", "India", "Lead a team of interns.", "Greenhouse", False),
+    ("Cloud Engineer Intern", "India", "Lead developer mentorship, L5 band.", "Greenhouse", False),
+    ("Summer Intern 2026", "Remote", "Work from home on our api.", "Unstop", True),
+    ("Intern", "", "", "Unstop", False),
+    ("Go Developer Intern", "India", "No freshers.", "Lever", False),
+    # newline-separated guards: the cancelling word only counts on the same line
+    ("Backend Intern", "India", "0-2 years intern", "Greenhouse", True),
+    ("Backend Developer", "India", "0-2 years\nintern", "Greenhouse", False),
+    ("Backend Developer", "India", "0-2 years\nwe hire interns too", "Greenhouse", False),
+    ("Backend Intern", "Remote", "Onsite required in India.", "Greenhouse", True),
+    ("Backend Intern", "Remote", "Onsite required\nIndia office.", "Greenhouse", False),
+    ("Backend Intern", "Remote", "onsite only\nindia", "Greenhouse", False),
+    ("UI/UX\nEngineer Intern", "Remote", "", "Internshala", False),
+    ("Product Designer\nEngineer Intern", "Remote", "", "Internshala", False),
+    ("Product Designer Intern", "Remote", "works with engineers", "Internshala", False),
+    ("Backend Developer", "India", "0-2 years experience, internship available", "Greenhouse", False),
+]
+
+
+def _job(title, location, description, source):
+    return {"title": title, "company": "Acme", "location": location, "description": description, "source": source}
+
+
+@pytest.mark.parametrize("title, location, description, source, verdict", CORPUS)
+def test_fused_engine_matches_frozen_verdicts(title, location, description, source, verdict):
+    assert evaluate(_job(title, location, description, source))[0] is verdict
+
+
+@pytest.mark.parametrize("title, location, description, source, verdict", CORPUS)
+def test_sequential_engine_matches_frozen_verdicts(title, location, description, source, verdict):
+    assert evaluate_sequential(_job(title, location, description, source))[0] is verdict
+
+
+def test_cached_verdicts_survive_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(eligibility, "VERDICT_CACHE_FILE", tmp_path / "verdict_cache.json")
+    monkeypatch.setattr(eligibility, "_verdicts", None)
+    jobs = [_job(*row[:4]) for row in CORPUS]
+    expected = [row[4] for row in CORPUS]
+    assert [is_valid_internship(job) for job in jobs] == expected
+    eligibility.save_verdict_cache()
+
+    monkeypatch.setattr(eligibility, "_verdicts", None)
+    before = eligibility.verdict_cache_stats()["hits"]
+    assert [is_valid_internship(job) for job in jobs] == expected
+    assert eligibility.verdict_cache_stats()["hits"] - before == len(jobs)
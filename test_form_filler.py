@@ -0,0 +1,90 @@
+import pytest
+
+from form_filler import match
+
+
+def _form(*fields: tuple) -> list[dict]:
+    """Descriptors as discover() returns them, from (kind, name, label[, visible]) tuples."""
+    return [
+        {"index": i, "kind": kind, "name": name, "id": "", "placeholder": "", "label": label,
+         "required": False, "visible": rest[0] if rest else True}
+        for i, (kind, name, label, *rest) in enumerate(fields)
+    ]
+
+
+ALL_KEYS = ["resume", "email", "phone", "first_name", "last_name", "full_name",
+            "linkedin", "github", "website", "cover_letter", "availability"]
+
+CASES = [
+    # rule order: first/last name claim their fields before full name can
+    ("first_name_before_full_name",
+     _form(("text", "name", "Name"), ("text", "fname", "First name"), ("text", "lname", "Last name")),
+     ["full_name", "first_name", "last_name"],
+     {"first_name": 1, "last_name": 2, "full_name": 0}),
+    ("first_name_is_not_a_full_name",
+     _form(("text", "first", "First Name")),
+     ["full_name"],
+     {}),
+    ("full_name_by_label",
+     _form(("text", "q1", "Your name *"), ("text", "q2", "Full name of referrer")),
+     ["full_name"],
+     {"full_name": 0}),
+    # _BY_KIND: an email/tel input is that key's field whatever it is called
+    ("email_and_tel_by_kind",
+     _form(("text", "q1", "Portfolio"), ("email", "q2", "Contact"), ("tel", "q3", "Reach you at")),
+     ["email", "phone", "website"],
+     {"email": 1, "phone": 2, "website": 0}),
+    ("tel_kind_never_takes_email",
+     _form(("tel", "q1", "Email or phone")),
+     ["email", "phone"],
+     {"phone": 0}),
+    # fallbacks: hidden file inputs and unnamed textareas
+    ("hidden_file_input_gets_resume",
+     _form(("text", "first_name", "First name"), ("file", "attachment", "", False)),
+     ["first_name", "resume"],
+     {"first_name": 0, "resume": 1}),
+    ("named_file_input_beats_fallback",
+     _form(("file", "transcript", ""), ("file", "cv", "")),
+     ["resume"],
+     {"resume": 1}),
+    ("unnamed_textarea_gets_cover_letter",
+     _form(("textarea", "q7", "Anything else?")),
+     ["cover_letter"],
+     {"cover_letter": 0}),
+    ("visible_field_preferred_over_hidden",
+     _form(("text", "linkedin", "LinkedIn", False), ("text", "linkedin_url", "LinkedIn profile")),
+     ["linkedin"],
+     {"linkedin": 1}),
+    # taken: a field goes to one key only, fallbacks included
+    ("field_taken_by_earlier_key",
+     _form(("text", "contact", "Email / phone number")),
+     ["email", "phone"],
+     {"email": 0}),
+    ("fallback_skips_taken_fields",
+     _form(("textarea", "why", "Why us?"), ("file", "resume", "")),
+     ["cover_letter", "resume"],
+     {"resume": 1, "cover_letter": 0}),
+    ("fallback_needs_a_free_field",
+     _form(("file", "cv", "")),
+     ["resume", "cover_letter"],
+     {"resume": 0}),
+    # only the keys asked for are planned
+    ("unwanted_keys_left_out",
+     _form(("email", "email", "Email"), ("text", "github", "GitHub")),
+     ["github"],
+     {"github": 1}),
+    ("full_application",
+     _form(("text", "first_name", "First Name"), ("text", "last_name", "Last Name"),
+           ("email", "email", "Email"), ("tel", "phone", "Phone"),
+           ("file", "resume", "Resume/CV", False), ("text", "urls[LinkedIn]", "LinkedIn URL"),
+           ("text", "urls[GitHub]", "GitHub URL"), ("text", "urls[Portfolio]", "Website"),
+           ("select", "start", "Earliest start date"), ("textarea", "comments", "Additional information")),
+     ALL_KEYS,
+     {"first_name": 0, "last_name": 1, "email": 2, "phone": 3, "resume": 4, "linkedin": 5,
+      "github": 6, "website": 7, "availability": 8, "cover_letter": 9}),
+]
+
+
+@pytest.mark.parametrize("fields, keys, plan", [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_match(fields, keys, plan):
+    assert match(fields, keys) == plan
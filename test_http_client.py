@@ -0,0 +1,36 @@
+import asyncio
+
+import httpx
+
+import http_client
+
+
+def test_reset_retires_the_client_until_the_next_reset(monkeypatch):
+    async def run():
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return httpx.Response(200, text="letter")
+
+        old = httpx.AsyncClient(transport=httpx.MockTransport(slow))
+        monkeypatch.setattr(http_client, "_client", old)
+        monkeypatch.setattr(http_client, "_retired", None)
+
+        # A background task is mid-request when the cycle resets the client
+        in_flight = asyncio.create_task(http_client.get_client().get("https://api.example/v1"))
+        await asyncio.sleep(0)
+        await http_client.reset_client()
+        new = http_client.get_client()
+        assert new is not old and not old.is_closed
+
+        release.set()
+        assert (await in_flight).text == "letter"
+
+        await http_client.reset_client()
+        assert old.is_closed and not new.is_closed
+        newest = http_client.get_client()
+        await http_client.close_client()
+        assert new.is_closed and newest.is_closed
+
+    asyncio.run(run())
@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import pytest
+
+from json_stream import iter_json_array
+
+
+async def _chunks(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+
+def _collect(text: str, size: int = 7, **kwargs) -> list:
+    async def run():
+        return [item async for item in iter_json_array(_chunks(text, size), **kwargs)]
+    return asyncio.run(run())
+
+
+JOBS = [
+    {"id": 1, "title": "SDE Intern", "content": "x" * 300, "location": {"name": "Remote"}},
+    {"id": 2, "title": "Backend Intern, \"Payments\" [2026]", "content": "{ not ] json"},
+]
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 10_000])
+def test_top_level_array_any_chunking(size):
+    assert _collect(json.dumps(JOBS), size) == JOBS
+
+
+def test_array_under_key_after_other_fields():
+    doc = json.dumps({"meta": {"jobs": "not this"}, "jobs": JOBS, "total": 2})
+    assert _collect(doc, key="jobs") == JOBS
+
+
+def test_fields_are_reduced_as_decoded():
+    assert _collect(json.dumps(JOBS), fields=("id", "title")) == [
+        {"id": 1, "title": "SDE Intern"},
+        {"id": 2, "title": "Backend Intern, \"Payments\" [2026]"},
+    ]
+
+
+def test_empty_array_and_empty_document():
+    assert _collect("[]") == []
+    assert _collect(json.dumps({"jobs": []}), key="jobs") == []
+    assert _collect("") == []
+
+
+def test_truncated_array_raises():
+    with pytest.raises(ValueError):
+        _collect(json.dumps(JOBS)[:-20])
+
+
+def test_object_without_key_raises():
+    with pytest.raises(ValueError):
+        _collect(json.dumps({"jobs": JOBS}))
@@ -0,0 +1,69 @@
+import pytest
+
+import poll_schedule
+from config import CHECK_INTERVAL, POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, POLL_TARGET_NEW
+
+
+@pytest.fixture(autouse=True)
+def schedule_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(poll_schedule, "POLL_SCHEDULE_FILE", tmp_path / "poll_schedule.json")
+    monkeypatch.setattr(poll_schedule, "_sources", None)
+    monkeypatch.setattr(poll_schedule, "_dirty", False)
+
+
+HOUR = 3600
+
+
+def test_unlearned_source_polls_at_check_interval():
+    assert poll_schedule.intervals(["a"]) == {"a": CHECK_INTERVAL}
+
+
+def test_rate_needs_two_successful_polls():
+    poll_schedule.record_poll("a", 0, now=HOUR)
+    assert poll_schedule._sources["a"]["rate"] is None
+    poll_schedule.record_poll("a", 2, now=2 * HOUR)
+    assert poll_schedule._sources["a"]["rate"] == pytest.approx(2.0)
+
+
+def test_empty_board_learns_zero_and_backs_off():
+    for hour in range(1, 4):
+        poll_schedule.record_poll("empty", 0, now=hour * HOUR)
+    assert poll_schedule._sources["empty"]["rate"] == 0
+    assert poll_schedule.intervals(["empty"])["empty"] == POLL_MAX_INTERVAL
+
+
+def test_failed_poll_moves_poll_time_but_not_rate_window():
+    poll_schedule.record_poll("a", 0, now=HOUR)
+    poll_schedule.record_poll("a", None, now=1.9 * HOUR)
+    poll_schedule.record_poll("a", 1, now=2 * HOUR)
+    state = poll_schedule._sources["a"]
+    # One posting over the hour since the last success, not the last 6 minutes
+    assert state["rate"] == pytest.approx(1.0)
+    assert state["last_poll"] == 2 * HOUR
+
+
+def test_interval_follows_rate_within_bounds():
+    poll_schedule._load().update({
+        "hot":  {"rate": 100.0, "last_poll": 1, "last_ok": 1},
+        "warm": {"rate": 2.0,   "last_poll": 1, "last_ok": 1},
+    })
+    got = poll_schedule.intervals(["hot", "warm"])
+    assert got["hot"] == POLL_MIN_INTERVAL
+    assert got["warm"] == pytest.approx(POLL_TARGET_NEW / 2.0 * HOUR)
+
+
+def test_budget_stretches_every_interval(monkeypatch):
+    monkeypatch.setattr(poll_schedule, "POLL_BUDGET_PER_HOUR", 3)
+    names = [f"s{i}" for i in range(6)]
+    # Six sources at one poll per hour each is twice the budget
+    poll_schedule._load().update({n: {"rate": POLL_TARGET_NEW, "last_poll": 1, "last_ok": 1} for n in names})
+    assert set(poll_schedule.intervals(names).values()) == {2 * HOUR}
+
+
+def test_due_sources_and_persistence():
+    poll_schedule.record_poll("a", None, now=1000)
+    assert poll_schedule.due_sources(["a", "b"], now=1000 + CHECK_INTERVAL - 1) == ["b"]
+    poll_schedule.save_schedule()
+
+    poll_schedule._sources = None
+    assert poll_schedule._load()["a"]["last_poll"] == 1000
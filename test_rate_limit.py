@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from rate_limit import TokenBucket
+
+
+def _time_acquires(bucket: TokenBucket, n: int) -> float:
+    async def run():
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+    return asyncio.run(run())
+
+
+def test_burst_up_to_capacity_is_immediate():
+    assert _time_acquires(TokenBucket(rate=1, capacity=5), 5) < 0.05
+
+
+def test_beyond_capacity_waits_for_rate():
+    elapsed = _time_acquires(TokenBucket(rate=50, capacity=1), 6)
+    assert 0.09 <= elapsed < 0.3
+
+
+def test_pause_holds_and_empties_the_bucket():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.pause(0.1)
+    assert bucket.tokens == 0
+    assert _time_acquires(bucket, 1) >= 0.09
+
+
+def test_concurrent_waiters_are_paced():
+    bucket = TokenBucket(rate=40, capacity=1)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire() for _ in range(5)))
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
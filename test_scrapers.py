@@ -0,0 +1,150 @@
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+import scrapers
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Answers every request after a short delay, tracking peak in-flight requests overall and per host."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.inflight = Counter()
+        self.peak = Counter()
+        self.total = 0
+        self.peak_total = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self.inflight[host] += 1
+        self.total += 1
+        self.peak[host] = max(self.peak[host], self.inflight[host])
+        self.peak_total = max(self.peak_total, self.total)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.inflight[host] -= 1
+            self.total -= 1
+        path = request.url.path
+        if path.endswith("/jobs"):
+            board = path.split("/")[-2]
+            return httpx.Response(200, json={"jobs": [
+                {"id": i, "title": "Software Engineer Intern", "location": {"name": "Bangalore"},
+                 "absolute_url": f"https://boards.greenhouse.io/{board}/jobs/{i}"}
+                for i in range(8)
+            ]})
+        return httpx.Response(200, json={"content": "Backend internship"})
+
+
+def _collect(client, only=None) -> dict:
+    async def run():
+        return {sid: jobs async for sid, jobs in scrapers.scrape_stream(client, only)}
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def no_board_cache(monkeypatch):
+    monkeypatch.setattr(scrapers, "conditional_headers", lambda url: {})
+    monkeypatch.setattr(scrapers, "remember", lambda url, r, jobs: None)
+    monkeypatch.setattr(scrapers, "save_board_cache", lambda: None)
+
+
+def _fake_source(i: int, host: str, kind: str = "career_page", run=None) -> dict:
+    async def fetch(client):
+        r = await client.get(f"https://{host}/page/{i}")
+        return [{"title": f"Intern {i}", "status": r.status_code}]
+    return {"id": f"{kind}:{host}/{i}", "name": f"S{i}", "kind": kind, "host": host, "run": run or fetch}
+
+
+def test_host_and_global_limits_are_never_exceeded(monkeypatch):
+    monkeypatch.setattr(scrapers, "MAX_CONCURRENT_REQUESTS", 5)
+    monkeypatch.setattr(scrapers, "DEFAULT_HOST_CONCURRENCY", 1)
+    monkeypatch.setattr(scrapers, "HOST_CONCURRENCY", {"busy.example": 3})
+    sources = [_fake_source(i, "busy.example") for i in range(12)]
+    sources += [_fake_source(100 + i, f"h{i}.example") for i in range(6) for _ in range(2)]
+    monkeypatch.setattr(scrapers, "build_sources", lambda: sources)
+
+    transport = CountingTransport()
+    results = _collect(httpx.AsyncClient(transport=transport))
+
+    assert len(results) == len({s["id"] for s in sources})
+    assert transport.peak["busy.example"] == 3
+    assert all(transport.peak[f"h{i}.example"] == 1 for i in range(6))
+    assert transport.peak_total == 5
+
+
+def test_only_limits_to_given_ids(monkeypatch):
+    sources = [_fake_source(i, f"h{i}.example") for i in range(3)]
+    monkeypatch.setattr(scrapers, "build_sources", lambda: sources)
+    results = _collect(httpx.AsyncClient(transport=CountingTransport()), only=[sources[1]["id"]])
+    assert list(results) == [sources[1]["id"]]
+
+
+def test_hanging_source_times_out_to_none(monkeypatch):
+    async def hang(client):
+        await asyncio.sleep(60)
+
+    async def boom(client):
+        raise RuntimeError("parser blew up")
+
+    monkeypatch.setattr(scrapers, "SOURCE_TIMEOUTS", {"career_page": 0.05})
+    sources = [
+        _fake_source(0, "slow.example", run=hang),
+        _fake_source(1, "bad.example", run=boom),
+        _fake_source(2, "ok.example"),
+    ]
+    monkeypatch.setattr(scrapers, "build_sources", lambda: sources)
+
+    results = _collect(httpx.AsyncClient(transport=CountingTransport()))
+    assert results[sources[0]["id"]] is None
+    assert results[sources[1]["id"]] is None
+    assert results[sources[2]["id"]] == [{"title": "Intern 2", "status": 200}]
+
+
+def test_greenhouse_detail_fan_out_stays_within_host_limit(monkeypatch):
+    host = "boards-api.greenhouse.io"
+    monkeypatch.setattr(scrapers, "GREENHOUSE_TWO_PHASE", True)
+    monkeypatch.setattr(scrapers, "GREENHOUSE_DETAIL_CONCURRENCY", 4)
+    monkeypatch.setattr(scrapers, "MAX_CONCURRENT_REQUESTS", 24)
+    monkeypatch.setattr(scrapers, "HOST_CONCURRENCY", {host: 3})
+    monkeypatch.setattr(scrapers, "BOARD_SCRAPERS", [])
+    monkeypatch.setattr(scrapers, "CAREER_PAGES", [
+        {"company": f"C{i}", "url": f"https://{host}/v1/boards/c{i}/jobs?content=true", "greenhouse": True}
+        for i in range(10)
+    ])
+
+    transport = CountingTransport()
+    results = _collect(httpx.AsyncClient(transport=transport))
+
+    assert len(results) == 10
+    assert all(len(jobs) == 8 and jobs[0]["description"] for jobs in results.values())
+    assert transport.peak[host] == 3
+
+
+def test_source_slot_release_hands_back_both_slots():
+    async def run():
+        host_limit, global_limit = asyncio.Semaphore(1), asyncio.Semaphore(1)
+        async with scrapers._SourceSlot(host_limit, global_limit) as slot:
+            assert host_limit.locked() and global_limit.locked()
+            slot.release()
+            assert not host_limit.locked() and not global_limit.locked()
+            async with slot.request():
+                assert host_limit.locked() and global_limit.locked()
+        # Leaving after release() must not release a second time
+        assert not host_limit.locked()
+        await asyncio.wait_for(host_limit.acquire(), 0.1)
+        assert host_limit.locked()
+    asyncio.run(run())
+
+
+def test_build_sources_ids_are_unique_and_cover_shared_names():
+    sources = scrapers.build_sources()
+    ids = [s["id"] for s in sources]
+    assert len(ids) == len(set(ids))
+    names = Counter(s["name"] for s in sources)
+    assert any(count > 1 for count in names.values())     # e.g. a career page plus a Lever board
+    kinds = [s["kind"] for s in sources]
+    assert kinds == sorted(kinds, key=lambda k: scrapers.SOURCE_PRIORITY.get(k, 99))
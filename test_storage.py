@@ -0,0 +1,237 @@
+import json
+from types import SimpleNamespace
+
+import storage
+from storage import AppliedLedger, Outbox, SeenStore, SnapshotStore, posting_key
+
+
+def _job(pid, title="SDE Intern", **extra):
+    return {"posting_id": pid, "title": title, "company": "Acme", "link": f"https://x.com/jobs/{pid}", **extra}
+
+
+# ── board snapshots ────────────────────────────
+
+def test_first_fetch_is_all_added_and_unknown(tmp_path):
+    store = SnapshotStore("v1", tmp_path / "state.db")
+    delta = store.diff("lever:acme", [_job("a"), _job("b")])
+    assert [j["posting_id"] for j in delta["added"]] == ["a", "b"]
+    assert delta["known"] is False
+    assert delta["removed"] == []
+
+
+def test_diff_after_commit_splits_added_changed_unchanged_removed(tmp_path):
+    store = SnapshotStore("v1", tmp_path / "state.db")
+    store.commit("src", store.diff("src", [_job("a"), _job("b"), _job("c")]))
+
+    delta = store.diff("src", [_job("a"), _job("b", title="SDE Intern II"), _job("d")])
+    assert delta["known"] is True
+    assert [j["posting_id"] for j in delta["added"]] == ["d"]
+    assert [j["posting_id"] for j in delta["changed"]] == ["b"]
+    assert [j["posting_id"] for j in delta["unchanged"]] == ["a"]
+    assert delta["removed"] == ["c"]
+
+
+def test_uncommitted_diff_is_seen_again(tmp_path):
+    store = SnapshotStore("v1", tmp_path / "state.db")
+    store.diff("src", [_job("a")])
+    assert len(store.diff("src", [_job("a")])["added"]) == 1
+
+
+def test_empty_fetch_removes_nothing_but_empty_source_becomes_known(tmp_path):
+    store = SnapshotStore("v1", tmp_path / "state.db")
+    store.commit("full", store.diff("full", [_job("a")]))
+    assert store.diff("full", [])["removed"] == []
+
+    store.commit("empty", store.diff("empty", []))
+    assert store.diff("empty", [])["known"] is True
+
+
+def test_sources_are_independent(tmp_path):
+    store = SnapshotStore("v1", tmp_path / "state.db")
+    store.commit("career_page:https://acme.com/jobs", store.diff("career_page:https://acme.com/jobs", [_job("a")]))
+    assert store.diff("lever:https://api.lever.co/v0/postings/acme", [_job("a")])["known"] is False
+
+
+def test_version_change_discards_snapshots(tmp_path):
+    path = tmp_path / "state.db"
+    store = SnapshotStore("v1", path)
+    store.commit("src", store.diff("src", [_job("a")]))
+    store.close()
+
+    assert SnapshotStore("v1", path).diff("src", [_job("a")])["known"] is True
+    delta = SnapshotStore("v2", path).diff("src", [_job("a")])
+    assert delta["known"] is False and len(delta["added"]) == 1
+
+
+def test_posting_key_falls_back_to_title_for_listing_links():
+    a = {"title": "Backend Intern", "company": "Razorpay", "link": "https://razorpay.com/jobs/"}
+    b = {"title": "Data Intern", "company": "Razorpay", "link": "https://razorpay.com/jobs/"}
+    assert posting_key(a) != posting_key(b)
+    assert posting_key({"posting_id": "greenhouse:42"}) == "greenhouse:42"
+    assert posting_key({"link": "https://www.linkedin.com/jobs/view/7?trk=x"}) == "https://linkedin.com/jobs/view/7"
+
+
+# ── outbox ─────────────────────────────────────
+
+def test_outbox_keeps_unsent_messages_across_reopen(tmp_path):
+    path = tmp_path / "state.db"
+    outbox = Outbox(path)
+    first = outbox.put({"chat_id": 1, "text": "one"})
+    second = outbox.put({"chat_id": 1, "text": "two"})
+    outbox.set_attempts(second, 2)
+    outbox.done(first)
+    outbox.close()
+
+    assert Outbox(path).pending() == [(second, {"chat_id": 1, "text": "two"}, 2)]
+
+
+# ── seen jobs ──────────────────────────────────
+
+DAY = 86400
+
+
+def _clock(monkeypatch, start: float = 1_000_000.0) -> list[float]:
+    """Freeze storage's clock; set now[0] to move it."""
+    now = [start]
+    monkeypatch.setattr(storage, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_seen_expires_by_last_seen_not_first_seen(tmp_path, monkeypatch):
+    now = _clock(monkeypatch)
+    store = SeenStore(tmp_path / "state.db", ttl_days=1)
+    store.add("a")
+    store.add("b")
+    store.flush()
+
+    now[0] += 0.9 * DAY
+    store.touch("a")                   # still listed
+    store.flush()
+
+    now[0] += 0.6 * DAY                # 1.5 days after first seen
+    assert "a" in store
+    assert "b" not in store
+    assert store.expire() == 1
+    assert len(store) == 1
+
+    now[0] += 0.5 * DAY                # a day after "a" was last seen
+    assert "a" not in store
+    assert store.expire() == 1
+
+
+def test_refresh_never_inserts(tmp_path, monkeypatch):
+    now = _clock(monkeypatch)
+    store = SeenStore(tmp_path / "state.db", ttl_days=1)
+    store.add("a")
+    store.flush()
+
+    now[0] += 0.9 * DAY
+    store.refresh("a")
+    store.refresh("b")
+    store.flush()
+    assert "b" not in store
+    assert len(store) == 1
+
+    now[0] += 0.6 * DAY
+    assert "a" in store                # refresh pushed its expiry out
+
+
+def test_pending_ids_are_seen_before_flush(tmp_path):
+    store = SeenStore(tmp_path / "state.db")
+    store.add("a")
+    assert "a" in store
+    assert "a" not in SeenStore(tmp_path / "state.db")
+    store.flush()
+    assert "a" in SeenStore(tmp_path / "state.db")
+
+
+def test_import_json_migrates_once_and_renames(tmp_path):
+    legacy = tmp_path / "seen_jobs_v2.json"
+    legacy.write_text(json.dumps(["a", "b"]))
+    store = SeenStore(tmp_path / "state.db")
+    store.add("a")
+    store.flush()
+
+    store.import_json(legacy)
+    assert "a" in store and "b" in store
+    assert len(store) == 2
+    assert not legacy.exists()
+    assert (tmp_path / "seen_jobs_v2.json.migrated").exists()
+
+    store.import_json(legacy)          # already migrated: nothing to do
+    assert len(store) == 2
+
+
+def test_unreadable_json_is_left_in_place(tmp_path):
+    legacy = tmp_path / "seen_jobs_v2.json"
+    legacy.write_text("[\"a\", ")
+    store = SeenStore(tmp_path / "state.db")
+    store.import_json(legacy)
+    assert legacy.exists()
+    assert len(store) == 0
+
+# ── applied ledger ─────────────────────────────
+
+def test_unconfirmed_submission_is_never_submitted_again(tmp_path):
+    ledger = AppliedLedger(tmp_path / "state.db")
+    ledger.record("a", "unconfirmed")
+    ledger.record("b", "failed")
+    assert ledger.already_applied("a")
+    assert not ledger.already_applied("b")
+    # ...also for a ledger opened later
+    assert AppliedLedger(tmp_path / "state.db").already_applied("a")
+
+
+def test_ledger_sees_applications_recorded_by_another_connection(tmp_path):
+    ledger = AppliedLedger(tmp_path / "state.db")
+    other = AppliedLedger(tmp_path / "state.db")
+    assert not ledger.already_applied("a")
+
+    other.record("a", "applied")
+    other.record("b", "failed")
+    other.record("c", "skipped")
+    assert ledger.already_applied("a")
+    assert "a" in ledger._applied      # promoted to the hot set on the hit
+    assert not ledger.already_applied("b")
+    assert not ledger.already_applied("c")
+
+
+def test_ledger_history_is_oldest_first_and_keeps_skips(tmp_path, monkeypatch):
+    now = _clock(monkeypatch)
+    ledger = AppliedLedger(tmp_path / "state.db")
+    for status in ("failed", "failed", "applied", "skipped"):
+        ledger.record("a", status, ats="lever", company="Acme", title="SDE Intern")
+        now[0] += 60
+    ledger.record("b", "applied")
+
+    history = ledger.history("a")
+    assert [h["status"] for h in history] == ["failed", "failed", "applied", "skipped"]
+    assert [h["ts"] for h in history] == sorted(h["ts"] for h in history)
+    assert history[-1] == {"status": "skipped", "ts": 1_000_180.0, "ats": "lever",
+                           "company": "Acme", "title": "SDE Intern", "url": ""}
+    assert ledger.history("missing") == []
+
+
+def test_ledger_import_text_skips_malformed_lines(tmp_path):
+    legacy = tmp_path / "applied_jobs.txt"
+    legacy.write_text(
+        "a | Acme | SDE Intern | https://acme.com/1\n"
+        "\n"
+        "   \n"
+        " | NoId | Intern | https://x.com\n"
+        "b\n"
+        "c | Beta\n"
+        "d | Gamma | Intern | https://g.com/?q=a | b\n"
+    )
+    ledger = AppliedLedger(tmp_path / "state.db")
+    ledger.import_text(legacy)
+
+    assert all(ledger.already_applied(jid) for jid in "abcd")
+    assert ledger.history("") == []
+    assert ledger.history("b")[0]["company"] == ""
+    assert ledger.history("c")[0]["company"] == "Beta"
+    assert ledger.history("d")[0]["url"] == "https://g.com/?q=a | b"
+    assert not legacy.exists()
+    assert (tmp_path / "applied_jobs.txt.migrated").exists()
+    # ...and seen by a ledger opened afterwards
+    assert AppliedLedger(tmp_path / "state.db").already_applied("c")